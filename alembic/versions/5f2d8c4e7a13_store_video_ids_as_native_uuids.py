@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Store video ids as native uuids
+
+Revision ID: 5f2d8c4e7a13
+Revises: e4b7a19c3d52
+Create Date: 2026-10-18 16:24:53.770125
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "5f2d8c4e7a13"
+down_revision = "e4b7a19c3d52"
+branch_labels = None
+depends_on = None
+
+# Rows converted per transaction while the application keeps running
+BACKFILL_BATCH_SIZE = 10_000
+
+SORT_INDEXES = {
+    "ix_videos_created_date_id": "created_date",
+    "ix_videos_updated_date_id": "updated_date",
+    "ix_videos_duration_id": "duration",
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        upgrade_postgresql()
+    elif dialect == "sqlite":
+        convert_sqlite(lambda value: uuid.UUID(value).bytes)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Offline: rewrites the table under an exclusive lock
+        op.execute("ALTER TABLE videos ALTER COLUMN id TYPE varchar USING id::text")
+    elif dialect == "sqlite":
+        convert_sqlite(lambda value: str(uuid.UUID(bytes=value)))
+
+
+def upgrade_postgresql():
+    """
+    Move the ids into a uuid shadow column without blocking writes.
+
+    Existing ids keep their value, only the type changes. The shadow column
+    is backfilled in batches and indexed concurrently while a trigger keeps
+    it in sync for rows inserted meanwhile; only the final swap takes an
+    exclusive lock, and it neither scans nor rewrites the table.
+    """
+    op.add_column(
+        "videos", sa.Column("id_uuid", postgresql.UUID(as_uuid=True), nullable=True)
+    )
+    op.execute(
+        "CREATE FUNCTION videos_sync_id_uuid() RETURNS trigger AS $$ "
+        "BEGIN NEW.id_uuid := NEW.id::uuid; RETURN NEW; END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER videos_sync_id_uuid BEFORE INSERT OR UPDATE OF id "
+        "ON videos FOR EACH ROW EXECUTE FUNCTION videos_sync_id_uuid()"
+    )
+    with op.get_context().autocommit_block():
+        # Batches walk the primary key from where the last one stopped, so
+        # converted rows are never read again; rows inserted behind the walk
+        # are filled in by the trigger
+        backfill = sa.text(
+            "WITH batch AS ("
+            "SELECT id FROM videos WHERE id > :last ORDER BY id LIMIT :batch_size"
+            "), converted AS ("
+            "UPDATE videos SET id_uuid = videos.id::uuid FROM batch "
+            "WHERE videos.id = batch.id RETURNING videos.id"
+            ") SELECT count(*), max(id) FROM converted"
+        )
+        last = ""
+        while True:
+            converted, last = (
+                op.get_bind()
+                .execute(backfill, {"last": last, "batch_size": BACKFILL_BATCH_SIZE})
+                .one()
+            )
+            if converted < BACKFILL_BATCH_SIZE:
+                break
+        op.create_index(
+            "ix_videos_id_uuid",
+            "videos",
+            ["id_uuid"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        for name, column in SORT_INDEXES.items():
+            op.create_index(
+                f"{name}_uuid",
+                "videos",
+                [column, "id_uuid"],
+                unique=False,
+                postgresql_where=sa.text("is_active = true"),
+                postgresql_concurrently=True,
+            )
+        # A validated check lets SET NOT NULL below skip the table scan
+        op.execute(
+            "ALTER TABLE videos ADD CONSTRAINT videos_id_uuid_not_null "
+            "CHECK (id_uuid IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE videos VALIDATE CONSTRAINT videos_id_uuid_not_null")
+
+    op.execute("LOCK TABLE videos IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER videos_sync_id_uuid ON videos")
+    op.execute("DROP FUNCTION videos_sync_id_uuid()")
+    # Also drops the primary key and the old (column, id) indexes
+    op.drop_column("videos", "id")
+    op.alter_column("videos", "id_uuid", new_column_name="id", nullable=False)
+    op.execute("ALTER TABLE videos DROP CONSTRAINT videos_id_uuid_not_null")
+    op.execute(
+        "ALTER TABLE videos ADD CONSTRAINT videos_pkey "
+        "PRIMARY KEY USING INDEX ix_videos_id_uuid"
+    )
+    for name in SORT_INDEXES:
+        op.execute(f"ALTER INDEX {name}_uuid RENAME TO {name}")
+
+
+def convert_sqlite(convert):
+    """
+    Rewrite every id in place with convert.
+
+    SQLite column types are only affinities and a TEXT column stores blobs
+    as they are, so the table is not rebuilt: a rebuild would renumber the
+    rowids the videos_fts index points at. SQLite locks the whole database
+    for any write, so batching would not let other writers in either.
+    """
+    connection = op.get_bind().connection.driver_connection
+    connection.create_function("convert_video_id", 1, convert, deterministic=True)
+    op.execute("UPDATE videos SET id = convert_video_id(id)")
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Add videos full text search
+
+On Postgres, adding the generated search_vector column rewrites the whole
+videos table under an ACCESS EXCLUSIVE lock, which blocks reads and writes
+for as long as the rewrite takes; run it in a maintenance window on large
+catalogs. The GIN index is then built concurrently, without blocking writes.
+
+Revision ID: a3c5e2f1b7d4
+Revises: 6df03bdd37c1
+Create Date: 2026-10-18 12:52:41.209114
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a3c5e2f1b7d4"
+down_revision = "6df03bdd37c1"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE videos ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || "
+        "coalesce(description, ''))) STORED",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+        "title, description, content='videos', content_rowid='rowid')",
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN "
+        "INSERT INTO videos_fts(rowid, title, description) "
+        "VALUES (new.rowid, new.title, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_update "
+        "AFTER UPDATE OF title, description ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); "
+        "INSERT INTO videos_fts(rowid, title, description) "
+        "VALUES (new.rowid, new.title, new.description); END",
+        # Index the rows that existed before the triggers
+        "INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')",
+    ],
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for statement in SEARCH_DDL.get(dialect, []):
+        op.execute(statement)
+    if dialect == "postgresql":
+        # Builds without blocking writes, outside a transaction
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_videos_search_vector",
+                "videos",
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                "ix_videos_search_vector",
+                table_name="videos",
+                postgresql_concurrently=True,
+            )
+        op.drop_column("videos", "search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("videos_fts_insert", "videos_fts_delete", "videos_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS videos_fts")
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Add videos partial indexes for soft delete
+
+Revision ID: e4b7a19c3d52
+Revises: c81f4d2e9a06
+Create Date: 2026-10-18 15:02:11.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e4b7a19c3d52"
+down_revision = "c81f4d2e9a06"
+branch_labels = None
+depends_on = None
+
+SORT_INDEXES = {
+    "ix_videos_created_date_id": ["created_date", "id"],
+    "ix_videos_updated_date_id": ["updated_date", "id"],
+    "ix_videos_duration_id": ["duration", "id"],
+}
+
+# The same predicates models/video.py renders, so the planner matches them
+# against the WHERE clauses of the read queries
+IS_ACTIVE = {
+    "postgresql_where": sa.text("is_active = true"),
+    "sqlite_where": sa.text("is_active = 1"),
+}
+IS_TOMBSTONE = {
+    "postgresql_where": sa.text("is_active = false"),
+    "sqlite_where": sa.text("is_active = 0"),
+}
+
+
+def upgrade() -> None:
+    for name, columns in SORT_INDEXES.items():
+        replace_index(name, columns, **IS_ACTIVE)
+    create_index("ix_videos_tombstones_updated_date", ["updated_date"], **IS_TOMBSTONE)
+
+
+def downgrade() -> None:
+    drop_index("ix_videos_tombstones_updated_date")
+    for name, columns in SORT_INDEXES.items():
+        replace_index(name, columns)
+
+
+def create_index(name, columns, **kwargs):
+    if op.get_bind().dialect.name == "postgresql":
+        # Builds without blocking writes, outside a transaction
+        with op.get_context().autocommit_block():
+            op.create_index(
+                name, "videos", columns, postgresql_concurrently=True, **kwargs
+            )
+    else:
+        op.create_index(name, "videos", columns, **kwargs)
+
+
+def drop_index(name):
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name="videos", postgresql_concurrently=True)
+    else:
+        op.drop_index(name, table_name="videos")
+
+
+def replace_index(name, columns, **kwargs):
+    """
+    Rebuild an index with new options. On Postgres the new index is built
+    concurrently under a temporary name before the old one is dropped, so
+    list queries never run without one; SQLite locks the database for any
+    write anyway.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index(name, table_name="videos")
+        op.create_index(name, "videos", columns, **kwargs)
+        return
+    create_index(f"{name}_new", columns, **kwargs)
+    drop_index(name)
+    op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
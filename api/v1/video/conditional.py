@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, NamedTuple, Optional, Union
+from uuid import UUID
+
+
+class PreconditionFailedError(ValueError):
+    """
+    Raised when an If-Match header does not match the current ETag.
+    """
+
+
+class CatalogVersion(NamedTuple):
+    """
+    What every list page depends on, read from the database: the newest
+    updated_date and the number of live videos. Creates, updates and deletes
+    all change one of them, whichever process makes them. changed_at is when
+    this process first saw the pair.
+    """
+
+    last_updated: Optional[datetime]
+    live_count: int
+    changed_at: datetime
+
+
+def video_etag(video_id: Union[str, UUID], updated_date: datetime) -> str:
+    """
+    Build the strong ETag of a single video.
+
+    Args:
+        video_id (Union[str, UUID]): The ID of the video.
+        updated_date (datetime): When the video last changed.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return f'"{video_id}-{updated_date:%Y%m%d%H%M%S%f}"'
+
+
+def if_match_versions(
+    header: str, video_id: Union[str, UUID]
+) -> Optional[List[datetime]]:
+    """
+    Turn an If-Match header into the updated dates it accepts for a video.
+
+    Weak ETags and ETags of other videos never match, as If-Match requires
+    strong comparison.
+
+    Args:
+        header (str): The comma-separated list of ETags, or "*".
+        video_id (Union[str, UUID]): The ID of the video being updated.
+
+    Returns:
+        Optional[List[datetime]]: The accepted updated dates, or None if any
+            version is accepted.
+    """
+    versions = []
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return None
+        if len(candidate) < 2 or candidate[0] != '"' or candidate[-1] != '"':
+            continue
+        etag_id, _, version = candidate[1:-1].rpartition("-")
+        if etag_id != str(video_id):
+            continue
+        try:
+            versions.append(datetime.strptime(version, "%Y%m%d%H%M%S%f"))
+        except ValueError:
+            continue
+    return versions
+
+
+def catalog_etag(version: CatalogVersion) -> str:
+    """
+    Build the strong ETag of list pages from the catalog version, the same in
+    every process.
+
+    Args:
+        version (CatalogVersion): The current catalog version.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    last_updated = version.last_updated
+    stamp = f"{last_updated:%Y%m%d%H%M%S%f}" if last_updated else "0"
+    return f'"{version.live_count}-{stamp}"'
+
+
+def http_date(value: datetime) -> str:
+    # Naive datetimes come from datetime.now, so they are in local time
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def video_headers(
+    video_id: Union[str, UUID], updated_date: Optional[datetime]
+) -> Dict[str, str]:
+    """
+    Get the validator headers of a single video response.
+
+    Args:
+        video_id (Union[str, UUID]): The ID of the video.
+        updated_date (Optional[datetime]): When the video last changed.
+
+    Returns:
+        Dict[str, str]: ETag and Last-Modified, or nothing without a date.
+    """
+    if updated_date is None:
+        return {}
+    return {
+        "ETag": video_etag(video_id, updated_date),
+        "Last-Modified": http_date(updated_date),
+    }
+
+
+def catalog_headers(version: CatalogVersion) -> Dict[str, str]:
+    """
+    Get the validator headers of a list page.
+
+    Args:
+        version (CatalogVersion): The current catalog version.
+
+    Returns:
+        Dict[str, str]: ETag and Last-Modified.
+    """
+    return {
+        "ETag": catalog_etag(version),
+        "Last-Modified": http_date(version.changed_at),
+    }
+
+
+def etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    """
+    Check an If-Match or If-None-Match header against an ETag.
+
+    Args:
+        header (str): The comma-separated list of ETags, or "*".
+        etag (str): The current strong ETag.
+        weak (bool): Whether W/ ETags in the header may match, as they may
+            for If-None-Match but not for If-Match.
+
+    Returns:
+        bool: Whether any listed ETag matches.
+    """
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(
+    headers: Dict[str, str],
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None,
+) -> bool:
+    """
+    Evaluate If-None-Match and If-Modified-Since against validator headers.
+
+    If-Modified-Since is only looked at without If-None-Match, and is ignored
+    when it cannot be parsed, as RFC 9110 requires.
+
+    Args:
+        headers (Dict[str, str]): The ETag and Last-Modified of the resource.
+        if_none_match (Optional[str]): The If-None-Match request header.
+        if_modified_since (Optional[str]): The If-Modified-Since request header.
+
+    Returns:
+        bool: Whether a 304 can be sent instead of the body.
+    """
+    if not headers:
+        return False
+    if if_none_match is not None:
+        return etag_matches(if_none_match, headers["ETag"])
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return parsedate_to_datetime(headers["Last-Modified"]) <= since
+    return False
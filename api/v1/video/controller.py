@@ -1,14 +1,51 @@
 # -*- coding: utf-8 -*-
+import csv
+import io
+from typing import Any, AsyncIterator, Dict, List, Optional
+
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.v1.video.crud import VideoCRUD
+from api.v1.video.conditional import (
+    PreconditionFailedError,
+    catalog_headers,
+    is_not_modified,
+    video_headers,
+)
+from api.v1.video.crud import SearchNotSupportedError, VideoCRUD
+from api.v1.video.importer import LINE_TOO_LONG, iter_csv_records, iter_lines
+from api.v1.video.pagination import InvalidCursorError
 from api.v1.video.schemas import (
+    VideoBatchResponse,
+    VideoBulkCreateResponse,
+    VideoBulkError,
     VideoCreateRequest,
+    VideoImportError,
+    VideoImportResponse,
+    VideoListFilters,
     VideoUpdateRequest,
     VideoResponse,
     VideoPaginatedResponse,
+    VideoSearchResponse,
+    VideoSuggestResponse,
 )
+from core.cache import ResponseCache
+from core.config import config
+from models.base_model import parse_id
+
+EXPORT_FIELDS = ["id", "title", "description", "duration"]
+
+
+def validation_errors(e: ValidationError) -> List[Dict[str, Any]]:
+    """
+    Reduce a ValidationError to JSON-safe dicts without echoing the input.
+    """
+    return [
+        {"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]}
+        for error in e.errors()
+    ]
 
 
 class VideoController:
@@ -20,15 +57,16 @@ class VideoController:
             video_crud (VideoCRUD): The video CRUD operations instance.
         """
         self.video_crud = video_crud
+        self.list_cache = ResponseCache(max_bytes=config.VIDEO_LIST_CACHE_MAX_BYTES)
 
     async def create_video(
-        self, db: Session, video: VideoCreateRequest
+        self, db: AsyncSession, video: VideoCreateRequest
     ) -> VideoResponse:
         """
         Create a video.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video (VideoCreateRequest): The video data.
 
         Returns:
@@ -42,59 +80,153 @@ class VideoController:
             raise HTTPException(status_code=404, detail="Video not found")
         return db_video
 
-    async def get_video(self, db: Session, video_id: str) -> VideoResponse:
+    async def create_videos(
+        self, db: AsyncSession, videos: List[Any]
+    ) -> VideoBulkCreateResponse:
+        """
+        Create many videos at once.
+
+        Every item is validated on its own; invalid items are reported by
+        index and the valid ones are still created.
+
+        Args:
+            db (AsyncSession): The database session.
+            videos (List[Any]): The raw video payloads.
+
+        Returns:
+            VideoBulkCreateResponse: The created videos and per-item errors.
+
+        Raises:
+            HTTPException: If more than VIDEO_BULK_MAX_ITEMS videos are sent.
+        """
+        if len(videos) > config.VIDEO_BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {config.VIDEO_BULK_MAX_ITEMS} videos per request",
+            )
+        valid_videos, errors = [], []
+        for index, item in enumerate(videos):
+            try:
+                valid_videos.append(VideoCreateRequest.model_validate(item))
+            except ValidationError as e:
+                errors.append(VideoBulkError(index=index, errors=validation_errors(e)))
+        created_videos = await self.video_crud.create_videos(db=db, videos=valid_videos)
+        return VideoBulkCreateResponse(
+            data=created_videos, errors=errors, created_count=len(created_videos)
+        )
+
+    async def get_video(
+        self,
+        db: AsyncSession,
+        video_id: str,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+    ) -> VideoResponse:
         """
         Get a video by ID.
 
+        With a conditional header only the video's updated date is looked
+        up first, from the cache when possible, and a 304 is raised without
+        loading the row if the client's copy is current.
+
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video_id (str): The ID of the video.
+            if_none_match (Optional[str]): The If-None-Match request header.
+            if_modified_since (Optional[str]): The If-Modified-Since request header.
 
         Returns:
             VideoResponse: The retrieved video.
 
         Raises:
-            HTTPException: If the video is not found.
+            HTTPException: If the video is not found or not modified.
         """
+        if if_none_match is not None or if_modified_since is not None:
+            updated_date = await self.video_crud.get_video_version(
+                db=db, video_id=video_id
+            )
+            if updated_date is None:
+                raise HTTPException(status_code=404, detail="Video not found")
+            headers = video_headers(parse_id(video_id), updated_date)
+            if is_not_modified(headers, if_none_match, if_modified_since):
+                raise HTTPException(status_code=304, headers=headers)
         db_video = await self.video_crud.get_video(db=db, video_id=video_id)
         if not db_video:
             raise HTTPException(status_code=404, detail="Video not found")
         return db_video
 
+    async def get_videos_by_ids(
+        self, db: AsyncSession, video_ids: List[str]
+    ) -> VideoBatchResponse:
+        """
+        Get many videos by ID.
+
+        Args:
+            db (AsyncSession): The database session.
+            video_ids (List[str]): The IDs of the videos.
+
+        Returns:
+            VideoBatchResponse: The videos in request order, null where the
+                ID does not exist, and the list of missing IDs.
+
+        Raises:
+            HTTPException: If more than VIDEO_BATCH_MAX_IDS IDs are requested.
+        """
+        if len(video_ids) > config.VIDEO_BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {config.VIDEO_BATCH_MAX_IDS} ids per request",
+            )
+        videos = await self.video_crud.get_videos_by_ids(db=db, video_ids=video_ids)
+        return VideoBatchResponse(
+            data=videos,
+            missing=[
+                video_id for video_id, video in zip(video_ids, videos) if video is None
+            ],
+        )
+
     async def update_video(
-        self, db: Session, video_id: str, video: VideoUpdateRequest
-    ) -> VideoResponse:
+        self,
+        db: AsyncSession,
+        video_id: str,
+        video: VideoUpdateRequest,
+        if_match: Optional[str] = None,
+    ) -> Row:
         """
         Update a video.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video_id (str): The ID of the video to update.
             video (VideoUpdateRequest): The updated video data.
+            if_match (Optional[str]): The If-Match request header.
 
         Returns:
-            VideoResponse: The updated video.
+            Row: The updated row.
 
         Raises:
-            HTTPException: If the video is not found.
+            HTTPException: If the video is not found or changed since if_match.
         """
-        db_video = await self.video_crud.update_video(
-            db=db, video_id=video_id, video=video
-        )
+        try:
+            db_video = await self.video_crud.update_video(
+                db=db, video_id=video_id, video=video, if_match=if_match
+            )
+        except PreconditionFailedError as e:
+            raise HTTPException(status_code=412, detail=str(e))
         if not db_video:
             raise HTTPException(status_code=404, detail="Video not found")
         return db_video
 
-    async def delete_video(self, db: Session, video_id: str):
+    async def delete_video(self, db: AsyncSession, video_id: str) -> Row:
         """
         Delete a video.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video_id (str): The ID of the video to delete.
 
         Returns:
-            None
+            Row: The deleted row.
 
         Raises:
             HTTPException: If the video is not found.
@@ -105,23 +237,317 @@ class VideoController:
         return db_video
 
     async def get_videos(
-        self, db: Session, limit: int = 10, offset: int = 0
+        self,
+        db: AsyncSession,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        filters: Optional[VideoListFilters] = None,
+        sort: str = "created_date",
     ) -> VideoPaginatedResponse:
         """
         Get a paginated list of videos.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             limit (int): The number of records per page.
             offset (int): The offset for pagination.
+            cursor (Optional[str]): The next_cursor of the previous page.
+            include_total (bool): Whether to compute total_count at all.
+            filters (Optional[VideoListFilters]): Duration and date bounds.
+            sort (str): The sort column, prefixed with "-" to sort descending.
 
         Returns:
             VideoPaginatedResponse: The paginated list of videos.
 
         Raises:
-            HTTPException: If the video is not found.
+            HTTPException: If the cursor is invalid or the video is not found.
         """
-        db_video = await self.video_crud.get_videos(db=db, limit=limit, offset=offset)
+        try:
+            db_video = await self.video_crud.get_videos(
+                db=db,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                include_total=include_total,
+                filters=filters,
+                sort=sort,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         if not db_video:
             raise HTTPException(status_code=404, detail="Video not found")
         return db_video
+
+    async def get_videos_json(
+        self,
+        db: AsyncSession,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        filters: Optional[VideoListFilters] = None,
+        sort: str = "created_date",
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> bytes:
+        """
+        Get a paginated list of videos as encoded JSON.
+
+        Any write to the catalog changes the ETag of every page, so a
+        conditional request is answered with a 304 without querying the page.
+        With VIDEO_LIST_CACHE_MAX_BYTES set, pages are kept already encoded,
+        keyed by their query parameters, until the catalog ETag changes. The
+        catalog version is only read when one of the two uses it.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The number of records per page.
+            offset (int): The offset for pagination.
+            cursor (Optional[str]): The next_cursor of the previous page.
+            include_total (bool): Whether to compute total_count at all.
+            filters (Optional[VideoListFilters]): Duration and date bounds.
+            sort (str): The sort column, prefixed with "-" to sort descending.
+            if_none_match (Optional[str]): The If-None-Match request header.
+            if_modified_since (Optional[str]): The If-Modified-Since request header.
+            headers (Optional[Dict[str, str]]): The get_list_headers result,
+                when the caller already has it; read before the query either way.
+
+        Returns:
+            bytes: The VideoPaginatedResponse as JSON.
+
+        Raises:
+            HTTPException: If the cursor is invalid, the video is not found or
+                the catalog is not modified.
+        """
+        # Read before the query, so a page is never cached under a newer
+        # version than the data it was built from
+        if headers is None:
+            headers = await self.get_list_headers(db, if_none_match, if_modified_since)
+        if is_not_modified(headers, if_none_match, if_modified_since):
+            raise HTTPException(status_code=304, headers=headers)
+        caching = self.list_cache.max_bytes > 0
+        generation = headers.get("ETag")
+        key = (
+            limit,
+            None if cursor else offset,
+            cursor,
+            include_total,
+            tuple((filters or VideoListFilters()).model_dump().items()),
+            sort,
+        )
+        if caching:
+            body = self.list_cache.get(key, generation)
+            if body is not None:
+                return body
+        videos = await self.get_videos(
+            db=db,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+            filters=filters,
+            sort=sort,
+        )
+        body = videos.model_dump_json().encode()
+        if caching:
+            self.list_cache.set(key, generation, body)
+        return body
+
+    async def search_videos(
+        self,
+        db: AsyncSession,
+        q: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> VideoSearchResponse:
+        """
+        Full-text search over title and description.
+
+        Args:
+            db (AsyncSession): The database session.
+            q (str): The search terms.
+            limit (int): The number of records per page.
+            cursor (Optional[str]): The next_cursor of the previous page.
+
+        Returns:
+            VideoSearchResponse: The matching videos, best matches first.
+
+        Raises:
+            HTTPException: If the cursor is invalid or the database has no
+                full-text search.
+        """
+        try:
+            return await self.video_crud.search_videos(
+                db=db, q=q, limit=limit, cursor=cursor
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except SearchNotSupportedError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+
+    async def suggest_videos(
+        self, db: AsyncSession, prefix: str, limit: int = 10
+    ) -> VideoSuggestResponse:
+        """
+        Suggest videos whose title starts with prefix.
+
+        Args:
+            db (AsyncSession): The database session.
+            prefix (str): What the user has typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            VideoSuggestResponse: The matching videos ordered by title.
+        """
+        videos = await self.video_crud.suggest_videos(db=db, prefix=prefix, limit=limit)
+        return VideoSuggestResponse(data=videos)
+
+    async def export_videos(
+        self, db: AsyncSession, export_format: str = "ndjson"
+    ) -> AsyncIterator[str]:
+        """
+        Export the whole catalog as NDJSON or CSV.
+
+        Args:
+            db (AsyncSession): The database session.
+            export_format (str): "ndjson" or "csv".
+
+        Yields:
+            str: The next chunk of the export, one chunk per batch of rows.
+        """
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            async for videos in self.video_crud.stream_videos(db=db):
+                writer.writerows(
+                    [getattr(video, field) for field in EXPORT_FIELDS]
+                    for video in videos
+                )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            async for videos in self.video_crud.stream_videos(db=db):
+                yield "".join(f"{video.model_dump_json()}\n" for video in videos)
+
+    async def import_videos(
+        self,
+        db: AsyncSession,
+        chunks: AsyncIterator[bytes],
+        import_format: str = "ndjson",
+        batch_size: Optional[int] = None,
+    ) -> VideoImportResponse:
+        """
+        Import videos from an NDJSON or CSV stream.
+
+        Each record is validated against VideoCreateRequest as it arrives and
+        valid ones are written through VideoCRUD.create_videos, one commit per
+        batch, so the body is never held in memory. Batches committed before
+        a database error stay committed.
+
+        Args:
+            db (AsyncSession): The database session.
+            chunks (AsyncIterator[bytes]): The request body as it arrives.
+            import_format (str): "ndjson" or "csv" (with a header row).
+            batch_size (Optional[int]): Rows per commit. Defaults to
+                config.VIDEO_IMPORT_BATCH_SIZE.
+
+        Returns:
+            VideoImportResponse: Inserted, failed and skipped counts, with the
+                line numbers of failed records.
+        """
+        batch_size = batch_size or config.VIDEO_IMPORT_BATCH_SIZE
+        summary = VideoImportResponse()
+        batch = []
+
+        def fail(line: int, errors: List[Dict[str, Any]]):
+            summary.failed += 1
+            if len(summary.errors) < config.VIDEO_IMPORT_MAX_REPORTED_ERRORS:
+                summary.errors.append(VideoImportError(line=line, errors=errors))
+
+        if import_format == "csv":
+            records = iter_csv_records(chunks)
+        else:
+            records = (
+                (line_number, line, None if line is not None else LINE_TOO_LONG)
+                async for line_number, line in iter_lines(chunks)
+            )
+        async for line_number, record, error in records:
+            if error is not None:
+                fail(line_number, [{"loc": [], "msg": error, "type": "value_error"}])
+                continue
+            if record is None or (import_format != "csv" and not record.strip()):
+                summary.skipped += 1
+                continue
+            try:
+                if import_format == "csv":
+                    batch.append(VideoCreateRequest.model_validate(record))
+                else:
+                    batch.append(VideoCreateRequest.model_validate_json(record))
+            except ValidationError as e:
+                fail(line_number, validation_errors(e))
+                continue
+            if len(batch) >= batch_size:
+                await self.video_crud.create_videos(db=db, videos=batch)
+                summary.inserted += len(batch)
+                batch = []
+        if batch:
+            await self.video_crud.create_videos(db=db, videos=batch)
+            summary.inserted += len(batch)
+        return summary
+
+    async def get_catalog_headers(self, db: AsyncSession) -> Dict[str, str]:
+        """
+        Get the ETag and Last-Modified shared by all list pages.
+
+        Args:
+            db (AsyncSession): The database session.
+
+        Returns:
+            Dict[str, str]: The validator headers.
+        """
+        return catalog_headers(await self.video_crud.get_catalog_version(db))
+
+    async def get_list_headers(
+        self,
+        db: AsyncSession,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Get the catalog headers of a list request, or none when neither the
+        request is conditional nor the list cache is enabled, as reading the
+        catalog version costs a query.
+
+        Args:
+            db (AsyncSession): The database session.
+            if_none_match (Optional[str]): The If-None-Match request header.
+            if_modified_since (Optional[str]): The If-Modified-Since request header.
+
+        Returns:
+            Dict[str, str]: The validator headers, possibly empty.
+        """
+        if (
+            if_none_match is None
+            and if_modified_since is None
+            and self.list_cache.max_bytes <= 0
+        ):
+            return {}
+        return await self.get_catalog_headers(db)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get the counters of the single-video cache, with those of the list
+        page cache under "list_cache".
+
+        Returns:
+            Dict[str, Any]: Size, hit, miss and eviction counters.
+        """
+        return dict(
+            self.video_crud.video_cache.stats(), list_cache=self.list_cache.stats()
+        )
@@ -1,26 +1,112 @@
 # -*- coding: utf-8 -*-
-from typing import Optional
+import re
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Row,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from api.v1.video.conditional import (
+    CatalogVersion,
+    PreconditionFailedError,
+    if_match_versions,
+)
+from api.v1.video.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
 from api.v1.video.schemas import (
     VideoCreateRequest,
+    VideoListFilters,
     VideoUpdateRequest,
+    VIDEO_RESPONSE_LIST,
     VideoResponse,
     VideoPaginatedResponse,
+    VideoSearchResponse,
+    VideoSearchResult,
+    VideoSuggestion,
 )
-from models.video import VideoModel
+from core.cache import CachedValue, Generation, LRUCache
+from core.config import config
+from core.prefix_index import PrefixIndex
+from models.base_model import generate_id, parse_id
+from models.video import IS_ACTIVE, VideoModel
+
+# Every sort has a matching partial (column, id) index over live rows, see
+# models/video.py; every read filters on IS_ACTIVE so it can use them
+# Read paths select the table rather than the mapped class: rows come back as
+# plain tuples, skipping ORM instance construction, and are validated into
+# response models once, from dicts
+videos_table = VideoModel.__table__
+
+SORT_COLUMNS = {
+    "created_date": VideoModel.created_date,
+    "updated_date": VideoModel.updated_date,
+    "duration": VideoModel.duration,
+}
+
+
+class SearchNotSupportedError(ValueError):
+    """
+    Raised when full-text search is not set up for the database in use.
+    """
 
 
 class VideoCRUD:
+    def __init__(self, count_strategy: Optional[str] = None):
+        """
+        VideoCRUD constructor.
+
+        Args:
+            count_strategy (Optional[str]): How total_count is computed on list
+                pages: "exact", "cached" or "estimated". Defaults to
+                config.VIDEO_COUNT_STRATEGY.
+        """
+        self.count_strategy = count_strategy or config.VIDEO_COUNT_STRATEGY
+        self.count_cache = CachedValue(ttl=config.VIDEO_COUNT_CACHE_TTL)
+        self.video_cache = LRUCache(
+            max_size=config.VIDEO_CACHE_MAX_SIZE, ttl=config.VIDEO_CACHE_TTL
+        )
+        self.title_index = PrefixIndex()
+        # The catalog version the title index was loaded from, and when
+        self._title_index_version = None
+        self._title_index_checked_at = 0.0
+        # Bumped by every write through this instance
+        self.write_generation = Generation()
+        # (generation, CatalogVersion) of the last catalog version read
+        self.catalog_cache = CachedValue(ttl=config.VIDEO_CATALOG_VERSION_TTL)
+        # The live count in the catalog version, refreshed far less often
+        self.live_count_cache = CachedValue(ttl=config.VIDEO_COUNT_CACHE_TTL)
+        self._last_catalog_version = None
+
     async def create_video(
-        self, db: Session, video: VideoCreateRequest
+        self, db: AsyncSession, video: VideoCreateRequest
     ) -> VideoResponse:
         """
         Create a video.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video (VideoCreateRequest): The video data.
 
         Returns:
@@ -28,83 +114,662 @@ class VideoCRUD:
         """
         db_video = VideoModel(**video.model_dump())
         db.add(db_video)
-        db.commit()
-        db.refresh(db_video)
+        await db.commit()
+        self.count_cache.invalidate()
+        self.live_count_cache.invalidate()
+        self.write_generation.bump()
+        await db.refresh(db_video)
+        self.title_index.add(str(db_video.id), db_video.title)
         return db_video
 
-    async def get_video(self, db: Session, video_id: str) -> Optional[VideoResponse]:
+    async def create_videos(
+        self, db: AsyncSession, videos: List[VideoCreateRequest]
+    ) -> List[VideoResponse]:
+        """
+        Create many videos in a single transaction.
+
+        IDs and timestamps are generated here rather than by the database, so
+        the rows go out as one executemany INSERT and the response is built
+        without reading them back.
+
+        Args:
+            db (AsyncSession): The database session.
+            videos (List[VideoCreateRequest]): The video data.
+
+        Returns:
+            List[VideoResponse]: The created videos, in request order.
+        """
+        if not videos:
+            return []
+        now = datetime.now()
+        rows = [
+            dict(
+                video.model_dump(),
+                id=generate_id(),
+                created_date=now,
+                updated_date=now,
+                is_active=True,
+            )
+            for video in videos
+        ]
+        await db.execute(insert(VideoModel), rows)
+        await db.commit()
+        self.count_cache.invalidate()
+        self.live_count_cache.invalidate()
+        self.write_generation.bump()
+        self.title_index.add_many((str(row["id"]), row["title"]) for row in rows)
+        return [VideoResponse.model_validate(row) for row in rows]
+
+    async def get_video(
+        self, db: AsyncSession, video_id: str
+    ) -> Optional[VideoResponse]:
         """
         Get a video by ID.
 
+        Lookups are served from an in-process LRU cache of VideoResponse
+        objects when possible; update_video and delete_video invalidate it.
+        A row read while a write commits is returned but not cached, as it
+        may predate the write.
+
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video_id (str): The ID of the video.
 
         Returns:
             Optional[VideoResponse]: The retrieved video or None if not found.
         """
-        return db.query(VideoModel).filter_by(id=video_id).first()
+        video_id = parse_id(video_id)
+        if video_id is None:
+            return
+        cached = self.video_cache.get(str(video_id))
+        if cached is not None:
+            return cached
+        generation = self.write_generation.value
+        result = await db.execute(
+            select(videos_table).where(videos_table.c.id == video_id, IS_ACTIVE)
+        )
+        row = result.mappings().first()
+        if not row:
+            return
+        video = VideoResponse.model_validate(dict(row))
+        if self.write_generation.value == generation:
+            self.video_cache.set(str(video_id), video)
+        return video
+
+    async def get_videos_by_ids(
+        self, db: AsyncSession, video_ids: List[str]
+    ) -> List[Optional[VideoResponse]]:
+        """
+        Get many videos by ID with as few queries as possible.
+
+        IDs found in the video cache are served from it; the rest are
+        resolved with one WHERE id IN (...) query per
+        VIDEO_BATCH_CHUNK_SIZE IDs.
+
+        Args:
+            db (AsyncSession): The database session.
+            video_ids (List[str]): The IDs of the videos.
+
+        Returns:
+            List[Optional[VideoResponse]]: The videos in request order, with
+                None for IDs that do not exist.
+        """
+        parsed = [parse_id(video_id) for video_id in video_ids]
+        found = {}
+        pending = []
+        for video_id in dict.fromkeys(str(video_id) for video_id in parsed if video_id):
+            cached = self.video_cache.get(video_id)
+            if cached is not None:
+                found[video_id] = cached
+            else:
+                pending.append(video_id)
+        chunk_size = config.VIDEO_BATCH_CHUNK_SIZE
+        for start in range(0, len(pending), chunk_size):
+            end = start + chunk_size
+            generation = self.write_generation.value
+            result = await db.execute(
+                select(videos_table).where(
+                    videos_table.c.id.in_(pending[start:end]), IS_ACTIVE
+                )
+            )
+            rows = [dict(row) for row in result.mappings()]
+            # Rows read while a write committed may predate it
+            cacheable = self.write_generation.value == generation
+            for video in VIDEO_RESPONSE_LIST.validate_python(rows):
+                found[str(video.id)] = video
+                if cacheable:
+                    self.video_cache.set(str(video.id), video)
+        return [found.get(str(video_id)) for video_id in parsed]
+
+    async def get_video_version(
+        self, db: AsyncSession, video_id: str
+    ) -> Optional[datetime]:
+        """
+        Get when a video last changed, without loading the whole row.
+
+        Args:
+            db (AsyncSession): The database session.
+            video_id (str): The ID of the video.
+
+        Returns:
+            Optional[datetime]: The updated date or None if not found.
+        """
+        video_id = parse_id(video_id)
+        if video_id is None:
+            return
+        cached = self.video_cache.get(str(video_id))
+        if cached is not None and cached.updated_date is not None:
+            return cached.updated_date
+        return await db.scalar(
+            select(VideoModel.updated_date).where(VideoModel.id == video_id, IS_ACTIVE)
+        )
 
     async def update_video(
-        self, db: Session, video_id: str, video: VideoUpdateRequest
-    ) -> Optional[VideoResponse]:
+        self,
+        db: AsyncSession,
+        video_id: str,
+        video: VideoUpdateRequest,
+        if_match: Optional[str] = None,
+    ) -> Optional[Row]:
         """
-        Update a video.
+        Update a video with a single UPDATE ... RETURNING statement.
+
+        With if_match the WHERE clause also requires one of the updated dates
+        its ETags stand for, so concurrent writers cannot overwrite each
+        other. Only when no row is updated is a second query made, to tell a
+        missing video from a changed one.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video_id (str): The ID of the video to update.
             video (VideoUpdateRequest): The updated video data.
+            if_match (Optional[str]): The If-Match header of the request.
 
         Returns:
-            Optional[VideoResponse]: The updated video or None if not found.
+            Optional[Row]: The updated row or None if not found.
+
+        Raises:
+            PreconditionFailedError: If the video changed since if_match.
         """
-        db_video = db.query(VideoModel).filter_by(id=video_id).first()
-        if not db_video:
+        video_id = parse_id(video_id)
+        if video_id is None:
             return
-        for field, value in video.model_dump(exclude_unset=True).items():
-            setattr(db_video, field, value)
-        db.commit()
-        db.refresh(db_video)
-        return db_video
+        conditions = [videos_table.c.id == video_id, IS_ACTIVE]
+        versions = if_match_versions(if_match, video_id) if if_match else None
+        if versions is not None:
+            conditions.append(videos_table.c.updated_date.in_(versions))
+        result = await db.execute(
+            update(videos_table)
+            .where(*conditions)
+            .values(**video.model_dump(exclude_unset=True))
+            .returning(videos_table)
+        )
+        row = result.first()
+        if row is None:
+            await db.rollback()
+            if versions is not None and await self._video_exists(db, video_id):
+                raise PreconditionFailedError("Video has changed")
+            return
+        await db.commit()
+        self.video_cache.invalidate(str(video_id))
+        self.write_generation.bump()
+        self.title_index.add(str(row.id), row.title)
+        return row
+
+    async def _video_exists(self, db: AsyncSession, video_id: str) -> bool:
+        video = await db.scalar(
+            select(videos_table.c.id).where(videos_table.c.id == video_id, IS_ACTIVE)
+        )
+        return video is not None
 
-    async def delete_video(self, db: Session, video_id: str):
+    async def delete_video(self, db: AsyncSession, video_id: str) -> Optional[Row]:
         """
-        Delete a video.
+        Delete a video with a single DELETE ... RETURNING statement.
+
+        With VIDEO_SOFT_DELETE the statement is an UPDATE that clears
+        is_active instead, leaving a tombstone for the purge command.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             video_id (str): The ID of the video to delete.
 
         Returns:
-            None
+            Optional[Row]: The deleted row or None if not found.
         """
-        db_video = db.query(VideoModel).filter_by(id=video_id).first()
-        if not db_video:
+        video_id = parse_id(video_id)
+        if video_id is None:
             return
-        db.delete(db_video)
-        db.commit()
-        return db_video
+        if config.VIDEO_SOFT_DELETE:
+            statement = update(videos_table).values(is_active=False)
+        else:
+            statement = delete(videos_table)
+        result = await db.execute(
+            statement.where(videos_table.c.id == video_id, IS_ACTIVE).returning(
+                videos_table
+            )
+        )
+        row = result.first()
+        if row is None:
+            await db.rollback()
+            return
+        await db.commit()
+        self.video_cache.invalidate(str(video_id))
+        self.count_cache.invalidate()
+        self.live_count_cache.invalidate()
+        self.write_generation.bump()
+        self.title_index.remove(str(video_id))
+        return row
 
     async def get_videos(
-        self, db: Session, limit: int = 10, offset: int = 0
+        self,
+        db: AsyncSession,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        filters: Optional[VideoListFilters] = None,
+        sort: str = "created_date",
     ) -> VideoPaginatedResponse:
         """
         Get a paginated list of videos.
 
+        Pages are ordered by the sort column, then id. When a cursor is given
+        the page starts right after the row it points at (keyset pagination)
+        and offset is ignored, so deep pages cost the same as the first one.
+
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             limit (int): The number of records per page.
             offset (int): The offset for pagination.
+            cursor (Optional[str]): The next_cursor of the previous page.
+            include_total (bool): Whether to compute total_count at all.
+            filters (Optional[VideoListFilters]): Duration and date bounds.
+            sort (str): A key of SORT_COLUMNS, prefixed with "-" to sort
+                descending.
 
         Returns:
             VideoPaginatedResponse: The paginated list of videos.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
         """
-        videos = db.query(VideoModel).offset(offset).limit(limit).all()
-        total_videos = db.query(VideoModel).count()
+        query = self.list_query(filters=filters, sort=sort, cursor=cursor)
+        if cursor:
+            offset = None
+        else:
+            query = query.offset(offset)
+        # Fetch one extra row to find out whether there is a next page
+        result = await db.execute(query.limit(limit + 1))
+        videos = [dict(row) for row in result.mappings()]
+        next_cursor = None
+        if len(videos) > limit:
+            videos = videos[:limit]
+            sort_value = videos[-1][sort.lstrip("-")]
+            next_cursor = encode_cursor(sort_value, videos[-1]["id"])
+        total_videos, total_count_exact = None, None
+        if include_total:
+            total_videos, total_count_exact = await self.count_videos(
+                db=db, filters=filters
+            )
         return VideoPaginatedResponse(
             data=videos,
             offset=offset,
             limit=limit,
             total_count=total_videos,
+            total_count_exact=total_count_exact,
+            next_cursor=next_cursor,
+        )
+
+    def list_query(
+        self,
+        filters: Optional[VideoListFilters] = None,
+        sort: str = "created_date",
+        cursor: Optional[str] = None,
+    ) -> Select:
+        """
+        Build the SELECT behind get_videos, without offset or limit.
+
+        Args:
+            filters (Optional[VideoListFilters]): Duration and date bounds.
+            sort (str): A key of SORT_COLUMNS, prefixed with "-" to sort
+                descending.
+            cursor (Optional[str]): The next_cursor of the previous page.
+
+        Returns:
+            Select: The filtered and ordered query.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+        """
+        descending = sort.startswith("-")
+        sort_column = SORT_COLUMNS[sort.lstrip("-")]
+        query = select(videos_table).where(IS_ACTIVE, *self._filter_conditions(filters))
+        if cursor:
+            value_type = int if sort_column is VideoModel.duration else datetime
+            sort_value, video_id = decode_cursor(cursor, value_type=value_type)
+            video_id = parse_id(video_id)
+            if video_id is None:
+                raise InvalidCursorError("Invalid pagination cursor")
+            position = tuple_(sort_column, VideoModel.id)
+            # Tuple elements are not typed after the columns, so the ID is
+            # bound with the column type to be compared as a UUID
+            after = tuple_(sort_value, literal(video_id, VideoModel.id.type))
+            query = query.where(position < after if descending else position > after)
+        if descending:
+            return query.order_by(sort_column.desc(), VideoModel.id.desc())
+        return query.order_by(sort_column, VideoModel.id)
+
+    @staticmethod
+    def _filter_conditions(filters: Optional[VideoListFilters]) -> list:
+        if filters is None:
+            return []
+        conditions = []
+        if filters.min_duration is not None:
+            conditions.append(VideoModel.duration >= filters.min_duration)
+        if filters.max_duration is not None:
+            conditions.append(VideoModel.duration <= filters.max_duration)
+        if filters.created_after is not None:
+            conditions.append(VideoModel.created_date > filters.created_after)
+        if filters.updated_since is not None:
+            conditions.append(VideoModel.updated_date >= filters.updated_since)
+        return conditions
+
+    async def search_videos(
+        self,
+        db: AsyncSession,
+        q: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> VideoSearchResponse:
+        """
+        Full-text search over title and description, best matches first.
+
+        Every word of q must match. Postgres ranks with ts_rank_cd over the
+        GIN-indexed search_vector column, SQLite with bm25 over the videos_fts
+        FTS5 table. Pages continue after the (score, id) of the cursor.
+
+        Args:
+            db (AsyncSession): The database session.
+            q (str): The search terms.
+            limit (int): The number of records per page.
+            cursor (Optional[str]): The next_cursor of the previous page.
+
+        Returns:
+            VideoSearchResponse: The matching videos with their scores.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+            SearchNotSupportedError: If the database has no full-text search.
+        """
+        terms = re.findall(r"\w+", q)
+        if not terms:
+            return VideoSearchResponse(data=[], limit=limit)
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            search_vector = literal_column("videos.search_vector")
+            ts_query = func.plainto_tsquery("english", " ".join(terms))
+            ranked = select(
+                VideoModel.id.label("id"),
+                func.ts_rank_cd(search_vector, ts_query).label("score"),
+            ).where(search_vector.op("@@")(ts_query))
+        elif dialect == "sqlite":
+            videos_fts = table("videos_fts", column("rowid"))
+            ranked = (
+                select(
+                    VideoModel.id.label("id"),
+                    (-func.bm25(literal_column("videos_fts"))).label("score"),
+                )
+                .select_from(videos_fts)
+                .join(VideoModel, literal_column("videos.rowid") == videos_fts.c.rowid)
+                .where(
+                    literal_column("videos_fts").op("MATCH")(
+                        " ".join(f'"{term}"' for term in terms)
+                    )
+                )
+            )
+        else:
+            raise SearchNotSupportedError(
+                f"Full-text search is not set up for {dialect}"
+            )
+        ranked = ranked.subquery()
+        query = (
+            select(
+                videos_table.c.id,
+                videos_table.c.title,
+                videos_table.c.description,
+                videos_table.c.duration,
+                ranked.c.score,
+            )
+            .join(ranked, ranked.c.id == videos_table.c.id)
+            .where(IS_ACTIVE)
+        )
+        if cursor:
+            score, video_id = decode_search_cursor(cursor)
+            video_id = parse_id(video_id)
+            if video_id is None:
+                raise InvalidCursorError("Invalid pagination cursor")
+            query = query.where(
+                or_(
+                    ranked.c.score < score,
+                    and_(ranked.c.score == score, ranked.c.id > video_id),
+                )
+            )
+        result = await db.execute(
+            query.order_by(ranked.c.score.desc(), ranked.c.id).limit(limit + 1)
+        )
+        rows = result.mappings().all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_search_cursor(rows[-1]["score"], rows[-1]["id"])
+        return VideoSearchResponse(
+            data=[VideoSearchResult.model_validate(dict(row)) for row in rows],
+            limit=limit,
+            next_cursor=next_cursor,
+        )
+
+    async def suggest_videos(
+        self, db: AsyncSession, prefix: str, limit: int = 10
+    ) -> List[VideoSuggestion]:
+        """
+        Suggest videos whose title starts with prefix, ignoring case.
+
+        Suggestions come from the in-memory title index, so the database is
+        only read the first time, when the index is loaded. Writes through
+        this instance update it in place; writes by other processes are
+        picked up by reloading it when the catalog version has changed, at
+        most every VIDEO_SUGGEST_RELOAD_INTERVAL seconds, while the previous
+        index keeps answering. Only requests that arrive while another one is
+        loading it for the first time fall back to a prefix query.
+
+        Args:
+            db (AsyncSession): The database session.
+            prefix (str): What the user has typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            List[VideoSuggestion]: The matching videos ordered by title.
+        """
+        if self.title_index.loading and not self.title_index.loaded:
+            result = await db.execute(
+                select(VideoModel.id, VideoModel.title)
+                .where(VideoModel.title.istartswith(prefix, autoescape=True), IS_ACTIVE)
+                .order_by(func.lower(VideoModel.title), VideoModel.id)
+                .limit(limit)
+            )
+            return [
+                VideoSuggestion(id=video_id, title=title) for video_id, title in result
+            ]
+        if not self.title_index.loaded or await self._title_index_stale(db):
+            await self.load_title_index(db=db)
+        return [
+            VideoSuggestion(id=video_id, title=title)
+            for video_id, title in self.title_index.search(prefix, limit)
+        ]
+
+    async def load_title_index(self, db: AsyncSession):
+        """
+        Build the title index from every live video in the database.
+
+        Titles written while the rows are being read are applied once the
+        load completes. A reload that fails keeps the previous index.
+
+        Args:
+            db (AsyncSession): The database session.
+        """
+        self.title_index.begin_load()
+        try:
+            # Read first, so writes made during the load trigger a reload
+            version = await self.get_catalog_version(db)
+            result = await db.stream(
+                select(VideoModel.id, VideoModel.title)
+                .where(IS_ACTIVE)
+                .execution_options(yield_per=config.VIDEO_EXPORT_BATCH_SIZE)
+            )
+            entries = [(str(video_id), title) async for video_id, title in result]
+        except BaseException:
+            self.title_index.abort_load()
+            raise
+        self.title_index.load(entries)
+        self._title_index_version = version
+        self._title_index_checked_at = time.monotonic()
+
+    async def _title_index_stale(self, db: AsyncSession) -> bool:
+        now = time.monotonic()
+        if now - self._title_index_checked_at < config.VIDEO_SUGGEST_RELOAD_INTERVAL:
+            return False
+        self._title_index_checked_at = now
+        # Writes through this instance change the version too, so the index
+        # may be reloaded for nothing, but at most once per interval
+        version = await self.get_catalog_version(db)
+        return version[:2] != self._title_index_version[:2]
+
+    async def stream_videos(
+        self, db: AsyncSession, batch_size: Optional[int] = None
+    ) -> AsyncIterator[List[VideoResponse]]:
+        """
+        Stream every live video in (created_date, id) order.
+
+        Rows are read through a server-side cursor batch_size at a time, so
+        memory use does not depend on the size of the table.
+
+        Args:
+            db (AsyncSession): The database session.
+            batch_size (Optional[int]): Rows per batch. Defaults to
+                config.VIDEO_EXPORT_BATCH_SIZE.
+
+        Yields:
+            List[VideoResponse]: The next batch of videos.
+        """
+        batch_size = batch_size or config.VIDEO_EXPORT_BATCH_SIZE
+        result = await db.stream(
+            select(videos_table)
+            .where(IS_ACTIVE)
+            .order_by(videos_table.c.created_date, videos_table.c.id)
+            .execution_options(yield_per=batch_size)
         )
+        async for partition in result.mappings().partitions():
+            yield VIDEO_RESPONSE_LIST.validate_python([dict(row) for row in partition])
+
+    async def get_catalog_version(self, db: AsyncSession) -> CatalogVersion:
+        """
+        Get the version of the catalog that list pages are validated against.
+
+        The version is read from the database, so writes by other processes
+        are seen too, and kept for VIDEO_CATALOG_VERSION_TTL seconds or until
+        the next write through this instance. The newest updated_date is one
+        index descent. The live count, which reads every live row, is only
+        there to reveal hard deletes: it is kept for VIDEO_COUNT_CACHE_TTL
+        seconds whatever the count strategy, or until the next create or
+        delete through this instance.
+
+        Args:
+            db (AsyncSession): The database session.
+
+        Returns:
+            CatalogVersion: The newest updated_date and live video count.
+        """
+        generation = self.write_generation.value
+        cached = self.catalog_cache.get()
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        last_updated = await db.scalar(
+            select(func.max(VideoModel.updated_date)).where(IS_ACTIVE)
+        )
+        live_count = self.live_count_cache.get()
+        if live_count is None:
+            live_count = await self._exact_count(db=db)
+            if self.write_generation.value == generation:
+                self.live_count_cache.set(live_count)
+        version = self._last_catalog_version
+        if version is None or version[:2] != (last_updated, live_count):
+            version = CatalogVersion(
+                last_updated, live_count, datetime.now(timezone.utc)
+            )
+            self._last_catalog_version = version
+        # Tagged with the generation read before the query, so a write that
+        # commits meanwhile makes it stale at once
+        self.catalog_cache.set((generation, version))
+        return version
+
+    async def count_videos(
+        self, db: AsyncSession, filters: Optional[VideoListFilters] = None
+    ) -> Tuple[int, bool]:
+        """
+        Count the videos using the configured count strategy.
+
+        "exact" runs COUNT(*) every time. "cached" keeps an exact count for
+        VIDEO_COUNT_CACHE_TTL seconds and drops it on create and delete.
+        "estimated" reads the planner statistics, which costs the same
+        whatever the table size, but includes soft-deleted rows until they
+        are purged. Filtered counts are always exact.
+
+        Args:
+            db (AsyncSession): The database session.
+            filters (Optional[VideoListFilters]): Duration and date bounds.
+
+        Returns:
+            Tuple[int, bool]: The count and whether it is exact.
+        """
+        conditions = self._filter_conditions(filters)
+        if conditions:
+            return await self._exact_count(db=db, conditions=conditions), True
+        if self.count_strategy == "estimated":
+            estimate = await self._estimate_count(db=db)
+            if estimate is not None:
+                return estimate, False
+        elif self.count_strategy == "cached":
+            cached = self.count_cache.get()
+            if cached is not None:
+                return cached, False
+            total_videos = await self._exact_count(db=db)
+            self.count_cache.set(total_videos)
+            return total_videos, True
+        return await self._exact_count(db=db), True
+
+    async def _exact_count(self, db: AsyncSession, conditions: Sequence = ()) -> int:
+        return await db.scalar(
+            select(func.count()).select_from(VideoModel).where(IS_ACTIVE, *conditions)
+        )
+
+    async def _estimate_count(self, db: AsyncSession) -> Optional[int]:
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            estimate = await db.scalar(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:table_name)"
+                ),
+                {"table_name": VideoModel.__tablename__},
+            )
+            return estimate if estimate is not None and estimate >= 0 else None
+        if dialect == "sqlite":
+            # The largest rowid is one b-tree descent away and only
+            # over-counts by the number of deleted rows
+            return await db.scalar(
+                select(func.coalesce(func.max(literal_column("rowid")), 0)).select_from(
+                    VideoModel
+                )
+            )
+        return None
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import csv
+from typing import AsyncIterator, Optional, Tuple
+
+# A valid video needs well under 1 KB; anything this large is not one
+MAX_LINE_SIZE = 64 * 1024
+
+LINE_TOO_LONG = f"Line is longer than {MAX_LINE_SIZE} bytes"
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into numbered lines without buffering the whole body.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The request body as it arrives.
+
+    Yields:
+        Tuple[int, Optional[bytes]]: The 1-based line number and the line
+            without its line ending, or None if it exceeds MAX_LINE_SIZE.
+    """
+    line_number = 0
+    remainder = b""
+    discarding = False
+    async for chunk in chunks:
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            line_number += 1
+            if discarding or len(line) > MAX_LINE_SIZE:
+                # A line can also arrive whole inside one large chunk
+                discarding = False
+                yield line_number, None
+            else:
+                yield line_number, line.rstrip(b"\r")
+        if len(remainder) > MAX_LINE_SIZE:
+            # Drop the rest of this line as it arrives instead of keeping it
+            discarding = True
+            remainder = b""
+    if discarding:
+        yield line_number + 1, None
+    elif remainder:
+        yield line_number + 1, remainder.rstrip(b"\r")
+
+
+async def iter_csv_records(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Parse a CSV stream with a header row into dicts, one record at a time.
+
+    Quoted fields may span lines: a record is complete once it holds an even
+    number of quote characters, since RFC 4180 escapes quotes by doubling.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The request body as it arrives.
+
+    Yields:
+        Tuple[int, Optional[dict], Optional[str]]: The line the record starts
+            on, the record (None for blank lines and errors) and an error
+            message if the record could not be read.
+    """
+    header = None
+    pending, pending_size, pending_quotes, pending_line = [], 0, 0, 0
+    async for line_number, line in iter_lines(chunks):
+        if not pending:
+            pending_line = line_number
+        if line is None:
+            pending, pending_size, pending_quotes = [], 0, 0
+            yield pending_line, None, LINE_TOO_LONG
+            continue
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError as e:
+            pending, pending_size, pending_quotes = [], 0, 0
+            yield pending_line, None, str(e)
+            continue
+        pending.append(text)
+        pending_size += len(line)
+        pending_quotes += text.count('"')
+        if pending_quotes % 2:
+            if pending_size > MAX_LINE_SIZE:
+                pending, pending_size, pending_quotes = [], 0, 0
+                yield pending_line, None, LINE_TOO_LONG
+            continue
+        record = "\n".join(pending)
+        pending, pending_size, pending_quotes = [], 0, 0
+        if not record.strip():
+            yield pending_line, None, None
+            continue
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as e:
+            yield pending_line, None, str(e)
+            continue
+        if header is None:
+            header = values
+            continue
+        yield pending_line, dict(zip(header, values)), None
+    if pending:
+        yield pending_line, None, "Unterminated quoted field"
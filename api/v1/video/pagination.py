@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Tuple, Union
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+def _encode(values: List[Any]) -> str:
+    payload = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != 2:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return values
+
+
+def encode_cursor(sort_value: Union[datetime, int], video_id: str) -> str:
+    """
+    Encode a keyset position into an opaque cursor.
+
+    Args:
+        sort_value (Union[datetime, int]): The sort column value of the last
+            row on the page, a date or a duration.
+        video_id (str): The ID of the last row on the page.
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    return _encode([sort_value, str(video_id)])
+
+
+def decode_cursor(
+    cursor: str, value_type: type = datetime
+) -> Tuple[Union[datetime, int], str]:
+    """
+    Decode an opaque cursor back into a keyset position.
+
+    Args:
+        cursor (str): The cursor returned as next_cursor by a previous page.
+        value_type (type): The type of the sort column, datetime or int.
+
+    Returns:
+        Tuple[Union[datetime, int], str]: The sort value and ID to continue
+            after.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or holds a value of
+            another type.
+    """
+    sort_value, video_id = _decode(cursor)
+    if value_type is int:
+        if isinstance(sort_value, bool) or not isinstance(sort_value, int):
+            raise InvalidCursorError("Invalid pagination cursor")
+        return sort_value, str(video_id)
+    try:
+        return datetime.fromisoformat(sort_value), str(video_id)
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+def encode_search_cursor(score: float, video_id: str) -> str:
+    """
+    Encode a position in ranked search results into an opaque cursor.
+
+    Args:
+        score (float): The relevance score of the last row on the page.
+        video_id (str): The ID of the last row on the page.
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+    return _encode([score, str(video_id)])
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decode a search cursor back into a (score, id) position.
+
+    Args:
+        cursor (str): The cursor returned as next_cursor by a previous page.
+
+    Returns:
+        Tuple[float, str]: The score and ID to continue after.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    score, video_id = _decode(cursor)
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return float(score), str(video_id)
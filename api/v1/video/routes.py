@@ -1,14 +1,28 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
 
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.v1.video.conditional import video_headers
 from api.v1.video.controller import VideoController
 from api.v1.video.schemas import (
+    VideoBatchRequest,
+    VideoBatchResponse,
+    VideoBulkCreateResponse,
     VideoCreateRequest,
+    VideoImportResponse,
+    VideoListFilters,
+    VideoSort,
     VideoUpdateRequest,
     VideoResponse,
     VideoPaginatedResponse,
+    VideoSearchResponse,
+    VideoSuggestResponse,
 )
+from core.responses import ModelResponse
 from db.session import get_db
 
 router = APIRouter(
@@ -18,85 +32,316 @@ router = APIRouter(
 )
 video_controller = VideoController()
 
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
 
 @router.post("/", response_model=VideoResponse)
 async def create_video_endpoint(
-    video: VideoCreateRequest, db: Session = Depends(get_db)
+    video: VideoCreateRequest, db: AsyncSession = Depends(get_db)
 ):
     """
     Create a video.
 
     Args:
         video (VideoCreateRequest): The video data.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         VideoResponse: The created video.
     """
-    return await video_controller.create_video(db, video)
+    db_video = await video_controller.create_video(db, video)
+    return ModelResponse(VideoResponse.model_validate(db_video))
+
+
+@router.post("/bulk", response_model=VideoBulkCreateResponse)
+async def create_videos_endpoint(
+    videos: List[Any] = Body(...), db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many videos in one transaction.
+
+    Args:
+        videos (List[Any]): The video payloads, each shaped like VideoCreateRequest.
+        db (AsyncSession): The database session.
+
+    Returns:
+        VideoBulkCreateResponse: The created videos and per-item validation errors.
+    """
+    return ModelResponse(await video_controller.create_videos(db, videos))
+
+
+@router.get("/batch", response_model=VideoBatchResponse)
+async def get_videos_by_ids_endpoint(
+    ids: List[str] = Query(...), db: AsyncSession = Depends(get_db)
+):
+    """
+    Get many videos by ID with a single query.
+
+    Args:
+        ids (List[str]): The video IDs, repeated or comma separated.
+        db (AsyncSession): The database session.
+
+    Returns:
+        VideoBatchResponse: The videos in request order and the missing IDs.
+    """
+    video_ids = [video_id for value in ids for video_id in value.split(",") if video_id]
+    return ModelResponse(await video_controller.get_videos_by_ids(db, video_ids))
+
+
+@router.post("/batch", response_model=VideoBatchResponse)
+async def post_videos_by_ids_endpoint(
+    batch: VideoBatchRequest, db: AsyncSession = Depends(get_db)
+):
+    """
+    Get many videos by ID with a single query, for ID lists too long for a URL.
+
+    Args:
+        batch (VideoBatchRequest): The video IDs.
+        db (AsyncSession): The database session.
+
+    Returns:
+        VideoBatchResponse: The videos in request order and the missing IDs.
+    """
+    return ModelResponse(await video_controller.get_videos_by_ids(db, batch.ids))
+
+
+@router.get("/search", response_model=VideoSearchResponse)
+async def search_videos_endpoint(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Full-text search over title and description, best matches first.
+
+    Args:
+        q (str): The search terms; every word must match.
+        limit (int): The number of records per page.
+        cursor (Optional[str]): The next_cursor of the previous page.
+        db (AsyncSession): The database session.
+
+    Returns:
+        VideoSearchResponse: The matching videos with their relevance scores.
+    """
+    return ModelResponse(await video_controller.search_videos(db, q, limit, cursor))
+
+
+@router.get("/suggest", response_model=VideoSuggestResponse)
+async def suggest_videos_endpoint(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Suggest videos whose title starts with prefix, for search-as-you-type.
+
+    Args:
+        prefix (str): What the user has typed so far, matched ignoring case.
+        limit (int): The maximum number of suggestions.
+        db (AsyncSession): The database session.
+
+    Returns:
+        VideoSuggestResponse: The matching videos ordered by title.
+    """
+    return ModelResponse(await video_controller.suggest_videos(db, prefix, limit))
+
+
+@router.get("/export")
+async def export_videos_endpoint(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Stream the whole catalog as NDJSON (default) or CSV.
+
+    Args:
+        export_format (str): "ndjson" or "csv", passed as the format query parameter.
+        db (AsyncSession): The database session.
+
+    Returns:
+        StreamingResponse: The export, written as rows are read.
+    """
+    return StreamingResponse(
+        video_controller.export_videos(db, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+    )
+
+
+@router.post("/import", response_model=VideoImportResponse)
+async def import_videos_endpoint(
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10_000),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import videos from an NDJSON or CSV request body, read as it arrives.
+
+    Args:
+        request (Request): The request whose body holds the file.
+        import_format (str): "ndjson" or "csv", passed as the format query parameter.
+        batch_size (Optional[int]): Rows per commit.
+        db (AsyncSession): The database session.
+
+    Returns:
+        VideoImportResponse: Inserted, failed and skipped counts.
+    """
+    summary = await video_controller.import_videos(
+        db, request.stream(), import_format, batch_size
+    )
+    return ModelResponse(summary)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats_endpoint() -> Dict[str, Any]:
+    """
+    Get the hit, miss and eviction counters of the single-video cache.
+
+    Returns:
+        Dict[str, Any]: The cache counters.
+    """
+    return video_controller.get_cache_stats()
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
-async def get_video_endpoint(video_id: str, db: Session = Depends(get_db)):
+async def get_video_endpoint(
+    video_id: str,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Get a video by ID.
 
+    Responses carry ETag and Last-Modified; send them back as If-None-Match
+    or If-Modified-Since to get a 304 while the video is unchanged.
+
     Args:
         video_id (str): The ID of the video.
-        db (Session): The database session.
+        if_none_match (Optional[str]): ETags of the copies the client holds.
+        if_modified_since (Optional[str]): When the client's copy was modified.
+        db (AsyncSession): The database session.
 
     Returns:
         VideoResponse: The retrieved video.
     """
-    return await video_controller.get_video(db, video_id)
+    video = await video_controller.get_video(
+        db, video_id, if_none_match, if_modified_since
+    )
+    return ModelResponse(video, headers=video_headers(video.id, video.updated_date))
 
 
 @router.put("/{video_id}", response_model=VideoResponse)
 async def update_video_endpoint(
-    video_id: str, video: VideoUpdateRequest, db: Session = Depends(get_db)
+    video_id: str,
+    video: VideoUpdateRequest,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Update a video.
 
+    With If-Match the update only happens if the video still has one of the
+    listed ETags, otherwise 412 Precondition Failed is returned.
+
     Args:
         video_id (str): The ID of the video to update.
         video (VideoUpdateRequest): The updated video data.
-        db (Session): The database session.
+        if_match (Optional[str]): ETags the client expects the video to have.
+        db (AsyncSession): The database session.
 
     Returns:
         VideoResponse: The updated video.
     """
-    return await video_controller.update_video(db, video_id, video)
+    row = await video_controller.update_video(db, video_id, video, if_match)
+    return ModelResponse(
+        VideoResponse.model_validate(dict(row._mapping)),
+        headers=video_headers(row.id, row.updated_date),
+    )
 
 
 @router.delete("/{video_id}")
-async def delete_video_endpoint(video_id: str, db: Session = Depends(get_db)):
+async def delete_video_endpoint(video_id: str, db: AsyncSession = Depends(get_db)):
     """
     Delete a video.
 
     Args:
         video_id (str): The ID of the video to delete.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         None
     """
-    return await video_controller.delete_video(db, video_id)
+    row = await video_controller.delete_video(db, video_id)
+    return dict(row._mapping)
 
 
 @router.get("/", response_model=VideoPaginatedResponse)
 async def get_videos_endpoint(
-    limit: int = 10, offset: int = 0, db: Session = Depends(get_db)
+    limit: int = 10,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    sort: VideoSort = "created_date",
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get a paginated list of videos.
 
+    Pass the next_cursor of a page as cursor to fetch the following page
+    with keyset pagination; offset is ignored in that mode. A cursor is only
+    valid with the filters and sort of the page that returned it. Every
+    catalog write changes the ETag of all pages, so If-None-Match and
+    If-Modified-Since get a 304 without querying the page, and pages
+    are served from the list cache when VIDEO_LIST_CACHE_MAX_BYTES is set.
+    ETag and Last-Modified are only sent when the request is conditional or
+    the list cache is enabled.
+
     Args:
         limit (int): The number of records per page.
         offset (int): The offset for pagination.
-        db (Session): The database session.
+        cursor (Optional[str]): The next_cursor of the previous page.
+        include_total (bool): Whether to compute total_count at all.
+        min_duration (Optional[int]): Only videos at least this long.
+        max_duration (Optional[int]): Only videos at most this long.
+        created_after (Optional[datetime]): Only videos created after this.
+        updated_since (Optional[datetime]): Only videos updated at or after this.
+        sort (VideoSort): created_date, updated_date or duration, prefixed
+            with "-" to sort descending.
+        if_none_match (Optional[str]): ETags of the copies the client holds.
+        if_modified_since (Optional[str]): When the client's copy was modified.
+        db (AsyncSession): The database session.
 
     Returns:
-        VideoPaginatedResponse: The paginated list of videos.
+        Response: The VideoPaginatedResponse as JSON.
     """
-    return await video_controller.get_videos(db, limit, offset)
+    # Taken before the query, so the page is never older than its ETag
+    headers = await video_controller.get_list_headers(
+        db, if_none_match, if_modified_since
+    )
+    filters = VideoListFilters(
+        min_duration=min_duration,
+        max_duration=max_duration,
+        created_after=created_after,
+        updated_since=updated_since,
+    )
+    body = await video_controller.get_videos_json(
+        db,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total,
+        filters=filters,
+        sort=sort,
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
+        headers=headers,
+    )
+    return Response(body, media_type="application/json", headers=headers)
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class VideoBase(BaseModel):
@@ -24,12 +25,97 @@ class VideoUpdateRequest(VideoBase):
     duration: Optional[int]
 
 
+def hide_updated_date(schema: Dict[str, Any]):
+    schema["properties"].pop("updated_date", None)
+
+
 class VideoResponse(VideoBase):
     id: UUID
+    # Kept for the ETag and Last-Modified headers, not sent in the body
+    updated_date: Optional[datetime] = Field(None, exclude=True)
+
+    class Config:
+        from_attributes = True
+        json_schema_extra = hide_updated_date
+
+
+# A leading "-" sorts descending
+VideoSort = Literal[
+    "created_date",
+    "-created_date",
+    "updated_date",
+    "-updated_date",
+    "duration",
+    "-duration",
+]
+
+
+class VideoListFilters(BaseModel):
+    min_duration: Optional[int] = None
+    max_duration: Optional[int] = None
+    created_after: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+
+
+# Built once: validates rows fetched as plain dicts into VideoResponse objects
+VIDEO_RESPONSE_LIST = TypeAdapter(List[VideoResponse])
 
 
 class VideoPaginatedResponse(BaseModel):
     data: List[VideoResponse]
-    offset: int
+    offset: Optional[int] = None
+    limit: int
+    total_count: Optional[int] = None
+    total_count_exact: Optional[bool] = None
+    next_cursor: Optional[str] = None
+
+
+class VideoBulkError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class VideoBulkCreateResponse(BaseModel):
+    data: List[VideoResponse]
+    errors: List[VideoBulkError]
+    created_count: int
+
+
+class VideoBatchRequest(BaseModel):
+    ids: List[str]
+
+
+class VideoBatchResponse(BaseModel):
+    data: List[Optional[VideoResponse]]
+    missing: List[str]
+
+
+class VideoImportError(BaseModel):
+    line: int
+    errors: List[Dict[str, Any]]
+
+
+class VideoImportResponse(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    skipped: int = 0
+    errors: List[VideoImportError] = []
+
+
+class VideoSearchResult(VideoResponse):
+    score: float
+
+
+class VideoSearchResponse(BaseModel):
+    data: List[VideoSearchResult]
     limit: int
-    total_count: int
+    next_cursor: Optional[str] = None
+
+
+class VideoSuggestion(BaseModel):
+    id: UUID
+    title: str
+
+
+class VideoSuggestResponse(BaseModel):
+    data: List[VideoSuggestion]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Compare rows/sec of VideoCRUD.create_video against VideoCRUD.create_videos.
+
+    python -m benchmarks.bench_bulk_create --rows 5000 --batch-size 1000
+"""
+import argparse
+import asyncio
+
+from api.v1.video.crud import VideoCRUD
+from benchmarks.utils import Timer, sample_videos, temporary_database
+
+
+async def single_item(sessionmaker, videos):
+    video_crud = VideoCRUD()
+    for video in videos:
+        async with sessionmaker() as db:
+            await video_crud.create_video(db=db, video=video)
+
+
+async def bulk(sessionmaker, videos, batch_size):
+    video_crud = VideoCRUD()
+    for start in range(0, len(videos), batch_size):
+        end = start + batch_size
+        async with sessionmaker() as db:
+            await video_crud.create_videos(db=db, videos=videos[start:end])
+
+
+async def main(args):
+    videos = sample_videos(args.rows)
+    async with temporary_database(args.database_url) as sessionmaker:
+        with Timer() as single_timer:
+            await single_item(sessionmaker, videos)
+    async with temporary_database(args.database_url) as sessionmaker:
+        with Timer() as bulk_timer:
+            await bulk(sessionmaker, videos, args.batch_size)
+
+    single_rate = args.rows / single_timer.elapsed
+    bulk_rate = args.rows / bulk_timer.elapsed
+    print(f"create_video:  {single_rate:10.0f} rows/sec")
+    print(f"create_videos: {bulk_rate:10.0f} rows/sec ({bulk_rate / single_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(main(parser.parse_args()))
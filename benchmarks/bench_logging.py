@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Compare request latency under heavy logging when the console and file
+handlers run in the request (as logging used to) and behind a queue.
+
+    python -m benchmarks.bench_logging --requests 2000 --lines 20 --io-wait-ms 1
+
+The route logs --lines records per request, then waits --io-wait-ms as a
+stand-in for its database round trip; the queue listener can only get the
+GIL when the event loop is idle like this. The console handler writes to
+os.devnull and the file handler to a throwaway file. With the queue, the
+time the listener then needs to write out what is still queued is reported
+separately, as are the records dropped because the queue was full.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.utils import asgi_get
+from core.logger import TEXT_FORMAT, JsonFormatter, start_queue_logging
+from db.pool import percentile
+
+
+def build_app(logger: logging.Logger, lines: int, io_wait: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/videos")
+    async def list_videos():
+        for i in range(lines):
+            logger.info("listed page %d of videos for %s", i, "benchmark")
+        # Stands in for the database round trip, leaving the loop idle
+        await asyncio.sleep(io_wait)
+        return {"data": []}
+
+    return app
+
+
+def build_handlers(path: str, formatter: logging.Formatter):
+    console_handler = logging.StreamHandler(open(os.devnull, "w"))
+    file_handler = logging.FileHandler(path)
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(formatter)
+    return [console_handler, file_handler]
+
+
+async def measure(app, requests: int):
+    for _ in range(requests // 10):
+        await asgi_get(app, "/videos")
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await asgi_get(app, "/videos")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def main(args):
+    variants = {
+        "in request": (False, logging.Formatter(TEXT_FORMAT)),
+        "queue, text": (True, logging.Formatter(TEXT_FORMAT)),
+        "queue, json": (True, JsonFormatter()),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (queued, formatter) in variants.items():
+            logger = logging.getLogger(f"benchmark.{name}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handlers = build_handlers(os.path.join(directory, "app.log"), formatter)
+            listener = None
+            if queued:
+                listener = start_queue_logging(
+                    logger, handlers, queue_size=args.queue_size
+                )
+            else:
+                for handler in handlers:
+                    logger.addHandler(handler)
+            latencies = await measure(
+                build_app(logger, args.lines, args.io_wait_ms / 1000), args.requests
+            )
+            started = time.perf_counter()
+            line = (
+                f"{name:12} p50 {percentile(latencies, 0.5) * 1000:6.3f} ms, "
+                f"p99 {percentile(latencies, 0.99) * 1000:6.3f} ms, "
+                f"{len(latencies) / sum(latencies):6.0f} req/s"
+            )
+            if listener is not None:
+                listener.stop()
+                dropped = logger.handlers[0].dropped
+                drain = time.perf_counter() - started
+                line += f", drained in {drain:.2f} s, {dropped} dropped"
+            print(line)
+            for handler in handlers + logger.handlers:
+                handler.close()
+            logger.handlers.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--lines", type=int, default=20)
+    parser.add_argument("--io-wait-ms", type=float, default=1.0)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Compare insert throughput and size of the videos table keyed by random uuid4
+text against time-ordered UUIDv7 stored natively.
+
+    python -m benchmarks.bench_primary_keys --rows 1000000 --batch-size 10000
+
+Each scheme gets its own database. Throughput is reported for the whole run
+and for the last tenth of it, when the key index no longer fits the page
+cache and random keys start to touch a different page on every insert.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    insert,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.utils import Timer
+from models.types import UUIDType, uuid7
+
+SCHEMES = {
+    "uuid4 text": (String, lambda: str(uuid.uuid4())),
+    "uuid7 native": (UUIDType, uuid7),
+}
+
+
+def videos_table(id_type) -> Table:
+    # A table of its own, so --database-url may point at a real database
+    name = f"benchmark_videos_{id_type.__name__.lower()}"
+    table = Table(
+        name,
+        MetaData(),
+        Column("id", id_type, primary_key=True),
+        Column("title", String(100)),
+        Column("description", String(500)),
+        Column("duration", Integer),
+        Column("created_date", DateTime),
+        Column("updated_date", DateTime),
+        Column("is_active", Boolean, nullable=False),
+    )
+    Index(f"ix_{name}_created_date_id", table.c.created_date, table.c.id)
+    return table
+
+
+async def insert_rows(database_url, table, new_id, rows, batch_size):
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(table.metadata.create_all)
+    batch_times = []
+    try:
+        for start in range(0, rows, batch_size):
+            now = datetime.now()
+            batch = [
+                {
+                    "id": new_id(),
+                    "title": f"Video {i}",
+                    "description": f"Description {i}",
+                    "duration": i % 7200,
+                    "created_date": now,
+                    "updated_date": now,
+                    "is_active": True,
+                }
+                for i in range(start, min(start + batch_size, rows))
+            ]
+            with Timer() as timer:
+                async with engine.begin() as conn:
+                    await conn.execute(insert(table), batch)
+            batch_times.append((len(batch), timer.elapsed))
+    finally:
+        await engine.dispose()
+    return batch_times
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (id_type, new_id) in SCHEMES.items():
+            path = os.path.join(directory, f"{id_type.__name__}.db")
+            database_url = args.database_url or f"sqlite+aiosqlite:///{path}"
+            batch_times = await insert_rows(
+                database_url, videos_table(id_type), new_id, args.rows, args.batch_size
+            )
+            total_rate = args.rows / sum(elapsed for _, elapsed in batch_times)
+            tail_batches = max(len(batch_times) // 10, 1)
+            tail = batch_times[-tail_batches:]
+            tail_rate = sum(count for count, _ in tail) / sum(
+                elapsed for _, elapsed in tail
+            )
+            line = f"{name:13} {total_rate:10.0f} rows/sec, last 10%: {tail_rate:.0f}"
+            if not args.database_url:
+                line += f", {os.path.getsize(path) / 2**20:.1f} MiB"
+            print(line)
+            if args.database_url:
+                engine = create_async_engine(database_url)
+                async with engine.begin() as conn:
+                    await conn.run_sync(videos_table(id_type).metadata.drop_all)
+                await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(main(parser.parse_args()))
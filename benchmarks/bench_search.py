@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Measure full-text search latency on a large catalog.
+
+    python -m benchmarks.bench_search --rows 1000000
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from api.v1.video.crud import VideoCRUD
+from benchmarks.utils import Timer, temporary_database
+from models.base_model import generate_id
+from models.video import VideoModel
+
+# Zipf-like vocabulary: early words are common, late words are rare
+VOCABULARY = [f"word{i}" for i in range(5000)]
+CUM_WEIGHTS = list(
+    itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY)))
+)
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=words))
+
+
+async def seed(sessionmaker, rows: int, batch_size: int = 10_000):
+    rng = random.Random(42)
+    started = datetime(2023, 1, 1)
+    async with sessionmaker() as db:
+        for start in range(0, rows, batch_size):
+            await db.execute(
+                insert(VideoModel),
+                [
+                    {
+                        "id": generate_id(),
+                        "title": random_text(rng, 5)[:100],
+                        "description": random_text(rng, 30)[:500],
+                        "duration": rng.randint(1, 7200),
+                        "created_date": started + timedelta(seconds=i),
+                        "updated_date": started + timedelta(seconds=i),
+                        "is_active": True,
+                    }
+                    for i in range(start, min(start + batch_size, rows))
+                ],
+            )
+            await db.commit()
+
+
+async def time_query(sessionmaker, q: str, pages: int, limit: int):
+    video_crud = VideoCRUD()
+    timings = []
+    cursor = None
+    async with sessionmaker() as db:
+        for _ in range(pages):
+            with Timer() as timer:
+                results = await video_crud.search_videos(
+                    db=db, q=q, limit=limit, cursor=cursor
+                )
+            timings.append(timer.elapsed * 1000)
+            cursor = results.next_cursor
+            if cursor is None:
+                break
+    return timings
+
+
+async def main(args):
+    async with temporary_database(args.database_url) as sessionmaker:
+        with Timer() as seed_timer:
+            await seed(sessionmaker, args.rows)
+        print(f"seeded {args.rows} rows in {seed_timer.elapsed:.1f}s")
+
+        for label, q in [
+            ("common term", "word0"),
+            ("mid term", "word50"),
+            ("rare term", "word4000"),
+            ("two terms", "word1 word20"),
+        ]:
+            timings = await time_query(sessionmaker, q, args.pages, args.limit)
+            print(
+                f"{label:12} q={q!r:16} pages={len(timings):3} "
+                f"first={timings[0]:8.2f}ms "
+                f"p50={statistics.median(timings):8.2f}ms max={max(timings):8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the cost of turning a page of videos into response bytes: ORM objects
+through FastAPI's response_model path against plain rows validated once and
+encoded with model_dump_json.
+
+    python -m benchmarks.bench_serialization --videos 1000 --repeat 50
+"""
+import argparse
+import asyncio
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import select
+
+from api.v1.video.crud import VideoCRUD
+from api.v1.video.schemas import VideoPaginatedResponse, VideoResponse
+from benchmarks.utils import Timer, sample_videos, temporary_database
+from core.responses import ModelResponse
+from models.video import VideoModel
+
+
+async def time_per_call(function, repeat: int) -> float:
+    await function()
+    with Timer() as timer:
+        for _ in range(repeat):
+            await function()
+    return timer.elapsed / repeat
+
+
+async def main(args):
+    page_field = create_response_field(name="page", type_=VideoPaginatedResponse)
+    video_field = create_response_field(name="video", type_=VideoResponse)
+    async with temporary_database(args.database_url) as sessionmaker:
+        async with sessionmaker() as db:
+            await VideoCRUD().create_videos(db=db, videos=sample_videos(args.videos))
+        db = sessionmaker()
+
+        async def list_before():
+            result = await db.execute(select(VideoModel))
+            page = VideoPaginatedResponse(
+                data=result.scalars().all(), limit=args.videos
+            )
+            body = await serialize_response(field=page_field, response_content=page)
+            db.expunge_all()
+            return JSONResponse(body).body
+
+        async def list_after():
+            result = await db.execute(select(VideoModel.__table__))
+            page = VideoPaginatedResponse(
+                data=[dict(row) for row in result.mappings()], limit=args.videos
+            )
+            return ModelResponse(page).body
+
+        async def single_before():
+            result = await db.execute(select(VideoModel))
+            for db_video in result.scalars():
+                body = await serialize_response(
+                    field=video_field, response_content=db_video
+                )
+                JSONResponse(body).body
+            db.expunge_all()
+
+        async def single_after():
+            result = await db.execute(select(VideoModel.__table__))
+            for row in result.mappings():
+                ModelResponse(VideoResponse.model_validate(dict(row))).body
+
+        for name, before, after in [
+            ("list page", list_before, list_after),
+            ("single video", single_before, single_after),
+        ]:
+            before_time = await time_per_call(before, args.repeat)
+            after_time = await time_per_call(after, args.repeat)
+            print(
+                f"{name:<13} per {args.videos} videos: "
+                f"before {before_time * 1000:7.2f}ms, "
+                f"after {after_time * 1000:7.2f}ms "
+                f"({before_time / after_time:.1f}x)"
+            )
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(main(parser.parse_args()))
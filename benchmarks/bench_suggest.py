@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Measure lookup latency and memory footprint of the suggest title index.
+
+    python -m benchmarks.bench_suggest --titles 1000000 --lookups 100000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+
+from benchmarks.utils import Timer
+from core.prefix_index import PrefixIndex
+
+WORDS = [
+    "cooking",
+    "pasta",
+    "travel",
+    "guitar",
+    "lesson",
+    "review",
+    "python",
+    "garden",
+    "football",
+    "highlights",
+    "morning",
+    "yoga",
+    "history",
+    "space",
+    "coffee",
+    "music",
+]
+
+
+def sample_titles(count: int, rng: random.Random) -> list:
+    return [
+        (str(uuid.UUID(int=rng.getrandbits(128))), " ".join(rng.choices(WORDS, k=3)))
+        for _ in range(count)
+    ]
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    index = PrefixIndex()
+    # Trace from before the titles exist so their strings count too; once the
+    # input list is gone only what the index keeps is left
+    tracemalloc.start()
+    titles = sample_titles(args.titles, rng)
+    with Timer() as build_timer:
+        index.load(titles)
+    prefixes = []
+    for _ in range(args.lookups):
+        title = rng.choice(titles)[1]
+        end = rng.randint(1, 12)
+        prefixes.append(title[:end])
+    del titles
+    index_bytes = tracemalloc.get_traced_memory()[0] - sys.getsizeof(prefixes)
+    tracemalloc.stop()
+
+    latencies = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.search(prefix, args.limit)
+        latencies.append(time.perf_counter() - started)
+    quantiles = statistics.quantiles(latencies, n=100)
+
+    per_million = index_bytes * 1_000_000 / args.titles
+    print(f"titles:        {args.titles}")
+    print(f"build:         {build_timer.elapsed:.2f}s")
+    print(f"memory:        {index_bytes / 2**20:.1f} MiB (traced)")
+    print(f"per 1M titles: {per_million / 2**20:.1f} MiB")
+    print(f"estimate:      {index.memory_usage() / 2**20:.1f} MiB (memory_usage)")
+    print(f"lookup p50:    {quantiles[49] * 1e6:.1f}us")
+    print(f"lookup p99:    {quantiles[98] * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP load tests for the video API, see __main__ for usage.
+"""
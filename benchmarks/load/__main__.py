@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Load test the video API and compare results against a baseline.
+
+    python -m benchmarks.load run --rows 10000 --concurrency 16 --duration 10 \
+        --output results.json
+    python -m benchmarks.load compare baseline.json results.json --threshold 0.1
+
+By default the app is served in-process, over ASGI without a network in
+between, from a throwaway SQLite database (or --database-url) seeded with
+--rows videos through the bulk endpoint. --base-url targets a running
+server instead, e.g. one started with uvicorn, and seeds that.
+
+Workloads run one after another on the same catalog and results are
+written as JSON. compare exits with status 1 when a workload regressed.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sqlite3
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from benchmarks.load.compare import compare
+from benchmarks.load.runner import run_workload, seed
+from benchmarks.load.workloads import WORKLOADS
+from benchmarks.utils import temporary_database
+
+
+@asynccontextmanager
+async def api_client(
+    base_url: Optional[str], database_url: Optional[str]
+) -> AsyncIterator[httpx.AsyncClient]:
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+
+    from db.session import get_db
+    from main import app
+
+    async with temporary_database(database_url) as sessionmaker:
+
+        async def get_benchmark_db():
+            async with sessionmaker() as session:
+                try:
+                    yield session
+                except Exception:
+                    await session.rollback()
+                    raise
+
+        app.dependency_overrides[get_db] = get_benchmark_db
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://benchmark", timeout=60
+            ) as client:
+                yield client
+        finally:
+            app.dependency_overrides.clear()
+
+
+async def run(args):
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "target": args.base_url or args.database_url or "in-process sqlite",
+            "rows": args.rows,
+        },
+        "workloads": {},
+    }
+    async with api_client(args.base_url, args.database_url) as client:
+        catalog = await seed(client, args.rows)
+        for workload in args.workload:
+            result = await run_workload(
+                client,
+                catalog,
+                workload,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+            )
+            results["workloads"][workload] = result
+            latency = result["latency_ms"]
+            print(
+                f"{workload:16} {result['throughput']:8.1f} req/s, "
+                f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, "
+                f"p99 {latency['p99']} ms, {result['errors']} errors",
+                file=sys.stderr,
+            )
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+def run_compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print(regression)
+    if not regressions:
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run workloads")
+    run_parser.add_argument(
+        "--workload", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS)
+    )
+    run_parser.add_argument("--rows", type=int, default=10_000)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=10.0)
+    run_parser.add_argument("--warmup", type=float, default=2.0)
+    run_parser.add_argument("--base-url", default=None)
+    run_parser.add_argument("--database-url", default=None)
+    run_parser.add_argument("--output", default=None)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Flag regressions against a baseline"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        asyncio.run(run(args))
+    else:
+        sys.exit(run_compare(args))
+
+
+if __name__ == "__main__":
+    main()
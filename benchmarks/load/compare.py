@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from typing import List
+
+# Lower is better for latencies, higher for throughput
+LATENCY_METRICS = ("p50", "p95", "p99")
+
+
+def _change(baseline: float, current: float) -> float:
+    return (current - baseline) / baseline if baseline else 0.0
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """
+    Find the regressions of current against baseline, both results of the
+    run command.
+
+    A workload regresses when its throughput drops, its error count grows,
+    or its p50, p95 or p99 latency (overall or of one operation) rises, by
+    more than threshold (a fraction).
+
+    Returns:
+        List[str]: One line per regression, empty when there are none.
+    """
+    regressions = []
+    for workload, result in current["workloads"].items():
+        base = baseline["workloads"].get(workload)
+        if base is None:
+            continue
+        change = _change(base["throughput"], result["throughput"])
+        if change < -threshold:
+            regressions.append(
+                f"{workload}: throughput {base['throughput']} -> "
+                f"{result['throughput']} req/s ({change:+.1%})"
+            )
+        if result["errors"] > base["errors"] * (1 + threshold):
+            regressions.append(
+                f"{workload}: errors {base['errors']} -> {result['errors']}"
+            )
+        sections = [("", base, result)] + [
+            (f" {name}", base["operations"][name], operation)
+            for name, operation in result["operations"].items()
+            if name in base["operations"]
+        ]
+        for label, base_section, section in sections:
+            for metric in LATENCY_METRICS:
+                before = base_section["latency_ms"][metric]
+                after = section["latency_ms"][metric]
+                change = _change(before, after)
+                if change > threshold:
+                    regressions.append(
+                        f"{workload}{label}: {metric} {before} -> {after} ms "
+                        f"({change:+.1%})"
+                    )
+    return regressions
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.load.workloads import OPERATIONS, PREFIX, WORKLOADS, Catalog
+from db.pool import percentile
+
+SEED_BATCH_SIZE = 1000
+
+
+async def seed(client: httpx.AsyncClient, rows: int) -> Catalog:
+    """
+    Create rows videos through the bulk endpoint.
+    """
+    rng = random.Random(42)
+    ids = []
+    for start in range(0, rows, SEED_BATCH_SIZE):
+        batch = [
+            {
+                "title": f"Video {i}",
+                "description": f"Description {i}",
+                "duration": rng.randint(1, 7200),
+            }
+            for i in range(start, min(start + SEED_BATCH_SIZE, rows))
+        ]
+        response = await client.post(f"{PREFIX}/bulk", json=batch)
+        response.raise_for_status()
+        ids.extend(video["id"] for video in response.json()["data"])
+    return Catalog(ids, rows)
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarize latencies in seconds as milliseconds.
+    """
+    return {
+        "p50": round(percentile(latencies, 0.5) * 1000, 3),
+        "p95": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "max": round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    catalog: Catalog,
+    workload: str,
+    concurrency: int,
+    duration: float,
+    warmup: float = 1.0,
+    seed: int = 0,
+) -> dict:
+    """
+    Run concurrency workers issuing the operations of workload back to back
+    for warmup plus duration seconds; only requests started after the
+    warmup are measured.
+
+    Returns:
+        dict: Throughput, errors (responses of 400 and up other than 404s
+            for videos deleted during the run, or exceptions) and latency in
+            milliseconds, overall and per operation.
+    """
+    names = list(WORKLOADS[workload])
+    weights = list(WORKLOADS[workload].values())
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    started = time.perf_counter()
+    measured_from = started + warmup
+    deadline = measured_from + duration
+
+    async def worker(rng: random.Random):
+        while True:
+            name = rng.choices(names, weights)[0]
+            request_started = time.perf_counter()
+            if request_started >= deadline:
+                return
+            try:
+                response = await OPERATIONS[name](client, catalog, rng)
+                failed = catalog.is_error(response)
+            except httpx.HTTPError:
+                failed = True
+            if request_started >= measured_from:
+                latencies[name].append(time.perf_counter() - request_started)
+                errors[name] += failed
+
+    await asyncio.gather(
+        *(worker(random.Random(seed * 1000 + i)) for i in range(concurrency))
+    )
+    elapsed = time.perf_counter() - measured_from
+    every = [latency for values in latencies.values() for latency in values]
+    return {
+        "concurrency": concurrency,
+        "duration": round(elapsed, 3),
+        "requests": len(every),
+        "throughput": round(len(every) / elapsed, 1),
+        "errors": sum(errors.values()),
+        "latency_ms": summarize(every),
+        "operations": {
+            name: {
+                "requests": len(latencies[name]),
+                "errors": errors[name],
+                "latency_ms": summarize(latencies[name]),
+            }
+            for name in names
+            if latencies[name]
+        },
+    }
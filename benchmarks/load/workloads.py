@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Weighted mixes of video API calls.
+
+Every operation takes the client, the shared catalog state and a random
+generator, makes one request and returns its response. Operations do their
+own bookkeeping, so the ids of created videos become available to reads and
+deleted ones stop being requested. A read picked its id before a concurrent
+delete can still miss it; Catalog.is_error does not count those 404s.
+"""
+import random
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import httpx
+
+PREFIX = "/api/v1/video"
+
+
+class Catalog:
+    """
+    The ids of the videos known to exist, the ids deleted during the run,
+    and the pagination cursors a deep pagination walk left off at.
+    """
+
+    def __init__(self, ids: List[str], rows: int):
+        self.ids = ids
+        self.rows = rows
+        self.deleted: Set[str] = set()
+        self.cursors: List[Optional[str]] = []
+
+    def random_id(self, rng: random.Random) -> str:
+        return rng.choice(self.ids)
+
+    def is_error(self, response: httpx.Response) -> bool:
+        """
+        Whether a response counts as an error: any status of 400 and up,
+        except a 404 for a video deleted during the run.
+        """
+        if response.status_code == 404:
+            video_id = response.request.url.path.rstrip("/").rsplit("/", 1)[-1]
+            return video_id not in self.deleted
+        return response.status_code >= 400
+
+
+def video_payload(rng: random.Random, i: int) -> dict:
+    return {
+        "title": f"Load test video {i}",
+        "description": f"Description {rng.random()}",
+        "duration": rng.randint(1, 7200),
+    }
+
+
+async def get_video(client: httpx.AsyncClient, catalog: Catalog, rng: random.Random):
+    return await client.get(f"{PREFIX}/{catalog.random_id(rng)}")
+
+
+async def list_first_page(
+    client: httpx.AsyncClient, catalog: Catalog, rng: random.Random
+):
+    return await client.get(f"{PREFIX}/", params={"limit": 20})
+
+
+async def list_filtered(
+    client: httpx.AsyncClient, catalog: Catalog, rng: random.Random
+):
+    low = rng.randint(1, 7000)
+    params = {"limit": 20, "min_duration": low, "max_duration": low + 200}
+    return await client.get(f"{PREFIX}/", params={**params, "sort": "-duration"})
+
+
+async def list_deep_offset(
+    client: httpx.AsyncClient, catalog: Catalog, rng: random.Random
+):
+    offset = rng.randint(0, max(catalog.rows - 20, 0))
+    params = {"limit": 20, "offset": offset, "include_total": False}
+    return await client.get(f"{PREFIX}/", params=params)
+
+
+async def list_next_cursor(
+    client: httpx.AsyncClient, catalog: Catalog, rng: random.Random
+):
+    # Walks keep going from where one left off, so pages get deep over time
+    cursor = catalog.cursors.pop() if catalog.cursors else None
+    params = {"limit": 20, "include_total": False}
+    if cursor:
+        params["cursor"] = cursor
+    response = await client.get(f"{PREFIX}/", params=params)
+    if response.status_code == 200:
+        catalog.cursors.append(response.json()["next_cursor"])
+    return response
+
+
+async def create_video(client: httpx.AsyncClient, catalog: Catalog, rng: random.Random):
+    response = await client.post(
+        f"{PREFIX}/", json=video_payload(rng, len(catalog.ids))
+    )
+    if response.status_code == 200:
+        catalog.ids.append(response.json()["id"])
+    return response
+
+
+async def update_video(client: httpx.AsyncClient, catalog: Catalog, rng: random.Random):
+    return await client.put(
+        f"{PREFIX}/{catalog.random_id(rng)}", json=video_payload(rng, len(catalog.ids))
+    )
+
+
+async def delete_video(client: httpx.AsyncClient, catalog: Catalog, rng: random.Random):
+    # Never empties the catalog, reads need something to find
+    if len(catalog.ids) <= 1:
+        return await create_video(client, catalog, rng)
+    video_id = catalog.ids.pop(rng.randrange(len(catalog.ids)))
+    # Before the request, as reads that already picked it may miss it first
+    catalog.deleted.add(video_id)
+    return await client.delete(f"{PREFIX}/{video_id}")
+
+
+Operation = Callable[[httpx.AsyncClient, Catalog, random.Random], Awaitable]
+
+# Operations by name with their relative weights
+WORKLOADS: Dict[str, Dict[str, int]] = {
+    "read": {"get_video": 70, "list_first_page": 20, "list_filtered": 10},
+    "write": {"create_video": 50, "update_video": 40, "delete_video": 10},
+    "mixed": {
+        "get_video": 55,
+        "list_first_page": 15,
+        "list_filtered": 10,
+        "create_video": 10,
+        "update_video": 8,
+        "delete_video": 2,
+    },
+    "deep_pagination": {"list_deep_offset": 50, "list_next_cursor": 50},
+}
+
+OPERATIONS: Dict[str, Operation] = {
+    "get_video": get_video,
+    "list_first_page": list_first_page,
+    "list_filtered": list_filtered,
+    "list_deep_offset": list_deep_offset,
+    "list_next_cursor": list_next_cursor,
+    "create_video": create_video,
+    "update_video": update_video,
+    "delete_video": delete_video,
+}
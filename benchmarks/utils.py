@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.v1.video.schemas import VideoCreateRequest
+from models import Base
+
+
+@asynccontextmanager
+async def temporary_database(
+    database_url: Optional[str] = None,
+) -> AsyncIterator[async_sessionmaker]:
+    """
+    Yield a session factory bound to a database with the catalog schema.
+
+    Without a database_url a throwaway SQLite file is used.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            database_url or f"sqlite+aiosqlite:///{directory}/benchmark.db"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            yield async_sessionmaker(
+                bind=engine, autoflush=False, expire_on_commit=False
+            )
+        finally:
+            await engine.dispose()
+
+
+def sample_videos(count: int) -> list:
+    return [
+        VideoCreateRequest(
+            title=f"Video {i}", description=f"Description {i}", duration=i % 7200
+        )
+        for i in range(count)
+    ]
+
+
+async def asgi_get(app, path: str):
+    """
+    Send a GET request straight to an ASGI app, discarding the response.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 1),
+        "server": ("benchmark", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+class Timer:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.started
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Fill the videos table with a synthetic catalog of realistic-looking rows.
+
+The output only depends on the options: chunk n is generated from its own
+random generator seeded with (--seed, n), so the rows come out the same
+whatever the number of workers and the order chunks finish in. Rows are
+written through the bulk load path, COPY on Postgres and a chunked
+executemany elsewhere, never through the ORM.
+
+SQLite takes one writer at a time, so there the workers only generate rows
+and a single process writes them. Postgres COPY from parallel workers is
+the way to reach tens of millions of rows.
+"""
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple
+
+from sqlalchemy import create_engine
+
+from commands.load_videos import connect_args, init_worker, write_rows
+from core.config import config
+from models.types import uuid7
+from models.video import SEARCH_DDL
+
+EPOCH = datetime(1970, 1, 1)
+
+TOPICS = [
+    "cooking",
+    "travel",
+    "fitness",
+    "music theory",
+    "gaming",
+    "python",
+    "javascript",
+    "photography",
+    "gardening",
+    "history",
+    "astronomy",
+    "personal finance",
+    "woodworking",
+    "electric cars",
+    "football",
+    "yoga",
+    "watercolor",
+    "guitar",
+    "coffee",
+    "camping",
+    "chess",
+    "baking bread",
+    "home repair",
+    "machine learning",
+    "drawing",
+    "piano",
+    "running",
+    "vegan recipes",
+    "3d printing",
+    "knitting",
+]
+ADJECTIVES = [
+    "easy",
+    "quick",
+    "ultimate",
+    "complete",
+    "simple",
+    "advanced",
+    "honest",
+    "weekly",
+    "budget",
+    "lazy",
+]
+TITLE_TEMPLATES = [
+    "How to get started with {topic}",
+    "{n} {topic} tips for beginners",
+    "{topic} in {n} minutes",
+    "The {adjective} guide to {topic}",
+    "My {adjective} {topic} routine",
+    "{topic} vs {other}: which is better?",
+    "Learn {topic} the {adjective} way",
+    "{topic} Q&A, part {n}",
+    "Why everyone is wrong about {topic}",
+    "A day of {topic} and {other}",
+]
+SENTENCES = [
+    "In this video we look at {topic} from the ground up.",
+    "We also touch on {other} along the way.",
+    "Timestamps are in the comments.",
+    "Let me know what you want to see next.",
+    "All the links mentioned are below.",
+    "This one took {n} weeks to film.",
+    "Thanks to everyone who asked about {topic}!",
+    "Part {n} of the series.",
+]
+# Early topics are far more common than late ones, like real catalogs
+TOPIC_WEIGHTS = [1 / (rank + 1) for rank in range(len(TOPICS))]
+
+
+class CatalogShape(NamedTuple):
+    rows: int
+    seed: int
+    start_date: datetime
+    end_date: datetime
+    tombstone_ratio: float
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser(
+        "generate", help="Fill the videos table with a synthetic catalog"
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--start-date", type=datetime.fromisoformat, default=datetime(2020, 1, 1)
+    )
+    parser.add_argument(
+        "--end-date", type=datetime.fromisoformat, default=datetime(2026, 1, 1)
+    )
+    parser.add_argument(
+        "--tombstone-ratio",
+        type=float,
+        default=0.02,
+        help="Fraction of rows generated as soft-deleted",
+    )
+    parser.add_argument("--database-url", default=config.SQLALCHEMY_DATABASE_URL)
+    parser.set_defaults(handler=run)
+
+
+def _duration(rng: random.Random) -> int:
+    kind = rng.random()
+    if kind < 0.25:
+        return rng.randint(15, 60)
+    if kind < 0.85:
+        return max(int(rng.lognormvariate(6.4, 0.6)), 61)
+    return rng.randint(1800, 10_800)
+
+
+def _text(rng: random.Random, template: str) -> str:
+    topic, other = rng.choices(TOPICS, weights=TOPIC_WEIGHTS, k=2)
+    return template.format(
+        topic=topic,
+        other=other,
+        adjective=rng.choice(ADJECTIVES),
+        n=rng.randint(2, 12),
+    )
+
+
+def generate_rows(
+    shape: CatalogShape, index: int, first_row: int, count: int
+) -> List[Dict[str, Any]]:
+    """
+    Generate rows first_row to first_row + count of the catalog as chunk
+    index. Creation dates grow with the row number and ids follow them.
+    """
+    rng = random.Random(f"{shape.seed}-{index}")
+    span = shape.end_date - shape.start_date
+    rows = []
+    for row in range(first_row, first_row + count):
+        created = shape.start_date + span * ((row + rng.random()) / shape.rows)
+        updated = created
+        if rng.random() < 0.3:
+            updated = min(
+                created + timedelta(days=rng.expovariate(1 / 30)), shape.end_date
+            )
+        is_active = rng.random() >= shape.tombstone_ratio
+        if not is_active:
+            # Deleted videos keep their deletion time in updated_date
+            updated = min(updated + timedelta(days=rng.randint(1, 60)), shape.end_date)
+        title = _text(rng, rng.choice(TITLE_TEMPLATES))
+        title = title[0].upper() + title[1:]
+        description = " ".join(
+            _text(rng, sentence) for sentence in rng.sample(SENTENCES, 3)
+        )
+        rows.append(
+            {
+                "id": uuid7(
+                    (created - EPOCH) // timedelta(microseconds=1) * 1000,
+                    rng.getrandbits(62),
+                ),
+                "title": title[:100],
+                "description": description[:500],
+                "duration": _duration(rng),
+                "created_date": created,
+                "updated_date": updated,
+                "is_active": is_active,
+            }
+        )
+    return rows
+
+
+@contextmanager
+def deferred_fts_indexing(database_url: str):
+    """
+    On SQLite, index the inserted rows for full-text search in one pass at
+    the end instead of through the insert trigger row by row. The rebuild
+    covers the whole table, rows inserted by others in the meantime too.
+    """
+    if not database_url.startswith("sqlite"):
+        yield
+        return
+    trigger = next(ddl for ddl in SEARCH_DDL["sqlite"] if "videos_fts_insert" in ddl)
+    engine = create_engine(database_url, connect_args=connect_args(database_url))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TRIGGER IF EXISTS videos_fts_insert")
+    try:
+        yield
+    finally:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')"
+            )
+            conn.exec_driver_sql(trigger)
+        engine.dispose()
+
+
+def write_chunk(shape: CatalogShape, index: int, first_row: int, count: int) -> int:
+    """
+    Generate and insert one chunk in a single transaction (runs in a worker).
+    """
+    write_rows(generate_rows(shape, index, first_row, count))
+    return count
+
+
+def generate(
+    database_url: str,
+    rows: int,
+    seed: int = 0,
+    workers: int = 1,
+    chunk_size: int = 50_000,
+    start_date: datetime = datetime(2020, 1, 1),
+    end_date: datetime = datetime(2026, 1, 1),
+    tombstone_ratio: float = 0.02,
+) -> Dict[str, Any]:
+    """
+    Insert a synthetic catalog into the videos table and return the run
+    statistics.
+    """
+    shape = CatalogShape(rows, seed, start_date, end_date, tombstone_ratio)
+    stats = {"inserted": 0}
+    started = time.perf_counter()
+    # SQLite takes one writer at a time, so there workers only generate and
+    # this process writes; parallel writers would just queue on the lock
+    parallel_writes = not database_url.startswith("sqlite")
+    if not parallel_writes:
+        init_worker(database_url)
+
+    def collect(future):
+        if parallel_writes:
+            stats["inserted"] += future.result()
+        else:
+            rows = future.result()
+            write_rows(rows)
+            stats["inserted"] += len(rows)
+
+    with deferred_fts_indexing(database_url), ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(database_url,)
+    ) as executor:
+        pending = set()
+        for index, first_row in enumerate(range(0, rows, chunk_size)):
+            # Bound the chunks queued up to two per worker
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    collect(future)
+            count = min(chunk_size, rows - first_row)
+            task = write_chunk if parallel_writes else generate_rows
+            pending.add(executor.submit(task, shape, index, first_row, count))
+        for future in wait(pending).done:
+            collect(future)
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_second"] = stats["inserted"] / stats["seconds"]
+    return stats
+
+
+def run(args):
+    stats = generate(
+        database_url=args.database_url,
+        rows=args.rows,
+        seed=args.seed,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        tombstone_ratio=args.tombstone_ratio,
+    )
+    print(
+        f"Generated {stats['inserted']} rows in {stats['seconds']:.1f}s: "
+        f"{stats['rows_per_second']:.0f} rows/sec",
+        file=sys.stderr,
+    )
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Load a CSV or NDJSON catalog file straight into the videos table.
+
+On Postgres each chunk is written with COPY FROM STDIN, on other databases
+with a chunked executemany INSERT. Chunks are validated and written by a
+pool of worker processes, each in its own transaction, and finished chunks
+are recorded in a checkpoint file so an interrupted load can be resumed.
+
+Ids are derived from the checkpoint and the line number, so a chunk that
+was committed just before an interruption, but not yet recorded, is found
+by its first id on the next run and not written twice.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import create_engine, insert, select
+
+from api.v1.video.schemas import VideoCreateRequest
+from core.config import config
+from models.types import uuid7
+from models.video import VideoModel
+
+COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "duration",
+    "created_date",
+    "updated_date",
+    "is_active",
+]
+
+# Title and description are never NULL, but an empty string and a NULL are
+# both written as an empty field, which COPY reads back as NULL
+COPY_STATEMENT = (
+    f"COPY {VideoModel.__tablename__} ({', '.join(COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (title, description))"
+)
+
+_engine = None
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("load", help="Bulk load a CSV or NDJSON file")
+    parser.add_argument("path", help="The CSV or NDJSON file to load")
+    parser.add_argument(
+        "--format",
+        dest="input_format",
+        choices=["csv", "ndjson"],
+        help="Input format, guessed from the file extension by default",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file, defaults to <path>.checkpoint.json",
+    )
+    parser.add_argument(
+        "--rejects", help="Write rejected records here as NDJSON (line, errors)"
+    )
+    parser.add_argument("--database-url", default=config.SQLALCHEMY_DATABASE_URL)
+    parser.set_defaults(handler=run)
+
+
+def read_records(path: str, input_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (line number, raw record) pairs; NDJSON records stay unparsed so
+    workers do the JSON decoding.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if input_format == "csv":
+            reader = csv.DictReader(file)
+            # Reading the header moves line_num past it
+            previous_line = reader.line_num if reader.fieldnames else 0
+            for record in reader:
+                yield previous_line + 1, record
+                previous_line = reader.line_num
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+def iter_chunks(
+    records: Iterator[Tuple[int, Any]], chunk_size: int
+) -> Iterator[Tuple[int, List[Tuple[int, Any]]]]:
+    chunk = []
+    index = 0
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield index, chunk
+            chunk = []
+            index += 1
+    if chunk:
+        yield index, chunk
+
+
+def init_worker(database_url: str):
+    global _engine
+    _engine = create_engine(database_url, connect_args=connect_args(database_url))
+
+
+def connect_args(database_url: str) -> Dict[str, Any]:
+    # Parallel SQLite writers queue on the database lock instead of failing
+    return {"timeout": 60} if database_url.startswith("sqlite") else {}
+
+
+def row_id(load_id: int, source: str, line_number: int):
+    """
+    The id of the video on line_number of source, the same on every run of
+    one load. Ids follow the line order, one microsecond of the load start
+    time (load_id, in nanoseconds) apart.
+    """
+    digest = hashlib.blake2b(f"{source}:{line_number}".encode(), digest_size=8)
+    return uuid7(load_id + line_number * 1000, int.from_bytes(digest.digest(), "big"))
+
+
+def validate_chunk(
+    records: List[Tuple[int, Any]], load_id: int, source: str
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    now = datetime.now()
+    rows, rejects = [], []
+    for line_number, record in records:
+        try:
+            if isinstance(record, str):
+                video = VideoCreateRequest.model_validate_json(record)
+            else:
+                video = VideoCreateRequest.model_validate(record)
+        except ValidationError as e:
+            rejects.append(
+                {
+                    "line": line_number,
+                    "errors": [
+                        {"loc": list(error["loc"]), "msg": error["msg"]}
+                        for error in e.errors()
+                    ],
+                }
+            )
+            continue
+        rows.append(
+            dict(
+                video.model_dump(),
+                id=row_id(load_id, source, line_number),
+                created_date=now,
+                updated_date=now,
+                is_active=True,
+            )
+        )
+    return rows, rejects
+
+
+def csv_buffer(rows: List[Dict[str, Any]]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([row[column] for column in COLUMNS] for row in rows)
+    buffer.seek(0)
+    return buffer
+
+
+def copy_rows(rows: List[Dict[str, Any]]):
+    buffer = csv_buffer(rows)
+    connection = _engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(COPY_STATEMENT, buffer)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def write_rows(rows: List[Dict[str, Any]]):
+    """
+    Insert complete video rows in one transaction (runs in a worker).
+    """
+    if _engine.dialect.name == "postgresql":
+        copy_rows(rows)
+    else:
+        with _engine.begin() as conn:
+            conn.execute(insert(VideoModel.__table__), rows)
+
+
+def load_chunk(
+    index: int, records: List[Tuple[int, Any]], load_id: int, source: str
+) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """
+    Validate and write one chunk in a single transaction (runs in a worker).
+    A chunk whose first row is already in the table was committed by an
+    interrupted run and inserts nothing.
+    """
+    rows, rejects = validate_chunk(records, load_id, source)
+    if not rows:
+        return index, 0, rejects
+    with _engine.connect() as conn:
+        written = conn.scalar(
+            select(VideoModel.id).where(VideoModel.id == rows[0]["id"])
+        )
+    if written is not None:
+        return index, 0, rejects
+    write_rows(rows)
+    return index, len(rows), rejects
+
+
+class Checkpoint:
+    """
+    Records which chunks of an input file are already committed.
+    """
+
+    def __init__(self, path: str, source: str, chunk_size: int):
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.chunk_size = chunk_size
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as file:
+                state = json.load(file)
+            if state["source"] != self.source or state["chunk_size"] != chunk_size:
+                raise SystemExit(
+                    f"{path} belongs to another load; remove it or pass --checkpoint"
+                )
+            self.done = set(state["done"])
+            self.load_id = state["load_id"]
+        else:
+            # Saved before any chunk is written, ids are derived from it
+            self.load_id = time.time_ns()
+            self.save()
+
+    def mark_done(self, index: int):
+        self.done.add(index)
+        self.save()
+
+    def save(self):
+        state = {
+            "source": self.source,
+            "chunk_size": self.chunk_size,
+            "load_id": self.load_id,
+            "done": sorted(self.done),
+        }
+        with open(f"{self.path}.tmp", "w") as file:
+            json.dump(state, file)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def load(
+    path: str,
+    database_url: str,
+    input_format: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = 10_000,
+    checkpoint_path: Optional[str] = None,
+    rejects_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Load a file into the videos table and return the run statistics.
+    """
+    input_format = input_format or ("csv" if path.endswith(".csv") else "ndjson")
+    checkpoint = Checkpoint(
+        checkpoint_path or f"{path}.checkpoint.json", path, chunk_size
+    )
+    stats = {"inserted": 0, "rejected": 0, "skipped_chunks": len(checkpoint.done)}
+    rejects_file = open(rejects_path, "w") if rejects_path else None
+    started = time.perf_counter()
+
+    def collect(future):
+        index, inserted, rejects = future.result()
+        checkpoint.mark_done(index)
+        stats["inserted"] += inserted
+        stats["rejected"] += len(rejects)
+        if rejects_file:
+            rejects_file.writelines(f"{json.dumps(reject)}\n" for reject in rejects)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(database_url,)
+        ) as executor:
+            pending = set()
+            for index, chunk in iter_chunks(
+                read_records(path, input_format), chunk_size
+            ):
+                if index in checkpoint.done:
+                    continue
+                # Bound the chunks held in memory to two per worker
+                if len(pending) >= workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future)
+                pending.add(
+                    executor.submit(
+                        load_chunk,
+                        index,
+                        chunk,
+                        checkpoint.load_id,
+                        checkpoint.source,
+                    )
+                )
+            for future in wait(pending).done:
+                collect(future)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    checkpoint.remove()
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_second"] = stats["inserted"] / stats["seconds"]
+    return stats
+
+
+def run(args):
+    stats = load(
+        path=args.path,
+        database_url=args.database_url,
+        input_format=args.input_format,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        rejects_path=args.rejects,
+    )
+    print(
+        f"Loaded {stats['inserted']} rows ({stats['rejected']} rejected, "
+        f"{stats['skipped_chunks']} chunks already done) in "
+        f"{stats['seconds']:.1f}s: {stats['rows_per_second']:.0f} rows/sec",
+        file=sys.stderr,
+    )
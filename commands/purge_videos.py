@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Remove soft-deleted videos whose tombstones are older than the retention.
+
+Tombstones are found through the partial ix_videos_tombstones_updated_date
+index and deleted batch-size rows at a time, each batch in its own short
+transaction, so the purge never holds row locks for long and live traffic
+keeps flowing between batches.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, delete, select
+
+from commands.load_videos import connect_args
+from core.config import config
+from models.video import IS_TOMBSTONE, VideoModel
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("purge", help="Remove old soft-deleted videos")
+    parser.add_argument(
+        "--older-than-days",
+        type=float,
+        default=config.VIDEO_TOMBSTONE_RETENTION_DAYS,
+        help="Only purge videos deleted at least this long ago",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=0.0,
+        help="Seconds to sleep between batches",
+    )
+    parser.add_argument("--database-url", default=config.SQLALCHEMY_DATABASE_URL)
+    parser.set_defaults(handler=run)
+
+
+def purge(
+    database_url: str,
+    older_than: timedelta = timedelta(days=30),
+    batch_size: int = 1000,
+    pause: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Delete tombstones older than older_than and return the run statistics.
+    """
+    videos = VideoModel.__table__
+    cutoff = datetime.now() - older_than
+    batch = (
+        select(videos.c.id)
+        .where(IS_TOMBSTONE, videos.c.updated_date < cutoff)
+        .limit(batch_size)
+    )
+    statement = delete(videos).where(
+        videos.c.id.in_(batch.scalar_subquery()), IS_TOMBSTONE
+    )
+    stats = {"purged": 0, "batches": 0}
+    started = time.perf_counter()
+    engine = create_engine(database_url, connect_args=connect_args(database_url))
+    try:
+        while True:
+            with engine.begin() as conn:
+                purged = conn.execute(statement).rowcount
+            if purged:
+                stats["purged"] += purged
+                stats["batches"] += 1
+            if purged < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+    finally:
+        engine.dispose()
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def run(args):
+    stats = purge(
+        database_url=args.database_url,
+        older_than=timedelta(days=args.older_than_days),
+        batch_size=args.batch_size,
+        pause=args.pause,
+    )
+    print(
+        f"Purged {stats['purged']} deleted videos in {stats['batches']} batches "
+        f"in {stats['seconds']:.1f}s",
+        file=sys.stderr,
+    )
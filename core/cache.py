@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Optional
+
+
+class CachedValue:
+    """
+    A single value that expires after a TTL and can be invalidated early.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+
+    def get(self) -> Optional[Any]:
+        if time.monotonic() >= self._expires_at:
+            return None
+        return self._value
+
+    def set(self, value: Any):
+        self._value = value
+        self._expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        self._value = None
+        self._expires_at = 0.0
+
+
+class Generation:
+    """
+    A counter bumped on every write, so anything derived from an older value
+    is known to be stale in O(1).
+
+    token is random per instance: a restarted process starts counting from
+    zero again without reusing the (token, value) pairs of the last one.
+    """
+
+    def __init__(self):
+        self.token = uuid.uuid4().hex[:8]
+        self.value = 0
+        self.changed_at = datetime.now(timezone.utc)
+
+    def bump(self):
+        self.value += 1
+        self.changed_at = datetime.now(timezone.utc)
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entry when full and
+    drops entries older than the TTL on lookup.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ResponseCache:
+    """
+    Encoded responses bounded by their total size in bytes.
+
+    Entries belong to one generation, any hashable marker of the data they
+    were built from. Passing another one to get or set drops every entry at
+    once, so a write only has to change the marker.
+    Within a generation the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.generation = None
+        self._entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _use_generation(self, generation: Hashable):
+        if generation != self.generation:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self.generation = generation
+
+    def get(self, key: Hashable, generation: Hashable) -> Optional[bytes]:
+        self._use_generation(generation)
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key: Hashable, generation: Hashable, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        self._use_generation(generation)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        self._entries[key] = body
+        self.size_bytes += len(body)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import sys
 from functools import lru_cache
+from typing import Dict, Literal
 from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
@@ -15,11 +16,73 @@ class CommonConfig(BaseSettings):
     ALGORITHM: str = "HS256"
     # database
     SQLALCHEMY_DATABASE_URL: str = ""
+    ASYNC_SQLALCHEMY_DATABASE_URL: str = ""
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     POSTGRES_HOST: str
     POSTGRES_PORT: str
+    # connection pool, see db/database.py; a recycle of -1 never recycles
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 60
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = False
+    # logging, see core/logger.py; the file rotates every LOG_ROTATE_WHEN
+    # (e.g. "midnight") if set, else at LOG_ROTATE_BYTES if not 0, else never
+    LOG_FILE: str = "app.log"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_ROTATE_BYTES: int = 0
+    LOG_ROTATE_WHEN: str = ""
+    LOG_BACKUP_COUNT: int = 5
+    # records waiting to be written; more are dropped rather than block
+    LOG_QUEUE_SIZE: int = 10_000
+    # fraction of records kept by level name, e.g. {"DEBUG": 0.01}
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+    # request profiling, see core/profiler.py; requests sent with an
+    # X-Profile header (equal to the token, if set) are sampled every
+    # PROFILING_INTERVAL_MS and written to PROFILING_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_CONCURRENT: int = 2
+    PROFILING_DIR: str = "profiles"
+    # slow query log and repeated (N+1) query detector, see core/query_log.py;
+    # each finding is logged at most once per sample interval
+    QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    REPEATED_QUERY_THRESHOLD: int = 10
+    QUERY_LOG_SAMPLE_INTERVAL: float = 60.0
+    # how long GET /ready waits for a connection and a SELECT 1
+    READINESS_TIMEOUT: float = 2.0
+    # video list total_count: "exact", "cached" or "estimated"
+    VIDEO_COUNT_STRATEGY: Literal["exact", "cached", "estimated"] = "exact"
+    VIDEO_COUNT_CACHE_TTL: float = 30.0
+    # get video read-through cache, a max size of 0 disables it
+    VIDEO_CACHE_MAX_SIZE: int = 1024
+    VIDEO_CACHE_TTL: float = 60.0
+    # list ETags reuse the catalog version read from the database this long;
+    # writes by other processes show up within it
+    VIDEO_CATALOG_VERSION_TTL: float = 2.0
+    # how often suggest checks whether the catalog changed since the title
+    # index was loaded, and reloads it if so
+    VIDEO_SUGGEST_RELOAD_INTERVAL: float = 300.0
+    # encoded list page cache, a max of 0 bytes disables it
+    VIDEO_LIST_CACHE_MAX_BYTES: int = 0
+    # delete clears is_active instead of removing the row; tombstones older
+    # than the retention are removed by "manage.py purge"
+    VIDEO_SOFT_DELETE: bool = False
+    VIDEO_TOMBSTONE_RETENTION_DAYS: int = 30
+    # bulk create
+    VIDEO_BULK_MAX_ITEMS: int = 5000
+    # batch get by ids
+    VIDEO_BATCH_MAX_IDS: int = 1000
+    VIDEO_BATCH_CHUNK_SIZE: int = 500
+    # rows fetched per server-side cursor round trip by the export
+    VIDEO_EXPORT_BATCH_SIZE: int = 1000
+    # streaming import
+    VIDEO_IMPORT_BATCH_SIZE: int = 1000
+    VIDEO_IMPORT_MAX_REPORTED_ERRORS: int = 1000
 
     class Config:
         env_file = "././.env"
@@ -29,6 +92,7 @@ class CommonConfig(BaseSettings):
     @model_validator(mode="after")
     def validate_database(cls, values):
         values.SQLALCHEMY_DATABASE_URL = f"postgresql://{values.POSTGRES_USER}:{values.POSTGRES_PASSWORD}@{values.POSTGRES_HOST}:{values.POSTGRES_PORT}/{values.POSTGRES_DB}"  # NoQa
+        values.ASYNC_SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{values.POSTGRES_USER}:{values.POSTGRES_PASSWORD}@{values.POSTGRES_HOST}:{values.POSTGRES_PORT}/{values.POSTGRES_DB}"  # NoQa
 
 
 class TestConfig(CommonConfig):
@@ -38,6 +102,7 @@ class TestConfig(CommonConfig):
 
     # database
     SQLALCHEMY_DATABASE_URL: str = "sqlite:///./video_catalog.db"
+    ASYNC_SQLALCHEMY_DATABASE_URL: str = "sqlite+aiosqlite:///./video_catalog.db"
 
     @model_validator(mode="after")
     def validate_database(cls, values):
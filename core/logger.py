@@ -1,5 +1,165 @@
 # -*- coding: utf-8 -*-
+"""
+Application logging.
+
+Calls to the logger only put the record on a queue. A QueueListener thread
+formats and writes it, so requests never wait on the console or the disk.
+"""
+import atexit
+import json
 import logging
+import queue
+import random
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from typing import Dict, List, Optional
+
+from core.config import config
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+REQUEST_ID_HEADER = "x-request-id"
+# Client supplied ids are kept only when they cannot break a log line
+_VALID_REQUEST_ID = re.compile(r"[\w.:-]{1,128}")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamp records with the id of the request logging them. Runs in the
+    calling thread, which is the only one that can see the context variable.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep records of a level with the probability given for its name in
+    rates; levels without a rate are always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = {
+            logging.getLevelName(name.upper()): rate for name, rate in rates.items()
+        }
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+        return rate is None or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, with the fields passed through `extra` after
+    the standard ones.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    A QueueHandler that drops records when the queue is full instead of
+    blocking or raising, counting what it dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record needs no pickling
+        # and formatting, exceptions included, is left to its thread. Only
+        # the message is resolved here, before its arguments can change.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    A QueueListener whose stop waits for room in a full queue, so every
+    record queued before it is still written.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def build_file_handler(
+    path: str, rotate_bytes: int = 0, rotate_when: str = "", backup_count: int = 5
+) -> logging.Handler:
+    """
+    Get a file handler rotating every rotate_when interval (as understood by
+    TimedRotatingFileHandler, e.g. "midnight"), or else once the file
+    reaches rotate_bytes, or else never.
+    """
+    if rotate_when:
+        return TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=backup_count, encoding="utf-8"
+        )
+    if rotate_bytes:
+        return RotatingFileHandler(
+            path, maxBytes=rotate_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    return logging.FileHandler(path, encoding="utf-8")
+
+
+def start_queue_logging(
+    logger: logging.Logger,
+    handlers: List[logging.Handler],
+    queue_size: int = 10_000,
+    sample_rates: Optional[Dict[str, float]] = None,
+) -> DrainingQueueListener:
+    """
+    Route the records of logger through a queue to handlers, which run on
+    the returned listener's thread.
+    """
+    queue_handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+    queue_handler.addFilter(RequestIdFilter())
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+    logger.addHandler(queue_handler)
+    listener = DrainingQueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
 
 
 def setup_logger():
@@ -11,25 +171,73 @@ def setup_logger():
     console_handler.setLevel(logging.INFO)
 
     # Create file handler and set level to DEBUG
-    file_handler = logging.FileHandler("app.log")
+    file_handler = build_file_handler(
+        config.LOG_FILE,
+        rotate_bytes=config.LOG_ROTATE_BYTES,
+        rotate_when=config.LOG_ROTATE_WHEN,
+        backup_count=config.LOG_BACKUP_COUNT,
+    )
     file_handler.setLevel(logging.DEBUG)
 
     # Create formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    if config.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
 
     # Add formatter to handlers
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
 
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Hand records to the handlers through a queue; stopping the listener
+    # at exit writes out whatever is still queued
+    listener = start_queue_logging(
+        logger,
+        [console_handler, file_handler],
+        queue_size=config.LOG_QUEUE_SIZE,
+        sample_rates=config.LOG_SAMPLE_RATES,
+    )
+    atexit.register(listener.stop)
 
     return logger
 
 
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware giving every HTTP request an id for its log
+    records: the client's X-Request-ID when valid, otherwise a new one. The
+    id is sent back in the X-Request-ID response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        value = None
+        for name, header in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                value = header.decode("latin-1")
+                break
+        if value is None or not _VALID_REQUEST_ID.fullmatch(value):
+            value = uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode(), value.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_id.set(value)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
+
+
 # Usage example
 logger = setup_logger()
 logger.info("Logging initialized")
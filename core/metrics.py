@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Request latency and database usage metrics in the Prometheus text format.
+
+Everything is aggregated in plain dicts and lists without locks: requests
+and the SQLAlchemy cursor events they cause all run on the worker's event
+loop thread, and observe never awaits, so updates cannot interleave. Each
+worker process keeps its own registry.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Requests that match no route share one label, so bad URLs cannot grow the
+# number of series
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values)
+    )
+
+
+class Histogram:
+    """
+    A Prometheus histogram with one series per label value tuple.
+
+    Each series is a list of per-bucket counts followed by the sum; buckets
+    are only made cumulative when rendered, so observe increments one slot.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def clear(self):
+        self._series.clear()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        bounds = self.buckets + (float("inf"),)
+        for labels, series in list(self._series.items()):
+            label_text = _format_labels(self.label_names, labels)
+            separator = "," if label_text else ""
+            braced = f"{{{label_text}}}" if label_text else ""
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket{{{label_text}{separator}"
+                    f'le="{_format_value(bound)}"}} {cumulative}'
+                )
+            yield f"{self.name}_sum{braced} {_format_value(series[-1])}"
+            yield f"{self.name}_count{braced} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Time from receiving a request to sending its last body chunk.",
+            ("method", "route", "status"),
+            DURATION_BUCKETS,
+        )
+        self.db_statements = Histogram(
+            "http_request_db_statements",
+            "SQL statements executed per request.",
+            ("method", "route"),
+            STATEMENT_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Time spent executing SQL statements per request.",
+            ("method", "route"),
+            DURATION_BUCKETS,
+        )
+        self.in_progress = 0
+
+    def clear(self):
+        for histogram in self.histograms():
+            histogram.clear()
+
+    def histograms(self) -> List[Histogram]:
+        return [self.request_duration, self.db_statements, self.db_duration]
+
+    def render(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Args:
+            gauges (Optional[Dict[str, Tuple[str, float]]]): Extra unlabelled
+                gauges, by name, as (help text, value) pairs.
+
+        Returns:
+            str: The exposition, ending with a newline.
+        """
+        gauges = dict(
+            http_requests_in_progress=(
+                "Requests currently being handled.",
+                self.in_progress,
+            ),
+            **(gauges or {}),
+        )
+        lines = []
+        for name, (documentation, value) in gauges.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+        for histogram in self.histograms():
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class RequestStats:
+    """
+    What one request has done so far, shared with the SQLAlchemy listeners
+    through the request_stats context variable.
+
+    statement_counts is left to the query log, which counts statements by
+    shape in it when enabled.
+    """
+
+    __slots__ = ("scope", "statements", "db_seconds", "statement_counts")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.statement_counts: Optional[Dict[str, int]] = None
+
+    @property
+    def route(self) -> str:
+        # FastAPI puts the matched APIRoute in the scope once routing is done
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request by method, route template
+    and status code, together with the SQL it ran.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats(scope)
+        token = request_stats.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry = self.registry
+        registry.in_progress += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.in_progress -= 1
+            request_stats.reset(token)
+            labels = (scope["method"], stats.route)
+            registry.request_duration.observe(labels + (str(status),), elapsed)
+            registry.db_statements.observe(labels, stats.statements)
+            registry.db_duration.observe(labels, stats.db_seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - context.metrics_started
+
+
+def track_queries(engine: AsyncEngine):
+    """
+    Count the statements and database time of each request on engine.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import sys
+from bisect import bisect_left, insort
+from typing import Iterable, List, Tuple
+
+# Sorts before every printable character, so "abc" comes before "abcd"
+SEPARATOR = "\x00"
+
+# Past this many new entries one merge is cheaper than an insort per entry
+MERGE_THRESHOLD = 32
+
+
+def fold(text: str) -> str:
+    return text.casefold().replace(SEPARATOR, "")
+
+
+class PrefixIndex:
+    """
+    Case-insensitive prefix lookups over (id, text) pairs, kept in memory.
+
+    Entries live in one sorted list of "<folded text>\\0<id>" strings, so a
+    lookup is a bisect to the first match followed by a short scan. Lookups
+    do not depend on the number of entries; add and remove shift the list.
+
+    The index starts unloaded. Changes made between begin_load and load
+    are replayed on top of the loaded entries, so writes that land while
+    the rows are being read are not lost. Changes made while the index is
+    not loaded at all are dropped, since the next load sees them. A reload
+    keeps serving the entries it replaces, changes included, until load
+    swaps in the new ones.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._texts = {}
+        self._pending = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def loading(self) -> bool:
+        return self._pending is not None
+
+    def begin_load(self):
+        self._pending = []
+
+    def abort_load(self):
+        # Changes were already applied to the entries still being served
+        self._pending = None
+
+    def load(self, entries: Iterable[Tuple[str, str]]):
+        self._texts = {entry_id: text for entry_id, text in entries if text}
+        self._keys = sorted(
+            f"{fold(text)}{SEPARATOR}{entry_id}"
+            for entry_id, text in self._texts.items()
+        )
+        pending, self._pending = self._pending or [], None
+        self.loaded = True
+        for method, args in pending:
+            method(*args)
+
+    def clear(self):
+        self._keys = []
+        self._texts = {}
+        self._pending = None
+        self.loaded = False
+
+    def add(self, entry_id: str, text: str):
+        self.add_many([(entry_id, text)])
+
+    def add_many(self, entries: Iterable[Tuple[str, str]]):
+        if self.loading:
+            entries = list(entries)
+            self._pending.append((self.add_many, (entries,)))
+        if not self.loaded:
+            return
+        new_keys = []
+        for entry_id, text in entries:
+            self._discard(entry_id)
+            if text:
+                self._texts[entry_id] = text
+                new_keys.append(f"{fold(text)}{SEPARATOR}{entry_id}")
+        if len(new_keys) > MERGE_THRESHOLD:
+            # Timsort finds the two sorted runs and merges them in linear time
+            new_keys.sort()
+            self._keys.extend(new_keys)
+            self._keys.sort()
+        else:
+            for key in new_keys:
+                insort(self._keys, key)
+
+    def remove(self, entry_id: str):
+        if self.loading:
+            self._pending.append((self.remove, (entry_id,)))
+        self._discard(entry_id)
+
+    def _discard(self, entry_id: str):
+        text = self._texts.pop(entry_id, None)
+        if text is None:
+            return
+        key = f"{fold(text)}{SEPARATOR}{entry_id}"
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def search(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Find up to limit entries whose text starts with prefix, ignoring case.
+
+        Args:
+            prefix (str): The start of the text.
+            limit (int): The maximum number of entries to return.
+
+        Returns:
+            List[Tuple[str, str]]: (id, text) pairs ordered by folded text,
+                then id.
+        """
+        folded = fold(prefix)
+        matches = []
+        position = bisect_left(self._keys, folded)
+        while len(matches) < limit and position < len(self._keys):
+            key = self._keys[position]
+            if not key.startswith(folded):
+                break
+            entry_id = key.rpartition(SEPARATOR)[2]
+            matches.append((entry_id, self._texts[entry_id]))
+            position += 1
+        return matches
+
+    def memory_usage(self) -> int:
+        """
+        Approximate the bytes held by the index, counting every object once.
+        """
+        size = sys.getsizeof(self._keys) + sys.getsizeof(self._texts)
+        size += sum(sys.getsizeof(key) for key in self._keys)
+        size += sum(
+            sys.getsizeof(entry_id) + sys.getsizeof(text)
+            for entry_id, text in self._texts.items()
+        )
+        return size
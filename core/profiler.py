@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+On-demand sampling profiler for single requests.
+
+A request asking for a profile gets its asyncio task registered with the
+profiler. A background thread then samples that task every interval, by
+wall clock:
+- while the task runs, the stack of the event loop thread is taken;
+- while it waits, the chain of coroutines it is suspended in is taken,
+  ending in "(waiting)", so time spent on the database shows up too.
+
+Profiles are written in the collapsed stack format understood by
+flamegraph.pl, speedscope and similar tools, one "frame;frame;... count"
+line per distinct stack.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+from core.logger import logger
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+WAITING = "(waiting)"
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def running_stack(frame, root) -> List[str]:
+    """
+    Get the names of frame and its callers up to root, outermost first. The
+    event loop frames below root are left out.
+    """
+    stack = []
+    while frame is not None:
+        stack.append(_frame_name(frame))
+        if frame is root:
+            break
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def awaited_stack(coro) -> List[str]:
+    """
+    Get the names of the coroutines a suspended coroutine is waiting in,
+    outermost first.
+    """
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        stack.append(_frame_name(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return stack
+
+
+class RequestProfile:
+    __slots__ = ("task", "thread_id", "stacks")
+
+    def __init__(self, task: asyncio.Task, thread_id: int):
+        self.task = task
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+
+    def collapsed(self, root: str) -> str:
+        """
+        Render the samples as collapsed stacks under a root frame.
+        """
+        # Semicolons separate frames and the count follows the last space
+        root = root.replace(";", ":").replace(" ", "_")
+        return "".join(
+            f"{root};{stack} {count}\n" for stack, count in sorted(self.stacks.items())
+        )
+
+
+class SamplingProfiler:
+    """
+    Sample up to max_concurrent registered tasks every interval seconds.
+
+    The sampling thread only runs while a task is registered. Stacks are read
+    from another thread without pausing the loop, so a sample taken while
+    the task is switching can land on a neighbouring stack.
+    """
+
+    def __init__(self, interval: float, max_concurrent: int):
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self._active: Dict[asyncio.Task, RequestProfile] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, task: asyncio.Task) -> Optional[RequestProfile]:
+        """
+        Start sampling task, which must be running on the calling thread.
+
+        Returns:
+            Optional[RequestProfile]: The profile being filled, or None when
+                max_concurrent tasks are sampled already.
+        """
+        with self._lock:
+            if len(self._active) >= self.max_concurrent:
+                return None
+            profile = self._active[task] = RequestProfile(task, threading.get_ident())
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        return profile
+
+    def stop(self, profile: RequestProfile):
+        with self._lock:
+            self._active.pop(profile.task, None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                profiles = list(self._active.values())
+            frames = sys._current_frames()
+            for profile in profiles:
+                self._sample(profile, frames)
+            time.sleep(self.interval)
+
+    def _sample(self, profile: RequestProfile, frames: dict):
+        coro = profile.task.get_coro()
+        running = asyncio.current_task(profile.task.get_loop())
+        frame = frames.get(profile.thread_id)
+        if running is profile.task and frame is not None:
+            stack = running_stack(frame, coro.cr_frame)
+        else:
+            stack = awaited_stack(coro) + [WAITING]
+        if stack:
+            profile.stacks[";".join(stack)] += 1
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling requests sent with an X-Profile header
+    equal to token (any value when token is empty).
+
+    The profile is written to directory as <id>.collapsed once the request
+    is done, and the id is sent in the X-Profile-Id response header. Past
+    the profiler's concurrency cap the header is "skipped" instead.
+    """
+
+    def __init__(
+        self, app, profiler: SamplingProfiler, directory: str, token: str = ""
+    ):
+        self.app = app
+        self.profiler = profiler
+        self.directory = directory
+        self.token = token
+
+    def _requested(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER.encode():
+                return value.decode("latin-1") == self.token if self.token else True
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        profile = self.profiler.start(asyncio.current_task())
+        profile_id = uuid.uuid4().hex if profile is not None else "skipped"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER.encode(), profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            if profile is not None:
+                self.profiler.stop(profile)
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                collapsed = profile.collapsed(f"{scope['method']} {route}")
+                await asyncio.to_thread(self._write, profile_id, collapsed)
+
+    def _write(self, profile_id: str, collapsed: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{profile_id}.collapsed")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(collapsed)
+        logger.info(f"request profile written to {path}")
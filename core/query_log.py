@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Slow query log and repeated query (N+1) detector.
+
+Both hook the engine's cursor events and report through core.logger. A
+finding is logged at most once per sample interval for each statement shape
+and route, with a count of the ones suppressed since, so a hot slow query
+cannot flood the log. Statements are reduced to their shape before logging
+and only the types of parameters are kept, never their values.
+"""
+import logging
+import re
+import time
+from functools import lru_cache
+from itertools import groupby
+from typing import Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.logger import logger as app_logger
+from core.metrics import request_stats
+
+# Literals and the placeholders of the sqlite, asyncpg and psycopg drivers
+_PARAMETERS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|%\(\w+\)s|%s")
+_PARAMETER_LISTS = re.compile(r"\(\?(?:, \?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Statements outside a request, such as startup or management commands
+NO_ROUTE = "-"
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a statement to its shape: whitespace collapsed, literals and
+    placeholders replaced by "?" and lists of them, like the ones an IN of
+    any length expands to, by "(?, ...)".
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PARAMETERS.sub("?", statement)
+    return _PARAMETER_LISTS.sub("(?, ...)", statement)
+
+
+def _type_names(values) -> str:
+    names = []
+    for name, run in groupby(type(value).__name__ for value in values):
+        count = len(list(run))
+        names.append(f"{count} x {name}" if count > 1 else name)
+    return ", ".join(names)
+
+
+def parameters_shape(parameters, executemany: bool = False) -> str:
+    """
+    Describe the parameters of a statement by type, e.g. "(str, 3 x int)".
+    """
+    if executemany:
+        rows = list(parameters)
+        first = parameters_shape(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        fields = (f"{key}: {type(value).__name__}" for key, value in parameters.items())
+        return "{" + ", ".join(fields) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return f"({_type_names(parameters)})"
+    return type(parameters).__name__
+
+
+class Sampler:
+    """
+    Let a key through at most once per interval, counting what it held back.
+
+    Keys are forgotten all at once when there are more than max_keys of them,
+    which bounds the memory a stream of distinct statements can take.
+    """
+
+    def __init__(self, interval: float, max_keys: int = 10_000):
+        self.interval = interval
+        self.max_keys = max_keys
+        self._keys: Dict[Hashable, Tuple[float, int]] = {}
+
+    def allow(self, key: Hashable) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: None when key is held back, otherwise how many
+                times it was held back since it last got through.
+        """
+        now = time.monotonic()
+        last = self._keys.get(key)
+        if last is not None and now - last[0] < self.interval:
+            self._keys[key] = (last[0], last[1] + 1)
+            return None
+        if last is None and len(self._keys) >= self.max_keys:
+            self._keys.clear()
+        self._keys[key] = (now, 0)
+        return last[1] if last is not None else 0
+
+
+class QueryLog:
+    """
+    Log statements slower than slow_threshold seconds, and requests running
+    a statement shape more than repeat_threshold times. A threshold of 0
+    turns that check off.
+    """
+
+    def __init__(
+        self,
+        slow_threshold: float,
+        repeat_threshold: int,
+        sample_interval: float,
+        logger: logging.Logger = app_logger,
+    ):
+        self.slow_threshold = slow_threshold
+        self.repeat_threshold = repeat_threshold
+        self.sampler = Sampler(sample_interval)
+        self.logger = logger
+
+    def attach(self, engine: AsyncEngine):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context.query_log_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context.query_log_started
+        stats = request_stats.get()
+        route = stats.route if stats is not None else NO_ROUTE
+        if self.slow_threshold and elapsed >= self.slow_threshold:
+            self._log_slow(statement, parameters, executemany, elapsed, route)
+        if self.repeat_threshold and stats is not None:
+            shape = normalize_sql(statement)
+            counts = stats.statement_counts
+            if counts is None:
+                counts = stats.statement_counts = {}
+            count = counts[shape] = counts.get(shape, 0) + 1
+            # Flagged once, when the request goes over the threshold
+            if count == self.repeat_threshold + 1:
+                self._log_repeated(shape, stats.scope["method"], route)
+
+    def _log_slow(self, statement, parameters, executemany, elapsed, route):
+        shape = normalize_sql(statement)
+        suppressed = self.sampler.allow(("slow", route, shape))
+        if suppressed is None:
+            return
+        self.logger.warning(
+            f"slow query: {elapsed * 1000:.1f} ms, route {route}, "
+            f"parameters {parameters_shape(parameters, executemany)}, "
+            f"{suppressed} similar suppressed: {shape}"
+        )
+
+    def _log_repeated(self, shape, method, route):
+        suppressed = self.sampler.allow(("repeated", method, route, shape))
+        if suppressed is None:
+            return
+        self.logger.warning(
+            f"repeated query: {method} {route} ran the same statement more "
+            f"than {self.repeat_threshold} times, {suppressed} similar requests "
+            f"suppressed: {shape}"
+        )
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """
+    A JSON response rendered straight from a Pydantic model by pydantic-core.
+
+    Returning one from an endpoint skips FastAPI's response_model pass,
+    which would validate the model a second time and encode it again with
+    jsonable_encoder and the stdlib json module. Keep response_model on the
+    route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode()
@@ -1,35 +1,48 @@
 # -*- coding: utf-8 -*-
 import sys
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
 from core.config import config
+from core.metrics import track_queries
+from core.query_log import QueryLog
+from db.pool import InstrumentedQueuePool, pool_metrics
 
 
 def create_engine_based_on_env():
-    # For now, we are using SQLite for tests
+    # For now, we are using SQLite (through aiosqlite) for tests
     if "pytest" in sys.modules:
-        return create_engine(config.SQLALCHEMY_DATABASE_URL)
-
-    return create_engine(
-        config.SQLALCHEMY_DATABASE_URL,
-        pool_size=10,
-        max_overflow=60,
-        pool_recycle=1,
+        return create_async_engine(config.ASYNC_SQLALCHEMY_DATABASE_URL)
+
+    return create_async_engine(
+        config.ASYNC_SQLALCHEMY_DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
     )
 
 
 engine = create_engine_based_on_env()
+pool_metrics.attach(engine)
+track_queries(engine)
+if config.QUERY_LOG_ENABLED:
+    QueryLog(
+        slow_threshold=config.SLOW_QUERY_THRESHOLD_MS / 1000,
+        repeat_threshold=config.REPEATED_QUERY_THRESHOLD,
+        sample_interval=config.QUERY_LOG_SAMPLE_INTERVAL,
+    ).attach(engine)
 
-SessionLocal = scoped_session(
-    sessionmaker(autocommit=False, autoflush=False, bind=engine)
-)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def create_tables():
+async def create_tables():
     """
     Create tables in the database.
     """
@@ -37,4 +50,13 @@ def create_tables():
     # So just to make this clear - this is not an "unused import".
     # Models must be imported before we call create_all method.
 
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def ping_database():
+    """
+    Check out a connection and run a trivial query on it.
+    """
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class PoolMetrics:
+    """
+    Connection pool activity, collected through SQLAlchemy pool events.
+
+    Checkout wait times are the exception: no event fires before a checkout
+    starts waiting, so InstrumentedQueuePool reports them itself. The most
+    recent `window` waits are kept for percentiles.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.connections_created = 0
+        self.connections_recycled = 0
+        self.connections_invalidated = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.checkout_timeouts = 0
+        self.wait_max = 0.0
+        self.waits = deque(maxlen=window)
+
+    def attach(self, engine: AsyncEngine):
+        target = engine.sync_engine
+        event.listen(target, "connect", self._on_connect)
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "checkin", self._on_checkin)
+        event.listen(target, "invalidate", self._on_invalidate)
+        event.listen(target, "close", self._on_close)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        # record_info outlives the connections of a record, so a record that
+        # connects again has replaced an expired or invalidated connection
+        if connection_record.record_info.get("connected"):
+            self.connections_recycled += 1
+        else:
+            connection_record.record_info["connected"] = True
+            self.connections_created += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        self.checked_out += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self.checked_out -= 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.connections_invalidated += 1
+
+    def _on_close(self, dbapi_connection, connection_record):
+        self.connections_closed += 1
+
+    def record_wait(self, seconds: float):
+        self.waits.append(seconds)
+        self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(
+        self, pool: Pool, max_overflow: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the pool state and counters.
+
+        Args:
+            pool (Pool): The pool to read the current sizes from.
+            max_overflow (Optional[int]): The overflow limit of the pool, for
+                the saturation ratio.
+
+        Returns:
+            Dict[str, Any]: Sizes and saturation for queue pools, then the
+                event counters and checkout wait times in milliseconds.
+        """
+        stats = {"pool_class": type(pool).__name__, "checked_out": self.checked_out}
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + (max_overflow or 0)
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                capacity=capacity,
+                saturation=round(self.checked_out / capacity, 3) if capacity else None,
+            )
+        waits = list(self.waits)
+        stats.update(
+            connections_created=self.connections_created,
+            connections_recycled=self.connections_recycled,
+            connections_invalidated=self.connections_invalidated,
+            connections_closed=self.connections_closed,
+            checkouts=self.checkouts,
+            checkout_timeouts=self.checkout_timeouts,
+            checkout_wait_ms={
+                "p50": round(percentile(waits, 0.5) * 1000, 3),
+                "p99": round(percentile(waits, 0.99) * 1000, 3),
+                "max": round(self.wait_max * 1000, 3),
+            },
+        )
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The asyncio queue pool, timing how long each checkout waits for a
+    connection (including opening one) and counting checkouts that time out.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.checkout_timeouts += 1
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - started)
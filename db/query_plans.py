@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Query plan checks: capture the statements code sends to the database,
+EXPLAIN them and find the plans that read a whole table or sort rows an
+index should have returned in order.
+
+Plans are explained on SQLite with EXPLAIN QUERY PLAN and on Postgres with
+EXPLAIN, after discouraging sequential scans and sorts for the transaction
+so the plan does not depend on how many rows the test database holds.
+"""
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Sequence, Tuple, Type, Union
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+EXPLAINED = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+@contextmanager
+def capture_statements(
+    engine: Union[Engine, AsyncEngine, Type[Engine]] = Engine,
+) -> Iterator[List[Tuple[str, Any]]]:
+    """
+    Collect the (statement, parameters) of every SELECT, UPDATE and DELETE
+    executed on engine inside the block, by default on any engine.
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(EXPLAINED):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def explain(connection: Connection, statement: str, parameters: Any) -> List[str]:
+    """
+    Return the plan of a statement captured by capture_statements, one line
+    per plan node. Nothing is executed, the statement is only planned; on
+    Postgres the transaction of connection is rolled back.
+
+    Raises:
+        ValueError: If connection is not to SQLite or Postgres.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        result = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        return [row.detail for row in result]
+    if dialect == "postgresql":
+        # SET LOCAL lasts until the end of the transaction, rolled back here
+        try:
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            connection.exec_driver_sql("SET LOCAL enable_sort = off")
+            result = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            return [row[0] for row in result]
+        finally:
+            connection.rollback()
+    raise ValueError(f"Query plans are not supported for {dialect}")
+
+
+def plan_problems(
+    dialect: str,
+    plan: Sequence[str],
+    indexes: Sequence[str] = (),
+    allow_scan: bool = False,
+    allow_sort: bool = False,
+    tables: Sequence[str] = ("videos",),
+) -> List[str]:
+    """
+    Find what is wrong with a plan returned by explain.
+
+    Args:
+        dialect (str): The database the plan comes from.
+        plan (Sequence[str]): The plan lines.
+        indexes (Sequence[str]): Indexes the plan must use.
+        allow_scan (bool): Whether reading one of tables in full is expected.
+        allow_sort (bool): Whether sorting rows is expected.
+        tables (Sequence[str]): The tables that must not be scanned.
+
+    Returns:
+        List[str]: One line per problem, empty when the plan is fine.
+    """
+    names = "|".join(re.escape(table) for table in tables)
+    if dialect == "sqlite":
+        # "SCAN videos USING INDEX ..." walks an index, a bare one the table
+        scan = re.compile(rf"^SCAN (TABLE )?({names})( AS \w+)?$")
+        sort = re.compile(r"USE TEMP B-TREE FOR (ORDER|GROUP) BY")
+    else:
+        # With enable_seqscan off a Seq Scan only remains when nothing else can
+        # answer the query
+        scan = re.compile(rf"Seq Scan on ({names})\b")
+        sort = re.compile(r"^\s*(->\s+)?Sort\b")
+    problems = []
+    for line in plan:
+        if not allow_scan and scan.search(line.strip()):
+            problems.append(f"full table scan: {line.strip()}")
+        if not allow_sort and sort.search(line):
+            problems.append(f"sort: {line.strip()}")
+    text = "\n".join(plan)
+    for index in indexes:
+        if not re.search(rf"\b{re.escape(index)}\b", text):
+            problems.append(f"index {index} not used")
+    return problems
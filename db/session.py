@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 from contextvars import ContextVar
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.database import SessionLocal
 
@@ -10,12 +13,12 @@ def context_aware_session():
     return db_session.get()
 
 
-def get_db() -> SessionLocal:
+async def get_db() -> AsyncIterator[AsyncSession]:
     session = SessionLocal()
     try:
         yield session
     except Exception:
-        session.rollback()
+        await session.rollback()
         raise
     finally:
-        session.close()
+        await session.close()
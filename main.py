@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
+import asyncio
 from typing import Dict
-from core.logger import logger
-from fastapi import FastAPI
+from core.logger import RequestIdMiddleware, logger
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from core.config import config
+from core.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from core.profiler import ProfilingMiddleware, SamplingProfiler
 from core.routes import add_routes
-from db.database import engine
+from api.v1.video.routes import video_controller
+from db.database import SessionLocal, engine, ping_database
+from db.pool import pool_metrics
 
 app = FastAPI(openapi_url="/openapi.json", title="Video-Catalog-FastApi")
 
@@ -18,6 +25,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestIdMiddleware)
+# Not even installed unless enabled, so requests pay nothing for it
+if config.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=SamplingProfiler(
+            interval=config.PROFILING_INTERVAL_MS / 1000,
+            max_concurrent=config.PROFILING_MAX_CONCURRENT,
+        ),
+        directory=config.PROFILING_DIR,
+        token=config.PROFILING_TOKEN,
+    )
+# Added last so it is outermost and its timings include the other middleware,
+# the profiler included
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/ping", tags=["Health"])
@@ -25,6 +47,47 @@ async def read_root() -> Dict:
     return {"message": "pong"}
 
 
+@app.get("/ready", tags=["Health"])
+async def readiness():
+    """
+    Report whether the database answers within READINESS_TIMEOUT, along
+    with the connection pool state, so saturation shows up before requests
+    start timing out.
+    """
+    # Taken before the check, which holds a connection of its own
+    pool = pool_metrics.snapshot(engine.sync_engine.pool, config.DB_MAX_OVERFLOW)
+    try:
+        await asyncio.wait_for(ping_database(), timeout=config.READINESS_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"readiness check failed with following error: {e!r}")
+        return JSONResponse({"status": "unavailable", "pool": pool}, status_code=503)
+    return {"status": "ok", "pool": pool}
+
+
+@app.get("/metrics", tags=["Health"], response_class=Response)
+async def read_metrics() -> Response:
+    """
+    Expose request, database and pool metrics in the Prometheus text format.
+    """
+    pool = pool_metrics.snapshot(engine.sync_engine.pool, config.DB_MAX_OVERFLOW)
+    gauges = {
+        f"db_pool_{name}": (f"Connection pool {name.replace('_', ' ')}.", value)
+        for name, value in pool.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+    return Response(metrics.render(gauges), media_type=CONTENT_TYPE)
+
+
+@app.on_event("startup")
+async def startup_event():
+    # Load the title index up front so the first suggest request is fast
+    try:
+        async with SessionLocal() as db:
+            await video_controller.video_crud.load_title_index(db=db)
+    except Exception as e:
+        logger.warning(f"title index load failed with following error: {str(e)}")
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     try:
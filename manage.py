@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+Management commands, e.g.
+
+    python manage.py load catalog.ndjson --workers 8
+    python manage.py purge --older-than-days 30
+    python manage.py generate --rows 1000000 --seed 7
+"""
+import argparse
+
+from commands import generate_videos, load_videos, purge_videos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Video catalog management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    load_videos.add_parser(subparsers)
+    purge_videos.add_parser(subparsers)
+    generate_videos.add_parser(subparsers)
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,35 @@
 # -*- coding: utf-8 -*-
 import uuid
 from datetime import datetime
+from typing import Any, Optional
 
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, DateTime, Boolean
 
 from db.database import Base
+from models.types import UUIDType, uuid7
+
+
+def generate_id() -> uuid.UUID:
+    return uuid7()
+
+
+def parse_id(value: Any) -> Optional[uuid.UUID]:
+    """
+    Turn an ID from a request into a UUID, or None if it cannot be one and so
+    matches no row.
+    """
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
 
 
 class BaseModel(Base):
     __abstract__ = True
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDType, primary_key=True, default=generate_id)
     created_date = Column(DateTime, default=datetime.now)
     updated_date = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     is_active = Column(Boolean, nullable=False, default=True)
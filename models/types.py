@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import LargeBinary, Uuid
+from sqlalchemy.types import TypeDecorator
+
+
+def uuid7(
+    nanoseconds: Optional[int] = None, random_bits: Optional[int] = None
+) -> uuid.UUID:
+    """
+    Generate a time-ordered UUID, version 7 of RFC 9562.
+
+    The first 48 bits are the Unix time in milliseconds and the next 12 the
+    fraction of the millisecond (method 3 of the RFC), so keys generated one
+    after another sort in creation order and new rows land on the rightmost
+    B-tree page instead of a random one. The remaining 62 bits are random.
+
+    Passing the time (in nanoseconds) and the random bits, e.g. to generate
+    reproducible data, makes the result deterministic.
+    """
+    if nanoseconds is None:
+        nanoseconds = time.time_ns()
+    if random_bits is None:
+        random_bits = int.from_bytes(os.urandom(8), "big")
+    milliseconds, remainder = divmod(nanoseconds, 1_000_000)
+    fraction = remainder * 4096 // 1_000_000
+    random_bits &= (1 << 62) - 1
+    return uuid.UUID(
+        int=milliseconds << 80 | 0x7 << 76 | fraction << 64 | 0b10 << 62 | random_bits
+    )
+
+
+class UUIDType(TypeDecorator):
+    """
+    A UUID stored natively: the uuid type on Postgres and a 16-byte blob on
+    other databases, where Uuid would fall back to 32 characters of hex.
+
+    Binds accept uuid.UUID objects or their string forms; results are always
+    uuid.UUID objects. Blobs compare byte by byte, so keys sort the same way
+    on every backend.
+    """
+
+    impl = Uuid
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Uuid())
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        if dialect.name == "postgresql":
+            return value
+        return value.bytes
+
+    def process_result_value(self, value: Any, dialect) -> Optional[uuid.UUID]:
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, (bytes, memoryview)):
+            return uuid.UUID(bytes=bytes(value))
+        return uuid.UUID(str(value))
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import DDL, Column, Index, Integer, String, event, false, true
 
 from models.base_model import BaseModel
 
@@ -13,3 +13,75 @@ class VideoModel(BaseModel):
 
     def __repr__(self):
         return self.title
+
+
+# Soft-deleted videos stay in the table with is_active false until the purge
+# command removes them. Reads filter on exactly this expression, which is what
+# lets both Postgres and SQLite use the partial indexes below
+IS_ACTIVE = VideoModel.is_active == true()
+IS_TOMBSTONE = VideoModel.is_active == false()
+
+# Keyset pagination walks the catalog in (<sort column>, id) order, and the
+# same indexes serve the range filters on those columns. They only cover live
+# rows, so tombstones never slow the hot list queries down
+for sort_column in (
+    VideoModel.created_date,
+    VideoModel.updated_date,
+    VideoModel.duration,
+):
+    Index(
+        f"ix_videos_{sort_column.key}_id",
+        sort_column,
+        VideoModel.id,
+        postgresql_where=IS_ACTIVE,
+        sqlite_where=IS_ACTIVE,
+    )
+# The purge command finds old tombstones through this one
+Index(
+    "ix_videos_tombstones_updated_date",
+    VideoModel.updated_date,
+    postgresql_where=IS_TOMBSTONE,
+    sqlite_where=IS_TOMBSTONE,
+)
+
+# Full-text search over title and description lives outside the mapped
+# columns: a stored tsvector with a GIN index on Postgres, and an
+# external-content FTS5 table kept in sync by triggers on SQLite (tests).
+# Alembic revision a3c5e2f1b7d4 creates the same objects.
+SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE videos ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || "
+        "coalesce(description, ''))) STORED",
+        "CREATE INDEX ix_videos_search_vector ON videos USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+        "title, description, content='videos', content_rowid='rowid')",
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN "
+        "INSERT INTO videos_fts(rowid, title, description) "
+        "VALUES (new.rowid, new.title, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_update "
+        "AFTER UPDATE OF title, description ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); "
+        "INSERT INTO videos_fts(rowid, title, description) "
+        "VALUES (new.rowid, new.title, new.description); END",
+    ],
+}
+
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(
+            VideoModel.__table__,
+            "after_create",
+            DDL(statement).execute_if(dialect=dialect),
+        )
+event.listen(
+    VideoModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS videos_fts").execute_if(dialect="sqlite"),
+)
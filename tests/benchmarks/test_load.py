@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import httpx
+
+from benchmarks.load.compare import compare
+from benchmarks.load.workloads import PREFIX, Catalog
+
+
+def latency(p50=1.0, p95=2.0, p99=3.0):
+    return {"p50": p50, "p95": p95, "p99": p99}
+
+
+def result(throughput=100.0, errors=0, operations=None):
+    operations = operations or {"get_video": {"errors": 0, "latency_ms": latency()}}
+    return {
+        "workloads": {
+            "read": {
+                "throughput": throughput,
+                "errors": errors,
+                "latency_ms": latency(),
+                "operations": operations,
+            }
+        }
+    }
+
+
+class TestCompare:
+    def test_compare_nothing_changed(self):
+        assert compare(result(), result(), threshold=0.1) == []
+
+    def test_compare_throughput_drop(self):
+        assert compare(result(), result(throughput=95.0), threshold=0.1) == []
+        assert compare(result(), result(throughput=80.0), threshold=0.1) == [
+            "read: throughput 100.0 -> 80.0 req/s (-20.0%)"
+        ]
+
+    def test_compare_errors_from_zero(self):
+        assert compare(result(), result(errors=1), threshold=0.1) == [
+            "read: errors 0 -> 1"
+        ]
+
+    def test_compare_operation_percentiles(self):
+        current = result(
+            operations={
+                "get_video": {"errors": 0, "latency_ms": latency(p95=3.0)},
+                # Not in the baseline, nothing to compare with
+                "list_filtered": {"errors": 0, "latency_ms": latency(p99=30.0)},
+            }
+        )
+
+        assert compare(result(), current, threshold=0.1) == [
+            "read get_video: p95 2.0 -> 3.0 ms (+50.0%)"
+        ]
+
+    def test_compare_skips_new_workloads(self):
+        baseline = {"workloads": {}}
+
+        assert compare(baseline, result(errors=5), threshold=0.1) == []
+
+
+def response(status_code, video_id):
+    request = httpx.Request("GET", f"http://test{PREFIX}/{video_id}")
+    return httpx.Response(status_code, request=request)
+
+
+class TestCatalog:
+    def test_is_error(self):
+        catalog = Catalog(["a", "b"], rows=2)
+        catalog.deleted.add("b")
+
+        assert not catalog.is_error(response(200, "a"))
+        assert catalog.is_error(response(404, "a"))
+        assert catalog.is_error(response(500, "b"))
+        # Deleted by another worker while the read was in flight
+        assert not catalog.is_error(response(404, "b"))
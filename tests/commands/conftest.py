@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from tests.commands.helper import create_database
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return create_database(f"sqlite:///{tmp_path}/catalog.db")
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+from typing import Iterator, List, Set
+
+from sqlalchemy import Connection, Row, create_engine, insert, select
+
+from models import Base
+from models.video import VideoModel
+
+
+@contextmanager
+def connect(database_url: str, begin: bool = False) -> Iterator[Connection]:
+    # Commands open their own engines, so the tests read what they wrote
+    # through a separate one
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() if begin else engine.connect() as conn:
+            yield conn
+    finally:
+        engine.dispose()
+
+
+def create_database(database_url: str) -> str:
+    with connect(database_url, begin=True) as conn:
+        Base.metadata.create_all(conn)
+    return database_url
+
+
+def insert_videos(database_url: str, rows: List[dict]):
+    with connect(database_url, begin=True) as conn:
+        conn.execute(insert(VideoModel.__table__), rows)
+
+
+def video_rows(database_url: str) -> List[Row]:
+    with connect(database_url) as conn:
+        return conn.execute(
+            select(VideoModel.__table__).order_by(VideoModel.created_date)
+        ).all()
+
+
+def video_titles(database_url: str) -> Set[str]:
+    return {row.title for row in video_rows(database_url)}
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+from commands.generate_videos import CatalogShape, generate, generate_rows
+from tests.commands.helper import connect, create_database, video_rows
+
+SHAPE = CatalogShape(
+    rows=1000,
+    seed=3,
+    start_date=datetime(2024, 1, 1),
+    end_date=datetime(2025, 1, 1),
+    tombstone_ratio=0.1,
+)
+
+
+class TestGenerateVideos:
+    def test_generate_rows(self):
+        rows = generate_rows(SHAPE, index=0, first_row=0, count=SHAPE.rows)
+
+        assert rows == generate_rows(SHAPE, index=0, first_row=0, count=SHAPE.rows)
+        assert [row["created_date"] for row in rows] == sorted(
+            row["created_date"] for row in rows
+        )
+        assert [row["id"] for row in rows] == sorted(
+            (row["id"] for row in rows), key=lambda value: value.bytes
+        )
+        assert all(
+            SHAPE.start_date <= row["created_date"] <= row["updated_date"]
+            and row["updated_date"] <= SHAPE.end_date
+            for row in rows
+        )
+        tombstones = sum(not row["is_active"] for row in rows)
+        assert 50 < tombstones < 150
+        assert len({row["title"] for row in rows}) > 100
+
+    def test_same_catalog_whatever_the_workers(self, tmp_path, database_url):
+        stats = generate(
+            database_url,
+            rows=SHAPE.rows,
+            seed=SHAPE.seed,
+            workers=2,
+            chunk_size=300,
+            start_date=SHAPE.start_date,
+            end_date=SHAPE.end_date,
+        )
+        other_url = create_database(f"sqlite:///{tmp_path}/other.db")
+        generate(
+            other_url,
+            rows=SHAPE.rows,
+            seed=SHAPE.seed,
+            workers=1,
+            chunk_size=300,
+            start_date=SHAPE.start_date,
+            end_date=SHAPE.end_date,
+        )
+
+        assert stats["inserted"] == SHAPE.rows
+        rows = video_rows(database_url)
+        assert len(rows) == SHAPE.rows
+        assert rows == video_rows(other_url)
+
+    def test_rows_are_searchable(self, database_url):
+        generate(database_url, rows=500, chunk_size=200)
+
+        with connect(database_url) as conn:
+            searchable = conn.exec_driver_sql(
+                "SELECT count(*) FROM videos_fts WHERE videos_fts MATCH 'cooking'"
+            ).scalar()
+            containing = conn.exec_driver_sql(
+                "SELECT count(*) FROM videos "
+                "WHERE title LIKE '%cooking%' OR description LIKE '%cooking%'"
+            ).scalar()
+            triggers = set(
+                conn.exec_driver_sql(
+                    "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+                ).scalars()
+            )
+        assert searchable == containing > 0
+        # The insert trigger is back once the catalog is indexed
+        assert "videos_fts_insert" in triggers
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import json
+
+from commands.load_videos import (
+    COPY_STATEMENT,
+    Checkpoint,
+    csv_buffer,
+    init_worker,
+    iter_chunks,
+    load,
+    load_chunk,
+    read_records,
+)
+from tests.commands.helper import video_rows
+
+
+class TestLoadVideos:
+    def test_load_ndjson(self, tmp_path, database_url):
+        path = tmp_path / "videos.ndjson"
+        lines = [
+            json.dumps({"title": f"Video {i}", "description": "A video", "duration": i})
+            for i in range(5)
+        ]
+        lines.insert(
+            2, json.dumps({"title": "T" * 101, "description": "", "duration": 1})
+        )
+        path.write_text("\n".join(lines) + "\n")
+        rejects_path = tmp_path / "rejects.ndjson"
+
+        stats = load(
+            str(path),
+            database_url,
+            workers=2,
+            chunk_size=2,
+            rejects_path=str(rejects_path),
+        )
+
+        assert stats["inserted"] == 5
+        assert stats["rejected"] == 1
+        assert len(video_rows(database_url)) == 5
+        reject = json.loads(rejects_path.read_text())
+        assert reject["line"] == 3
+        assert reject["errors"][0]["loc"] == ["title"]
+        assert not (tmp_path / "videos.ndjson.checkpoint.json").exists()
+
+    def test_load_csv(self, tmp_path, database_url):
+        path = tmp_path / "videos.csv"
+        path.write_text(
+            "title,description,duration\n"
+            'Video 1,"Multi\nline",120\n'
+            "Video 2,Description 2,not a number\n"
+            "Video 3,Description 3,180\n"
+        )
+        rejects_path = tmp_path / "rejects.ndjson"
+
+        stats = load(str(path), database_url, rejects_path=str(rejects_path))
+
+        assert stats["inserted"] == 2
+        assert json.loads(rejects_path.read_text())["line"] == 4
+
+    def test_load_resumes_from_checkpoint(self, tmp_path, database_url):
+        path = tmp_path / "videos.ndjson"
+        path.write_text(
+            "".join(
+                json.dumps({"title": f"Video {i}", "description": "", "duration": i})
+                + "\n"
+                for i in range(6)
+            )
+        )
+        checkpoint_path = str(tmp_path / "videos.checkpoint.json")
+        # The first two chunks were committed by an earlier, interrupted run
+        checkpoint = Checkpoint(checkpoint_path, str(path), chunk_size=2)
+        checkpoint.mark_done(0)
+        checkpoint.mark_done(1)
+
+        stats = load(
+            str(path), database_url, chunk_size=2, checkpoint_path=checkpoint_path
+        )
+
+        assert stats["inserted"] == 2
+        assert stats["skipped_chunks"] == 2
+        assert len(video_rows(database_url)) == 2
+
+    def test_load_skips_chunks_committed_before_an_interruption(
+        self, tmp_path, database_url
+    ):
+        path = tmp_path / "videos.ndjson"
+        path.write_text(
+            "".join(
+                json.dumps({"title": f"Video {i}", "description": "", "duration": i})
+                + "\n"
+                for i in range(6)
+            )
+        )
+        checkpoint_path = str(tmp_path / "videos.checkpoint.json")
+        # The earlier run committed chunk 1 but died before recording it
+        checkpoint = Checkpoint(checkpoint_path, str(path), chunk_size=2)
+        init_worker(database_url)
+        chunks = dict(iter_chunks(read_records(str(path), "ndjson"), 2))
+        load_chunk(1, chunks[1], checkpoint.load_id, checkpoint.source)
+
+        stats = load(
+            str(path), database_url, chunk_size=2, checkpoint_path=checkpoint_path
+        )
+
+        assert stats["inserted"] == 4
+        assert len(video_rows(database_url)) == 6
+
+    def test_copy_keeps_empty_descriptions(self):
+        row = {
+            "id": "0190b5d2-4f1c-7000-8000-000000000000",
+            "title": "Video",
+            "description": "",
+            "duration": 1,
+            "created_date": "2024-01-01 00:00:00",
+            "updated_date": "2024-01-01 00:00:00",
+            "is_active": True,
+        }
+
+        line = csv_buffer([row]).getvalue()
+
+        # An unquoted empty field, which COPY would read as NULL without
+        # FORCE_NOT_NULL
+        assert line.startswith("0190b5d2-4f1c-7000-8000-000000000000,Video,,1,")
+        assert "FORCE_NOT_NULL (title, description)" in COPY_STATEMENT
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+from commands.purge_videos import purge
+from models.base_model import generate_id
+from tests.commands.helper import insert_videos, video_titles
+
+
+def video_row(title, is_active, age_days):
+    updated_date = datetime.now() - timedelta(days=age_days)
+    return {
+        "id": generate_id(),
+        "title": title,
+        "description": "",
+        "duration": 1,
+        "created_date": updated_date,
+        "updated_date": updated_date,
+        "is_active": is_active,
+    }
+
+
+class TestPurgeVideos:
+    def test_purge_old_tombstones_in_batches(self, database_url):
+        rows = [video_row(f"old-{i}", False, 40) for i in range(5)]
+        rows += [
+            video_row("recent", False, 1),
+            video_row("live-old", True, 40),
+            video_row("live", True, 0),
+        ]
+        insert_videos(database_url, rows)
+
+        stats = purge(database_url, older_than=timedelta(days=30), batch_size=2)
+
+        assert stats["purged"] == 5
+        assert stats["batches"] == 3
+        assert video_titles(database_url) == {"recent", "live-old", "live"}
+
+    def test_purge_nothing(self, database_url):
+        insert_videos(database_url, [video_row("live", True, 40)])
+
+        stats = purge(database_url, older_than=timedelta(days=30))
+
+        assert stats["purged"] == 0
+        assert stats["batches"] == 0
+        assert video_titles(database_url) == {"live"}
@@ -1,40 +1,71 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import os
 from unittest import mock
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy import event
 
-from db.database import Base, engine
+from db.database import Base, create_tables, engine
 from db.session import get_db
+from api.v1.video.routes import video_controller
 from main import app
 from tests.helper import test_db_session
 
 
-@pytest.fixture
-def db_session():
-    return next(test_db_session())
+@pytest_asyncio.fixture
+async def db_session():
+    async for session in test_db_session():
+        yield session
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_db():
+    async def recreate():
+        # Start from the current schema even if the test database file exists
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await create_tables()
+
+    asyncio.run(recreate())
 
 
 @pytest.fixture(scope="session")
 def client():
-    Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = test_db_session
     with mock.patch.dict(os.environ, {"TESTING": "Testing"}):
         yield TestClient(app)
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def statements():
+    # Every SQL statement sent to the database while the test runs
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
 @pytest.fixture(scope="function", autouse=True)
-def truncate_db(db_session):
-    # Create a new session and start a transaction
-    session = Session(bind=engine)
-    session.begin_nested()
-    # Delete database tables
-    for table in reversed(Base.metadata.sorted_tables):
-        session.execute(table.delete())
-        session.commit()
+def truncate_db():
+    async def truncate():
+        # Delete database tables
+        async with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                await conn.execute(table.delete())
+
+    asyncio.run(truncate())
+    video_controller.video_crud.video_cache.clear()
+    video_controller.video_crud.count_cache.invalidate()
+    video_controller.video_crud.catalog_cache.invalidate()
+    video_controller.video_crud.live_count_cache.invalidate()
+    video_controller.video_crud.title_index.clear()
+    video_controller.list_cache.clear()
     yield
-    session.rollback()
-    session.close()
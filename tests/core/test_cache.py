@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from core.cache import CachedValue, Generation, LRUCache, ResponseCache
+
+
+class TestCachedValue:
+    def test_cached_value_expires(self):
+        cached = CachedValue(ttl=10)
+        with mock.patch("core.cache.time.monotonic", return_value=100.0):
+            cached.set(42)
+            assert cached.get() == 42
+        with mock.patch("core.cache.time.monotonic", return_value=110.0):
+            assert cached.get() is None
+
+    def test_cached_value_invalidate(self):
+        cached = CachedValue(ttl=10)
+        cached.set(42)
+        cached.invalidate()
+        assert cached.get() is None
+
+
+class TestLRUCache:
+    def test_lru_cache_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_lru_cache_expires_entries(self):
+        cache = LRUCache(max_size=2, ttl=10)
+        with mock.patch("core.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("core.cache.time.monotonic", return_value=110.0):
+            assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_lru_cache_stats(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_lru_cache_disabled(self):
+        cache = LRUCache(max_size=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+
+class TestGeneration:
+    def test_generation_bump(self):
+        generation = Generation()
+        started_at = generation.changed_at
+        generation.bump()
+        generation.bump()
+
+        assert generation.value == 2
+        assert generation.changed_at >= started_at
+        assert Generation().token != generation.token
+
+
+class TestResponseCache:
+    def test_response_cache_evicts_by_size(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set("a", 0, b"12345")
+        cache.set("b", 0, b"12345")
+        assert cache.get("a", 0) == b"12345"
+        cache.set("c", 0, b"123")
+
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) == b"12345"
+        assert cache.size_bytes == 8
+        assert cache.evictions == 1
+
+    def test_response_cache_skips_oversized_bodies(self):
+        cache = ResponseCache(max_bytes=4)
+        cache.set("a", 0, b"12345")
+        assert cache.get("a", 0) is None
+        assert len(cache) == 0
+
+    def test_response_cache_drops_older_generations(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set("a", 0, b"1")
+        assert cache.get("a", 1) is None
+        assert len(cache) == 0
+        assert cache.invalidations == 1
+
+        stats = cache.stats()
+        assert stats["generation"] == 1
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (0, 1, 0.0)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import queue
+import sys
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from unittest import mock
+
+from core.logger import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    build_file_handler,
+    request_id,
+    start_queue_logging,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def test_queue_logging_formats_json_off_thread():
+    logger = logging.getLogger("tests.queue_logging")
+    logger.propagate = False
+    handler = ListHandler()
+    handler.setFormatter(JsonFormatter())
+    listener = start_queue_logging(logger, [handler])
+    token = request_id.set("abc123")
+    try:
+        logger.warning("video %s deleted", "v1", extra={"video_id": "v1"})
+    finally:
+        request_id.reset(token)
+        listener.stop()
+        logger.handlers.clear()
+
+    (line,) = handler.lines
+    entry = json.loads(line)
+    assert entry["level"] == "WARNING"
+    assert entry["message"] == "video v1 deleted"
+    assert entry["request_id"] == "abc123"
+    assert entry["video_id"] == "v1"
+
+
+def test_json_formatter_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "app", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["request_id"] is None
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_sampling_filter():
+    sampling = SamplingFilter({"debug": 0.25})
+    debug = logging.makeLogRecord({"levelno": logging.DEBUG})
+    info = logging.makeLogRecord({"levelno": logging.INFO})
+    with mock.patch("core.logger.random.random", return_value=0.5):
+        assert not sampling.filter(debug)
+        assert sampling.filter(info)
+    with mock.patch("core.logger.random.random", return_value=0.1):
+        assert sampling.filter(debug)
+
+
+def test_queue_handler_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    handler.handle(logging.makeLogRecord({"msg": "first"}))
+    handler.handle(logging.makeLogRecord({"msg": "second"}))
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_build_file_handler(tmp_path):
+    path = str(tmp_path / "app.log")
+    handlers = [
+        build_file_handler(path, rotate_when="midnight"),
+        build_file_handler(path, rotate_bytes=1024),
+        build_file_handler(path),
+    ]
+    assert isinstance(handlers[0], TimedRotatingFileHandler)
+    assert isinstance(handlers[1], RotatingFileHandler)
+    assert type(handlers[2]) is logging.FileHandler
+    for handler in handlers:
+        handler.close()
+
+
+def test_request_id_header(client):
+    response = client.get("/api/v1/ping", headers={"X-Request-ID": "req-1"})
+    assert response.headers["x-request-id"] == "req-1"
+
+    response = client.get("/api/v1/ping", headers={"X-Request-ID": "bad\tid"})
+    assert len(response.headers["x-request-id"]) == 32
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from core.metrics import Histogram, MetricsRegistry
+
+
+class TestHistogram:
+    def test_observe_and_render(self):
+        histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+        histogram.observe(("/a",), 0.05)
+        histogram.observe(("/a",), 0.1)
+        histogram.observe(("/a",), 3.0)
+        histogram.observe(('/"b"',), 0.5)
+
+        assert list(histogram.render()) == [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a",le="1.0"} 2',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+            'latency_seconds_sum{route="/a"} 3.15',
+            'latency_seconds_count{route="/a"} 3',
+            'latency_seconds_bucket{route="/\\"b\\"",le="0.1"} 0',
+            'latency_seconds_bucket{route="/\\"b\\"",le="1.0"} 1',
+            'latency_seconds_bucket{route="/\\"b\\"",le="+Inf"} 1',
+            'latency_seconds_sum{route="/\\"b\\""} 0.5',
+            'latency_seconds_count{route="/\\"b\\""} 1',
+        ]
+
+
+class TestMetricsRegistry:
+    def test_render_gauges(self):
+        registry = MetricsRegistry()
+        text = registry.render({"db_pool_checked_out": ("Checked out.", 3)})
+        assert (
+            "# TYPE http_requests_in_progress gauge\nhttp_requests_in_progress 0\n"
+            in (text)
+        )
+        assert "db_pool_checked_out 3\n" in text
+        assert text.endswith("\n")
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+from core.prefix_index import MERGE_THRESHOLD, PrefixIndex
+
+
+def loaded_index(entries):
+    index = PrefixIndex()
+    index.load(entries)
+    return index
+
+
+class TestPrefixIndex:
+    def test_search_ignores_case_and_orders_by_text(self):
+        index = loaded_index([("1", "pasta"), ("2", "Pasta Night"), ("3", "Pizza")])
+
+        assert index.search("PAS") == [("1", "pasta"), ("2", "Pasta Night")]
+        assert index.search("pasta n") == [("2", "Pasta Night")]
+        assert index.search("pastry") == []
+        assert index.search("p", limit=1) == [("1", "pasta")]
+
+    def test_add_replaces_and_remove_drops(self):
+        index = loaded_index([("1", "Pasta")])
+        index.add("1", "Bread")
+        index.add("2", "Bagel")
+
+        assert index.search("pa") == []
+        assert index.search("b") == [("2", "Bagel"), ("1", "Bread")]
+
+        index.remove("1")
+        index.remove("missing")
+        assert index.search("b") == [("2", "Bagel")]
+        assert len(index) == 1
+
+    def test_add_many_merges_large_batches(self):
+        index = loaded_index([("a", "Video 5")])
+        index.add_many((str(i), f"Video {i}") for i in range(MERGE_THRESHOLD * 2))
+
+        assert len(index) == MERGE_THRESHOLD * 2 + 1
+        assert index.search("video 5", limit=3) == [
+            ("5", "Video 5"),
+            ("a", "Video 5"),
+            ("50", "Video 50"),
+        ]
+
+    def test_changes_are_dropped_before_load_and_replayed_during_load(self):
+        index = PrefixIndex()
+        index.add("1", "Ignored")
+        index.begin_load()
+        index.add("2", "Added while loading")
+        index.remove("3")
+        index.load([("1", "Pasta"), ("3", "Removed while loading")])
+
+        assert index.loaded
+        assert index.search("") == [("2", "Added while loading"), ("1", "Pasta")]
+
+    def test_reload_serves_previous_entries_until_loaded(self):
+        index = loaded_index([("1", "Pasta"), ("2", "Pizza")])
+        index.begin_load()
+        index.add("3", "Pasta bake")
+        index.remove("2")
+
+        assert index.search("p") == [("1", "Pasta"), ("3", "Pasta bake")]
+        index.load([("1", "Pasta"), ("2", "Pizza"), ("4", "Polenta")])
+        assert index.search("p") == [
+            ("1", "Pasta"),
+            ("3", "Pasta bake"),
+            ("4", "Polenta"),
+        ]
+
+    def test_abort_load_keeps_entries(self):
+        index = loaded_index([("1", "Pasta")])
+        index.begin_load()
+        index.add("2", "Pizza")
+        index.abort_load()
+
+        assert not index.loading
+        assert index.search("p") == [("1", "Pasta"), ("2", "Pizza")]
+
+    def test_memory_usage_grows_with_entries(self):
+        small = loaded_index([("1", "Pasta")])
+        large = loaded_index([(str(i), f"Video {i}") for i in range(100)])
+
+        assert 0 < small.memory_usage() < large.memory_usage()
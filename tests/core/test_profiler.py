@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.profiler import WAITING, ProfilingMiddleware, SamplingProfiler
+
+
+def spin(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def handler():
+    spin(0.05)
+    await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_sampling_profiler():
+    profiler = SamplingProfiler(interval=0.001, max_concurrent=1)
+    profile = profiler.start(asyncio.current_task())
+    assert profiler.start(asyncio.current_task()) is None
+    try:
+        await handler()
+    finally:
+        profiler.stop(profile)
+
+    stacks = " ".join(profile.stacks)
+    assert "tests.core.test_profiler:handler;tests.core.test_profiler:spin" in stacks
+    assert f"tests.core.test_profiler:handler;asyncio.tasks:sleep;{WAITING}" in stacks
+    # Frames of the event loop below the task are left out
+    assert all(
+        stack.startswith("tests.core.test_profiler:test_sampling_profiler;")
+        for stack in profile.stacks
+    )
+    collapsed = profile.collapsed("GET /videos")
+    assert collapsed.startswith("GET_/videos;tests.core.test_profiler:")
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in collapsed.splitlines()) == sum(
+        profile.stacks.values()
+    )
+
+
+def test_profiling_middleware(tmp_path):
+    app = FastAPI()
+
+    @app.get("/videos")
+    async def list_videos():
+        await handler()
+        return {"data": []}
+
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=SamplingProfiler(interval=0.001, max_concurrent=1),
+        directory=str(tmp_path),
+        token="secret",
+    )
+    client = TestClient(app)
+
+    response = client.get("/videos", headers={"X-Profile": "wrong"})
+    assert "x-profile-id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get("/videos", headers={"X-Profile": "secret"})
+    profile_id = response.headers["x-profile-id"]
+    collapsed = (tmp_path / f"{profile_id}.collapsed").read_text()
+    assert "GET_/videos;" in collapsed
+    assert "tests.core.test_profiler:list_videos" in collapsed
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.metrics import RequestStats, request_stats
+from core.query_log import QueryLog, Sampler, normalize_sql, parameters_shape
+
+
+def test_normalize_sql():
+    assert (
+        normalize_sql("SELECT *\n  FROM videos\nWHERE id IN (?, ?, ?) LIMIT 10")
+        == "SELECT * FROM videos WHERE id IN (?, ...) LIMIT ?"
+    )
+    assert (
+        normalize_sql("UPDATE videos SET title = 'It''s' WHERE id = $1")
+        == "UPDATE videos SET title = ? WHERE id = ?"
+    )
+    assert normalize_sql("SELECT ix_videos_1 FROM t") == "SELECT ix_videos_1 FROM t"
+
+
+def test_parameters_shape():
+    assert parameters_shape(("a", 1, 2, 3)) == "(str, 3 x int)"
+    assert parameters_shape({"title": "a", "limit": 1}) == "{title: str, limit: int}"
+    assert parameters_shape([("a",), ("b",)], executemany=True) == "2 x (str)"
+    assert parameters_shape([], executemany=True) == "0 x ()"
+
+
+def test_sampler():
+    sampler = Sampler(interval=60)
+    assert sampler.allow("a") == 0
+    assert sampler.allow("a") is None
+    assert sampler.allow("a") is None
+    assert sampler.allow("b") == 0
+
+    with mock.patch("core.query_log.time.monotonic", return_value=1e12):
+        assert sampler.allow("a") == 2
+
+
+@pytest.mark.asyncio
+async def test_query_log():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    logger = mock.Mock()
+    query_log = QueryLog(
+        slow_threshold=1e-9, repeat_threshold=2, sample_interval=60, logger=logger
+    )
+    query_log.attach(engine)
+    route = mock.Mock(path="/api/v1/video/{video_id}")
+    token = request_stats.set(RequestStats({"method": "GET", "route": route}))
+    try:
+        async with engine.connect() as conn:
+            for value in range(4):
+                await conn.execute(text("SELECT :value"), {"value": value})
+    finally:
+        request_stats.reset(token)
+        await engine.dispose()
+
+    slow, repeated = [call.args[0] for call in logger.warning.call_args_list]
+    # Sampled down to the first of each finding
+    assert slow.startswith("slow query: ")
+    assert slow.endswith(
+        " ms, route /api/v1/video/{video_id}, parameters (int), "
+        "0 similar suppressed: SELECT ?"
+    )
+    assert repeated == (
+        "repeated query: GET /api/v1/video/{video_id} ran the same statement more "
+        "than 2 times, 0 similar requests suppressed: SELECT ?"
+    )
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.pool import InstrumentedQueuePool, PoolMetrics, pool_metrics
+
+
+@pytest.fixture
+def metrics_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+    return engine, metrics
+
+
+class TestPoolMetrics:
+    @pytest.mark.asyncio
+    async def test_counts_checkouts_and_connections(self, metrics_engine):
+        engine, metrics = metrics_engine
+        try:
+            async with engine.connect() as first, engine.connect() as second:
+                await first.execute(text("SELECT 1"))
+                await second.execute(text("SELECT 1"))
+                stats = metrics.snapshot(engine.sync_engine.pool, max_overflow=1)
+                assert stats["checked_out"] == 2
+                assert stats["overflow"] == 1
+                assert stats["saturation"] == 1.0
+            stats = metrics.snapshot(engine.sync_engine.pool, max_overflow=1)
+        finally:
+            await engine.dispose()
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["connections_created"] == 2
+        # The overflow connection is closed when it comes back
+        assert stats["connections_closed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_counts_reconnects(self, metrics_engine):
+        engine, metrics = metrics_engine
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.invalidate()
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+        assert metrics.connections_invalidated == 1
+        assert metrics.connections_created == 1
+        assert metrics.connections_recycled == 1
+
+    @pytest.mark.asyncio
+    async def test_times_checkout_waits(self, metrics_engine):
+        engine, _ = metrics_engine
+        waits = len(pool_metrics.waits)
+        timeouts = pool_metrics.checkout_timeouts
+        try:
+            async with engine.connect(), engine.connect():
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+        finally:
+            await engine.dispose()
+        assert len(pool_metrics.waits) == waits + 3
+        assert pool_metrics.checkout_timeouts == timeouts + 1
+        assert pool_metrics.wait_max >= 0.1
+        stats = pool_metrics.snapshot(engine.sync_engine.pool)
+        assert stats["checkout_wait_ms"]["max"] >= 100
+
+    @pytest.mark.asyncio
+    async def test_snapshot_of_other_pools(self, metrics_engine):
+        engine, metrics = metrics_engine
+        await engine.dispose()
+        nullpool_engine = create_async_engine("sqlite+aiosqlite://")
+        stats = metrics.snapshot(nullpool_engine.sync_engine.pool)
+        await nullpool_engine.dispose()
+        assert "saturation" not in stats
+        assert stats["checkouts"] == 0
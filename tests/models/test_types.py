@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import uuid
+from unittest import mock
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.base_model import parse_id
+from models.types import uuid7
+from models.video import VideoModel
+
+
+class TestUUID7:
+    def test_uuid7_layout(self):
+        with mock.patch(
+            "models.types.time.time_ns", return_value=1_700_000_000_000_500_000
+        ):
+            value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert value.int >> 80 == 1_700_000_000_000
+        # Half a millisecond in 4096ths
+        assert value.int >> 64 & 0xFFF == 2048
+
+    def test_uuid7_sorts_by_time(self):
+        values = []
+        for nanoseconds in range(0, 10_000_000, 250_000):
+            with mock.patch("models.types.time.time_ns", return_value=nanoseconds):
+                values.append(uuid7())
+        assert sorted(values, key=lambda value: value.bytes) == values
+        assert len(set(values)) == len(values)
+
+    def test_uuid7_deterministic(self):
+        value = uuid7(1_700_000_000_000_500_000, random_bits=(1 << 64) - 1)
+        assert value == uuid7(1_700_000_000_000_500_000, random_bits=(1 << 64) - 1)
+        assert value.int >> 80 == 1_700_000_000_000
+        assert value.variant == uuid.RFC_4122
+        assert value.int & (1 << 62) - 1 == (1 << 62) - 1
+
+    def test_parse_id(self):
+        value = uuid7()
+        assert parse_id(value) is value
+        assert parse_id(str(value).upper()) == value
+        assert parse_id("missing") is None
+
+
+class TestUUIDType:
+    @pytest.mark.asyncio
+    async def test_stored_as_16_bytes(self, db_session: AsyncSession):
+        video_id = uuid7()
+        await db_session.execute(
+            insert(VideoModel),
+            [{"id": str(video_id), "title": "Video", "is_active": True}],
+        )
+        stored = await db_session.execute(
+            text("SELECT typeof(id), length(id) FROM videos")
+        )
+        assert stored.one() == ("blob", 16)
+        assert await db_session.scalar(select(VideoModel.id)) == video_id
+        assert (
+            await db_session.scalar(
+                select(VideoModel.title).where(VideoModel.id == str(video_id))
+            )
+            == "Video"
+        )
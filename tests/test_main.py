@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from fastapi import status
+
+from core.metrics import metrics
+
+
+class TestHealth:
+    def test_ping(self, client):
+        response = client.get("/api/v1/ping")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"message": "pong"}
+
+    def test_ready(self, client):
+        response = client.get("/api/v1/ready")
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["status"] == "ok"
+        assert body["pool"]["checkouts"] >= 0
+        assert set(body["pool"]["checkout_wait_ms"]) == {"p50", "p99", "max"}
+
+    def test_ready_database_down(self, client):
+        with mock.patch("main.ping_database", side_effect=OSError("refused")):
+            response = client.get("/api/v1/ready")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["status"] == "unavailable"
+
+    def test_metrics(self, client):
+        metrics.clear()
+        video_data = {"title": "Video 1", "description": "Description", "duration": 1}
+        video_id = client.post("/api/v1/video/", json=video_data).json()["id"]
+        client.get(f"/api/v1/video/{video_id}")
+        client.get("/api/v1/video/missing/path/here")
+
+        response = client.get("/api/v1/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        labels = 'method="GET",route="/api/v1/video/{video_id}"'
+        assert f'http_request_duration_seconds_count{{{labels},status="200"}} 1' in text
+        # One SELECT, then served from the video cache
+        client.get(f"/api/v1/video/{video_id}")
+        text = client.get("/api/v1/metrics").text
+        assert f"http_request_db_statements_count{{{labels}}} 2" in text
+        assert f'http_request_db_statements_bucket{{{labels},le="0"}} 1' in text
+        assert f'http_request_db_statements_bucket{{{labels},le="1"}} 2' in text
+        assert f"http_request_db_statements_sum{{{labels}}} 1" in text
+        assert 'route="unmatched",status="404"' in text
+        assert "db_pool_checkouts " in text
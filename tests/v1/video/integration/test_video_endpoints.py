@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
+import csv
+import io
+import json
+
 from fastapi import status
 
+from core.config import config
+
 
 class TestVideoEndpoints:
     def test_create_video_endpoint(self, client):
@@ -95,6 +101,119 @@ class TestVideoEndpoints:
         response = client.get(f"/api/v1/video/{video['id']}")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_update_and_delete_video_endpoint_single_statement(
+        self, client, statements
+    ):
+        video_data = {"title": "Video 1", "description": "Description", "duration": 1}
+        video_id = client.post("/api/v1/video/", json=video_data).json()["id"]
+
+        statements.clear()
+        video_data["title"] = "Video 2"
+        response = client.put(f"/api/v1/video/{video_id}", json=video_data)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == "Video 2"
+        assert len(statements) == 1
+
+        statements.clear()
+        response = client.delete(f"/api/v1/video/{video_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == video_id
+        assert len(statements) == 1
+
+        response = client.delete(f"/api/v1/video/{video_id}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_soft_delete_video_endpoint(self, client, statements, monkeypatch):
+        monkeypatch.setattr(config, "VIDEO_SOFT_DELETE", True)
+        video_data = {"title": "Video 1", "description": "Description", "duration": 1}
+        video_id = client.post("/api/v1/video/", json=video_data).json()["id"]
+
+        statements.clear()
+        response = client.delete(f"/api/v1/video/{video_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == video_id
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE videos SET")
+
+        response = client.get(f"/api/v1/video/{video_id}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = client.get("/api/v1/video/")
+        assert response.json()["data"] == []
+        response = client.delete(f"/api/v1/video/{video_id}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_video_endpoint_conditional(self, client):
+        video_data = {"title": "Video 1", "description": "Description", "duration": 1}
+        video_id = client.post("/api/v1/video/", json=video_data).json()["id"]
+
+        response = client.get(f"/api/v1/video/{video_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert "updated_date" not in response.json()
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = client.get(
+            f"/api/v1/video/{video_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        response = client.get(
+            f"/api/v1/video/{video_id}", headers={"If-Modified-Since": last_modified}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        video_data["title"] = "Video 2"
+        response = client.put(f"/api/v1/video/{video_id}", json=video_data)
+        assert response.headers["ETag"] != etag
+        response = client.get(
+            f"/api/v1/video/{video_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == "Video 2"
+
+        response = client.get("/api/v1/video/missing", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_update_video_endpoint_if_match(self, client):
+        video_data = {"title": "Video 1", "description": "Description", "duration": 1}
+        video_id = client.post("/api/v1/video/", json=video_data).json()["id"]
+        etag = client.get(f"/api/v1/video/{video_id}").headers["ETag"]
+
+        video_data["title"] = "First writer"
+        response = client.put(
+            f"/api/v1/video/{video_id}", json=video_data, headers={"If-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        video_data["title"] = "Second writer"
+        response = client.put(
+            f"/api/v1/video/{video_id}", json=video_data, headers={"If-Match": etag}
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        response = client.get(f"/api/v1/video/{video_id}")
+        assert response.json()["title"] == "First writer"
+
+    def test_get_videos_endpoint_conditional(self, client):
+        video_data = {"title": "Video 1", "description": "Description", "duration": 1}
+        client.post("/api/v1/video/", json=video_data)
+
+        # Validators are only read for conditional requests
+        assert "ETag" not in client.get("/api/v1/video/").headers
+        response = client.get(
+            "/api/v1/video/",
+            headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+        )
+        etag = response.headers["ETag"]
+        response = client.get("/api/v1/video/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.post("/api/v1/video/", json=video_data)
+        response = client.get("/api/v1/video/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]) == 2
+
     def test_get_videos_endpoint(self, client):
         # Create multiple videos for testing
         video_data1 = {
@@ -115,3 +234,238 @@ class TestVideoEndpoints:
         assert response.status_code == status.HTTP_200_OK
         videos = response.json()
         assert len(videos["data"]) == 2
+
+    def test_get_videos_endpoint_with_cursor(self, client):
+        for i in range(3):
+            video_data = {
+                "title": f"Video {i}",
+                "description": f"Description {i}",
+                "duration": 120,
+            }
+            client.post("/api/v1/video/", json=video_data)
+
+        response = client.get("/api/v1/video/", params={"limit": 2})
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert len(first_page["data"]) == 2
+
+        response = client.get(
+            "/api/v1/video/",
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        second_page = response.json()
+        assert [video["title"] for video in second_page["data"]] == ["Video 2"]
+        assert second_page["next_cursor"] is None
+
+    def test_get_videos_endpoint_invalid_cursor(self, client):
+        response = client.get("/api/v1/video/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_videos_endpoint_without_total(self, client):
+        video_data = {
+            "title": "Video 1",
+            "description": "Description 1",
+            "duration": 120,
+        }
+        client.post("/api/v1/video/", json=video_data)
+
+        response = client.get("/api/v1/video/", params={"include_total": False})
+        assert response.status_code == status.HTTP_200_OK
+        videos = response.json()
+        assert len(videos["data"]) == 1
+        assert videos["total_count"] is None
+
+    def test_get_videos_endpoint_filtered_and_sorted(self, client):
+        videos_data = [
+            {"title": f"Video {duration}", "description": "", "duration": duration}
+            for duration in [30, 10, 50, 20]
+        ]
+        client.post("/api/v1/video/bulk", json=videos_data)
+
+        response = client.get(
+            "/api/v1/video/",
+            params={"min_duration": 20, "sort": "-duration", "limit": 2},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        videos = response.json()
+        assert [video["duration"] for video in videos["data"]] == [50, 30]
+        assert videos["total_count"] == 3
+
+        response = client.get(
+            "/api/v1/video/",
+            params={
+                "min_duration": 20,
+                "sort": "-duration",
+                "limit": 2,
+                "cursor": videos["next_cursor"],
+            },
+        )
+        assert [video["duration"] for video in response.json()["data"]] == [20]
+
+        response = client.get(
+            "/api/v1/video/", params={"created_after": "2999-01-01T00:00:00"}
+        )
+        assert response.json()["data"] == []
+
+    def test_get_videos_endpoint_invalid_sort(self, client):
+        response = client.get("/api/v1/video/", params={"sort": "title"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response = client.get(
+            "/api/v1/video/",
+            params={"sort": "duration", "cursor": "WyIyMDIzLTAxLTAxIiwgIngiXQ"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_cache_stats_endpoint(self, client):
+        response = client.get("/api/v1/video/cache/stats")
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()
+        assert {"hits", "misses", "evictions", "size", "max_size"} <= set(stats)
+        assert {"hits", "misses", "hit_ratio", "size_bytes"} <= set(stats["list_cache"])
+
+    def test_create_videos_endpoint(self, client):
+        videos_data = [
+            {"title": "Video 1", "description": "Description 1", "duration": 120},
+            {"title": "Video 2", "description": "Description 2"},
+        ]
+        response = client.post("/api/v1/video/bulk", json=videos_data)
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["created_count"] == 1
+        assert result["errors"][0]["index"] == 1
+
+        response = client.get(f"/api/v1/video/{result['data'][0]['id']}")
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_get_videos_by_ids_endpoint(self, client):
+        videos_data = [
+            {"title": "Video 1", "description": "Description 1", "duration": 120},
+            {"title": "Video 2", "description": "Description 2", "duration": 180},
+        ]
+        response = client.post("/api/v1/video/bulk", json=videos_data)
+        video_ids = [video["id"] for video in response.json()["data"]]
+
+        response = client.get(
+            "/api/v1/video/batch",
+            params={"ids": f"{video_ids[1]},missing,{video_ids[0]}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["data"][0]["title"] == "Video 2"
+        assert result["data"][1] is None
+        assert result["data"][2]["title"] == "Video 1"
+        assert result["missing"] == ["missing"]
+
+        response = client.post(
+            "/api/v1/video/batch", json={"ids": [video_ids[0], "missing"]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["data"][0]["title"] == "Video 1"
+        assert result["missing"] == ["missing"]
+
+    def test_export_videos_endpoint(self, client):
+        videos_data = [
+            {"title": "Video 1", "description": "Description 1", "duration": 120},
+            {"title": "Video 2", "description": "Description 2", "duration": 180},
+        ]
+        client.post("/api/v1/video/bulk", json=videos_data)
+
+        response = client.get("/api/v1/video/export")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(video["title"] for video in lines) == ["Video 1", "Video 2"]
+
+    def test_export_videos_endpoint_csv(self, client):
+        videos_data = [
+            {"title": "Video, 1", "description": "Description 1", "duration": 120},
+        ]
+        client.post("/api/v1/video/bulk", json=videos_data)
+
+        response = client.get("/api/v1/video/export", params={"format": "csv"})
+        assert response.status_code == status.HTTP_200_OK
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows[0]["title"] == "Video, 1"
+        assert rows[0]["duration"] == "120"
+
+    def test_import_videos_endpoint(self, client):
+        body = (
+            '{"title": "Video 1", "description": "Description 1", "duration": 120}\n'
+            '{"title": "Video 2", "description": "Description 2"}\n'
+        )
+        response = client.post(
+            "/api/v1/video/import",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["inserted"] == 1
+        assert result["failed"] == 1
+        assert result["errors"][0]["line"] == 2
+
+    def test_export_import_round_trip(self, client):
+        videos_data = [
+            {"title": "Video 1", "description": "Description\n1", "duration": 120},
+        ]
+        client.post("/api/v1/video/bulk", json=videos_data)
+        export = client.get("/api/v1/video/export", params={"format": "csv"})
+
+        response = client.post(
+            "/api/v1/video/import", params={"format": "csv"}, content=export.content
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["inserted"] == 1
+        response = client.get("/api/v1/video/")
+        assert [video["description"] for video in response.json()["data"]] == [
+            "Description\n1",
+            "Description\n1",
+        ]
+
+    def test_search_videos_endpoint(self, client):
+        videos_data = [
+            {"title": "Cooking pasta", "description": "Dinner", "duration": 120},
+            {"title": "Gardening", "description": "Tomatoes", "duration": 180},
+        ]
+        client.post("/api/v1/video/bulk", json=videos_data)
+
+        response = client.get("/api/v1/video/search", params={"q": "pasta"})
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()
+        assert [video["title"] for video in results["data"]] == ["Cooking pasta"]
+        assert results["next_cursor"] is None
+
+    def test_search_videos_endpoint_invalid_cursor(self, client):
+        response = client.get(
+            "/api/v1/video/search", params={"q": "pasta", "cursor": "not-a-cursor"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_suggest_videos_endpoint(self, client):
+        videos_data = [
+            {"title": "Cooking pasta", "description": "Dinner", "duration": 120},
+            {"title": "Cooking rice", "description": "Lunch", "duration": 180},
+            {"title": "Gardening", "description": "Tomatoes", "duration": 180},
+        ]
+        client.post("/api/v1/video/bulk", json=videos_data)
+
+        response = client.get(
+            "/api/v1/video/suggest", params={"prefix": "cook", "limit": 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [video["title"] for video in response.json()["data"]] == [
+            "Cooking pasta"
+        ]
+
+        video_id = client.post(
+            "/api/v1/video/",
+            json={"title": "Cookies", "description": "Dessert", "duration": 60},
+        ).json()["id"]
+        response = client.get("/api/v1/video/suggest", params={"prefix": "cookie"})
+        assert response.json()["data"] == [{"id": video_id, "title": "Cookies"}]
+
+    def test_suggest_videos_endpoint_requires_prefix(self, client):
+        response = client.get("/api/v1/video/suggest", params={"prefix": ""})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
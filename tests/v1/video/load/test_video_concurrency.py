@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from api.v1.video.routes import video_controller
+from db.database import engine
+from main import app
+
+# Simulated network round trip to the database, spent in the driver thread
+SIMULATED_DB_LATENCY = 0.02
+TOTAL_REQUESTS = 32
+
+
+@pytest.fixture
+def simulated_db_latency():
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.await_(
+            dbapi_connection._connection.set_trace_callback(
+                lambda statement: time.sleep(SIMULATED_DB_LATENCY)
+            )
+        )
+
+    event.listen(engine.sync_engine, "connect", on_connect)
+    yield
+    event.remove(engine.sync_engine, "connect", on_connect)
+
+
+async def measure_throughput(client, url, concurrency):
+    async def worker():
+        for _ in range(TOTAL_REQUESTS // concurrency):
+            response = await client.get(url)
+            assert response.status_code == 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return TOTAL_REQUESTS / (time.perf_counter() - started)
+
+
+class TestVideoConcurrency:
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_concurrency(
+        self, simulated_db_latency, monkeypatch
+    ):
+        # Measure the database path rather than the single-video cache
+        monkeypatch.setattr(video_controller.video_crud.video_cache, "max_size", 0)
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            video_data = {
+                "title": "Test Video",
+                "description": "A test video",
+                "duration": 120,
+            }
+            response = await client.post("/api/v1/video/", json=video_data)
+            url = f"/api/v1/video/{response.json()['id']}"
+
+            sequential = await measure_throughput(client, url, concurrency=1)
+            concurrent = await measure_throughput(client, url, concurrency=8)
+
+        # A blocking driver would serialize requests on the event loop and keep
+        # both numbers roughly equal.
+        assert concurrent > sequential * 2
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import gc
+import os
+import resource
+from datetime import datetime, timedelta
+from typing import Tuple
+
+import pytest
+from sqlalchemy import insert
+
+from db.database import engine
+from main import app
+from models.base_model import generate_id
+from models.video import VideoModel
+
+ROWS = 50_000
+# Loading this many rows in one batch grows RSS by well over 100 MB
+MAX_RSS_GROWTH = 40 * 1024 * 1024
+
+
+def current_rss() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+async def seed_videos(count: int):
+    started = datetime(2023, 1, 1)
+    async with engine.begin() as conn:
+        for start in range(0, count, 10_000):
+            await conn.execute(
+                insert(VideoModel),
+                [
+                    {
+                        "id": generate_id(),
+                        "title": f"Video {i}",
+                        "description": f"Description of video {i} " * 4,
+                        "duration": i % 7200,
+                        "created_date": started + timedelta(seconds=i),
+                        "updated_date": started + timedelta(seconds=i),
+                        "is_active": True,
+                    }
+                    for i in range(start, min(start + 10_000, count))
+                ],
+            )
+
+
+async def stream_export(path: str) -> Tuple[int, int]:
+    """
+    Drive the ASGI app directly and count the streamed lines without
+    keeping them, unlike the test clients which buffer the body. Also
+    samples the resident set size after every chunk.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "client": ("test", 123),
+        "server": ("test", 80),
+    }
+    received = {"lines": 0, "status": None, "peak_rss": current_rss()}
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            received["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            received["lines"] += message.get("body", b"").count(b"\n")
+            received["peak_rss"] = max(received["peak_rss"], current_rss())
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    assert received["status"] == 200
+    return received["lines"], received["peak_rss"]
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/statm"), reason="needs /proc to sample RSS"
+)
+class TestVideoExport:
+    @pytest.mark.asyncio
+    async def test_export_memory_is_bounded(self):
+        await seed_videos(ROWS)
+        gc.collect()
+
+        rss_before = current_rss()
+        lines, peak_rss = await stream_export("/api/v1/video/export")
+        rss_growth = peak_rss - rss_before
+
+        assert lines == ROWS
+        assert rss_growth < MAX_RSS_GROWTH
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timezone
+
+import pytest
+
+from api.v1.video.conditional import (
+    CatalogVersion,
+    catalog_headers,
+    etag_matches,
+    is_not_modified,
+    video_etag,
+    video_headers,
+)
+
+
+class TestETags:
+    def test_video_etag_follows_updated_date(self):
+        updated_date = datetime(2023, 7, 11, 17, 54, 9, 910158)
+        etag = video_etag("abc", updated_date)
+        assert etag == '"abc-20230711175409910158"'
+        assert etag != video_etag("abc", updated_date.replace(microsecond=0))
+
+    def test_catalog_etag_follows_version(self):
+        changed_at = datetime.now(timezone.utc)
+        updated_date = datetime(2023, 7, 11, 17, 54, 9, 910158)
+        etag = catalog_headers(CatalogVersion(updated_date, 2, changed_at))["ETag"]
+        assert etag == '"2-20230711175409910158"'
+        # A delete only changes the count
+        assert (
+            catalog_headers(CatalogVersion(updated_date, 1, changed_at))["ETag"] != etag
+        )
+        assert catalog_headers(CatalogVersion(None, 0, changed_at))["ETag"] == '"0-0"'
+
+    @pytest.mark.parametrize(
+        "header, weak, expected",
+        [
+            ('"a"', True, True),
+            ('"b", "a"', True, True),
+            ("*", False, True),
+            ('W/"a"', True, True),
+            ('W/"a"', False, False),
+            ('"b"', True, False),
+        ],
+    )
+    def test_etag_matches(self, header, weak, expected):
+        assert etag_matches(header, '"a"', weak=weak) is expected
+
+
+class TestIsNotModified:
+    @pytest.fixture
+    def headers(self):
+        return video_headers("abc", datetime(2023, 7, 11, 17, 54, 9, 910158))
+
+    def test_if_none_match(self, headers):
+        assert is_not_modified(headers, if_none_match=headers["ETag"])
+        assert not is_not_modified(headers, if_none_match='"other"')
+
+    def test_if_modified_since(self, headers):
+        last_modified = headers["Last-Modified"]
+        assert is_not_modified(headers, if_modified_since=last_modified)
+        assert not is_not_modified(
+            headers, if_modified_since="Mon, 10 Jul 2023 00:00:00 GMT"
+        )
+        assert not is_not_modified(headers, if_modified_since="yesterday")
+
+    def test_if_none_match_takes_precedence(self, headers):
+        assert not is_not_modified(
+            headers,
+            if_none_match='"other"',
+            if_modified_since=headers["Last-Modified"],
+        )
+
+    def test_without_validators(self):
+        assert not is_not_modified({}, if_none_match="*")
@@ -1,14 +1,21 @@
 # -*- coding: utf-8 -*-
+import json
+from unittest import mock
+
 import pytest
 from fastapi import HTTPException
+from sqlalchemy import insert
 
 from api.v1.video.controller import VideoController
-from api.v1.video.crud import VideoCRUD
+from api.v1.video.crud import SearchNotSupportedError, VideoCRUD
 from api.v1.video.schemas import (
     VideoCreateRequest,
     VideoUpdateRequest,
     VideoResponse,
 )
+from core.config import config
+from models.base_model import generate_id
+from models.video import VideoModel
 
 
 @pytest.fixture
@@ -53,6 +60,38 @@ class TestVideoController:
         assert video.description == video_data.description
         assert video.duration == video_data.duration
 
+    @pytest.mark.asyncio
+    async def test_get_video_not_modified(self, video_controller, db_session):
+        video_data = VideoCreateRequest(
+            title="Video 1", description="Description 1", duration=120
+        )
+        video = await video_controller.create_video(db=db_session, video=video_data)
+        etag = f'"{video.id}-{video.updated_date:%Y%m%d%H%M%S%f}"'
+
+        with mock.patch.object(video_controller.video_crud, "get_video") as get_video:
+            with pytest.raises(HTTPException) as e:
+                await video_controller.get_video(
+                    db=db_session, video_id=str(video.id), if_none_match=etag
+                )
+        assert e.value.status_code == 304
+        assert e.value.headers["ETag"] == etag
+        get_video.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_video_precondition_failed(self, video_controller, db_session):
+        video_data = VideoCreateRequest(
+            title="Video 1", description="Description 1", duration=120
+        )
+        video = await video_controller.create_video(db=db_session, video=video_data)
+        with pytest.raises(HTTPException) as e:
+            await video_controller.update_video(
+                db=db_session,
+                video_id=str(video.id),
+                video=VideoUpdateRequest(title="Updated Video", duration=180),
+                if_match='"stale"',
+            )
+        assert e.value.status_code == 412
+
     @pytest.mark.asyncio
     async def test_update_video(self, video_controller, db_session):
         video_data1 = VideoCreateRequest(
@@ -105,3 +144,156 @@ class TestVideoController:
         assert videos.offset == 0
         assert videos.limit == 10
         assert videos.total_count == 2
+        assert videos.total_count_exact is True
+
+    @pytest.mark.asyncio
+    async def test_get_videos_json_cached(self, video_controller, db_session):
+        video_controller.list_cache.max_bytes = 1024 * 1024
+        video_data = VideoCreateRequest(
+            title="Video 1", description="Description 1", duration=120
+        )
+        await video_controller.create_video(db=db_session, video=video_data)
+
+        body = await video_controller.get_videos_json(db=db_session, limit=10)
+        assert json.loads(body)["total_count"] == 1
+        with mock.patch.object(video_controller.video_crud, "get_videos") as get_videos:
+            assert (
+                await video_controller.get_videos_json(db=db_session, limit=10) == body
+            )
+        get_videos.assert_not_called()
+        assert video_controller.list_cache.hits == 1
+
+        # Any write starts a new generation
+        await video_controller.create_video(db=db_session, video=video_data)
+        body = await video_controller.get_videos_json(db=db_session, limit=10)
+        assert json.loads(body)["total_count"] == 2
+        assert video_controller.get_cache_stats()["list_cache"]["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_videos_json_not_modified(self, video_controller, db_session):
+        headers = await video_controller.get_catalog_headers(db_session)
+
+        # The headers the route already computed are not read again
+        with mock.patch.object(
+            video_controller.video_crud, "get_catalog_version"
+        ) as get_catalog_version:
+            with pytest.raises(HTTPException) as e:
+                await video_controller.get_videos_json(
+                    db=db_session, if_none_match=headers["ETag"], headers=headers
+                )
+        assert e.value.status_code == 304
+        assert e.value.headers == headers
+        get_catalog_version.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_list_headers_only_when_used(self, video_controller, db_session):
+        with mock.patch.object(
+            video_controller.video_crud, "get_catalog_version"
+        ) as get_catalog_version:
+            assert await video_controller.get_list_headers(db_session) == {}
+        get_catalog_version.assert_not_called()
+
+        headers = await video_controller.get_list_headers(
+            db_session, if_none_match='"stale"'
+        )
+        assert set(headers) == {"ETag", "Last-Modified"}
+        with mock.patch.object(video_controller.list_cache, "max_bytes", 1024):
+            assert await video_controller.get_list_headers(db_session) == headers
+
+    @pytest.mark.asyncio
+    async def test_catalog_headers_see_other_writers(
+        self, video_controller, db_session
+    ):
+        video_data = VideoCreateRequest(
+            title="Video 1", description="Description 1", duration=120
+        )
+        await video_controller.create_video(db=db_session, video=video_data)
+        headers = await video_controller.get_catalog_headers(db_session)
+
+        # Written by another process, straight to the table
+        await db_session.execute(
+            insert(VideoModel).values(
+                id=generate_id(), title="Loaded", description="", duration=1
+            )
+        )
+        await db_session.commit()
+        assert await video_controller.get_catalog_headers(db_session) == headers
+
+        video_controller.video_crud.catalog_cache.invalidate()
+        assert (await video_controller.get_catalog_headers(db_session))[
+            "ETag"
+        ] != headers["ETag"]
+
+    @pytest.mark.asyncio
+    async def test_search_videos_not_supported(self, video_controller, db_session):
+        with mock.patch.object(
+            video_controller.video_crud,
+            "search_videos",
+            side_effect=SearchNotSupportedError("Full-text search is not set up"),
+        ):
+            with pytest.raises(HTTPException) as e:
+                await video_controller.search_videos(db=db_session, q="pasta")
+        assert e.value.status_code == 501
+
+    @pytest.mark.asyncio
+    async def test_create_videos(self, video_controller, db_session):
+        videos_data = [
+            {"title": "Video 1", "description": "Description 1", "duration": 120},
+            {"title": "Video 2" * 20, "description": "Description 2", "duration": 180},
+            {"title": "Video 3", "description": "Description 3"},
+        ]
+        result = await video_controller.create_videos(db=db_session, videos=videos_data)
+
+        assert result.created_count == 1
+        assert result.data[0].title == "Video 1"
+        assert [error.index for error in result.errors] == [1, 2]
+        assert result.errors[0].errors[0]["loc"] == ["title"]
+        assert result.errors[1].errors[0]["type"] == "missing"
+
+    @pytest.mark.asyncio
+    async def test_create_videos_too_many(
+        self, video_controller, db_session, monkeypatch
+    ):
+        monkeypatch.setattr(config, "VIDEO_BULK_MAX_ITEMS", 1)
+        videos_data = [
+            {"title": "Video 1", "description": "Description 1", "duration": 120},
+            {"title": "Video 2", "description": "Description 2", "duration": 180},
+        ]
+        with pytest.raises(HTTPException) as exc_info:
+            await video_controller.create_videos(db=db_session, videos=videos_data)
+        assert exc_info.value.status_code == 413
+
+    @pytest.mark.asyncio
+    async def test_import_videos(self, video_controller, db_session):
+        async def chunks():
+            yield b'{"title": "Video 1", "description": "Description 1", "duration": 1}\n'
+            yield b"\n"
+            yield b'{"title": "Video 2", "description": "Description 2"}\nnot json\n'
+            yield b'{"title": "Video 3", "description": "Description 3", "duration": 3}'
+
+        result = await video_controller.import_videos(
+            db=db_session, chunks=chunks(), batch_size=1
+        )
+
+        assert result.inserted == 2
+        assert result.skipped == 1
+        assert result.failed == 2
+        assert [error.line for error in result.errors] == [3, 4]
+        videos = await video_controller.get_videos(db=db_session, limit=10, offset=0)
+        assert videos.total_count == 2
+
+    @pytest.mark.asyncio
+    async def test_import_videos_csv(self, video_controller, db_session):
+        async def chunks():
+            yield b"title,description,duration\n"
+            yield b"Video 1,Description 1,120\n"
+            yield b"Video 2,Description 2,two minutes\n"
+
+        result = await video_controller.import_videos(
+            db=db_session, chunks=chunks(), import_format="csv"
+        )
+
+        assert result.inserted == 1
+        assert result.failed == 1
+        assert result.errors[0].line == 3
+        assert result.errors[0].errors[0]["loc"] == ["duration"]
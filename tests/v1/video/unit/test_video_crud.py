@@ -1,9 +1,29 @@
 # -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+from unittest import mock
+
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.v1.video.conditional import PreconditionFailedError
 from api.v1.video.crud import VideoCRUD
-from api.v1.video.schemas import VideoCreateRequest, VideoUpdateRequest
+from api.v1.video.schemas import (
+    VideoCreateRequest,
+    VideoListFilters,
+    VideoUpdateRequest,
+)
+from core.config import config
+from models.base_model import generate_id
+from models.video import VideoModel
+
+
+async def query_plan(db: AsyncSession, query) -> str:
+    sql = query.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return " ".join(row[-1] for row in result)
 
 
 @pytest.fixture
@@ -13,7 +33,7 @@ def video_crud():
 
 class TestVideoCRUD:
     @pytest.mark.asyncio
-    async def test_create_video(self, video_crud: VideoCRUD, db_session: Session):
+    async def test_create_video(self, video_crud: VideoCRUD, db_session: AsyncSession):
         video_data = VideoCreateRequest(
             title="Test Video", description="A test video", duration=120
         )
@@ -24,7 +44,7 @@ class TestVideoCRUD:
         assert video.duration == video_data.duration
 
     @pytest.mark.asyncio
-    async def test_get_video(self, video_crud: VideoCRUD, db_session: Session):
+    async def test_get_video(self, video_crud: VideoCRUD, db_session: AsyncSession):
         video_data = VideoCreateRequest(
             title="Test Video", description="A test video", duration=120
         )
@@ -38,7 +58,7 @@ class TestVideoCRUD:
         assert retrieved_video.duration == video_data.duration
 
     @pytest.mark.asyncio
-    async def test_update_video(self, video_crud: VideoCRUD, db_session: Session):
+    async def test_update_video(self, video_crud: VideoCRUD, db_session: AsyncSession):
         video_data = VideoCreateRequest(
             title="Test Video", description="A test video", duration=120
         )
@@ -53,7 +73,65 @@ class TestVideoCRUD:
         assert updated_video.duration == updated_video_data.duration
 
     @pytest.mark.asyncio
-    async def test_delete_video(self, video_crud: VideoCRUD, db_session: Session):
+    async def test_update_and_delete_video_single_statement(
+        self, video_crud: VideoCRUD, db_session: AsyncSession, statements
+    ):
+        video_data = VideoCreateRequest(
+            title="Test Video", description="A test video", duration=120
+        )
+        video = await video_crud.create_video(db=db_session, video=video_data)
+        statements.clear()
+        updated_video = await video_crud.update_video(
+            db=db_session,
+            video_id=str(video.id),
+            video=VideoUpdateRequest(title="Updated Video", duration=180),
+        )
+        assert updated_video.title == "Updated Video"
+        assert updated_video.updated_date > video.updated_date
+        assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+
+        statements.clear()
+        deleted_video = await video_crud.delete_video(
+            db=db_session, video_id=str(video.id)
+        )
+        assert deleted_video.id == video.id
+        assert [statement.split()[0] for statement in statements] == ["DELETE"]
+
+        statements.clear()
+        assert await video_crud.delete_video(db=db_session, video_id=video.id) is None
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_update_video_if_match(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        video_data = VideoCreateRequest(
+            title="Test Video", description="A test video", duration=120
+        )
+        video = await video_crud.create_video(db=db_session, video=video_data)
+        video_id = str(video.id)
+        etag = f'"{video_id}-{video.updated_date:%Y%m%d%H%M%S%f}"'
+        update = VideoUpdateRequest(title="Updated Video", duration=180)
+
+        assert await video_crud.update_video(
+            db=db_session, video_id=video_id, video=update, if_match=etag
+        )
+        with pytest.raises(PreconditionFailedError):
+            await video_crud.update_video(
+                db=db_session, video_id=video_id, video=update, if_match=etag
+            )
+        assert await video_crud.update_video(
+            db=db_session, video_id=video_id, video=update, if_match="*"
+        )
+        assert (
+            await video_crud.update_video(
+                db=db_session, video_id="missing", video=update, if_match=etag
+            )
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_delete_video(self, video_crud: VideoCRUD, db_session: AsyncSession):
         video_data = VideoCreateRequest(
             title="Test Video", description="A test video", duration=120
         )
@@ -65,7 +143,65 @@ class TestVideoCRUD:
         assert deleted_video is None
 
     @pytest.mark.asyncio
-    async def test_get_videos(self, video_crud: VideoCRUD, db_session: Session):
+    async def test_soft_delete_video(
+        self, video_crud: VideoCRUD, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(config, "VIDEO_SOFT_DELETE", True)
+        kept = await video_crud.create_video(
+            db=db_session,
+            video=VideoCreateRequest(
+                title="Pasta kept", description="Pasta", duration=120
+            ),
+        )
+        kept_id = str(kept.id)
+        video = await video_crud.create_video(
+            db=db_session,
+            video=VideoCreateRequest(
+                title="Pasta deleted", description="Pasta", duration=180
+            ),
+        )
+        video_id = str(video.id)
+        await video_crud.suggest_videos(db=db_session, prefix="pasta")
+
+        row = await video_crud.delete_video(db=db_session, video_id=video_id)
+        assert row.is_active is False
+
+        # The row stays behind as a tombstone that no read path returns
+        is_active = await db_session.scalar(
+            select(VideoModel.is_active).where(VideoModel.id == video_id)
+        )
+        assert is_active is False
+        assert await video_crud.get_video(db=db_session, video_id=video_id) is None
+        assert await video_crud.get_video_version(db_session, video_id) is None
+        by_ids = await video_crud.get_videos_by_ids(
+            db=db_session, video_ids=[video_id, kept_id]
+        )
+        assert [v and str(v.id) for v in by_ids] == [None, kept_id]
+        videos = await video_crud.get_videos(db=db_session, limit=10, offset=0)
+        assert [str(v.id) for v in videos.data] == [kept_id]
+        assert videos.total_count == 1
+        search = await video_crud.search_videos(db=db_session, q="pasta")
+        assert [str(v.id) for v in search.data] == [kept_id]
+        video_crud.title_index.clear()
+        suggestions = await video_crud.suggest_videos(db=db_session, prefix="pasta")
+        assert [str(s.id) for s in suggestions] == [kept_id]
+        exported = [
+            str(v.id)
+            async for batch in video_crud.stream_videos(db=db_session)
+            for v in batch
+        ]
+        assert exported == [kept_id]
+        update = VideoUpdateRequest(title="Back", description="Back", duration=1)
+        assert (
+            await video_crud.update_video(
+                db=db_session, video_id=video_id, video=update
+            )
+            is None
+        )
+        assert await video_crud.delete_video(db=db_session, video_id=video_id) is None
+
+    @pytest.mark.asyncio
+    async def test_get_videos(self, video_crud: VideoCRUD, db_session: AsyncSession):
         video_data1 = VideoCreateRequest(
             title="Video 1", description="Description 1", duration=120
         )
@@ -76,3 +212,411 @@ class TestVideoCRUD:
         await video_crud.create_video(db=db_session, video=video_data2)
         videos = await video_crud.get_videos(db=db_session, limit=10, offset=0)
         assert len(videos.data) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_videos_with_cursor(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        for i in range(5):
+            video_data = VideoCreateRequest(
+                title=f"Video {i}", description=f"Description {i}", duration=i
+            )
+            await video_crud.create_video(db=db_session, video=video_data)
+
+        first_page = await video_crud.get_videos(db=db_session, limit=2, offset=0)
+        assert [video.title for video in first_page.data] == ["Video 0", "Video 1"]
+        assert first_page.next_cursor is not None
+
+        second_page = await video_crud.get_videos(
+            db=db_session, limit=2, cursor=first_page.next_cursor
+        )
+        assert [video.title for video in second_page.data] == ["Video 2", "Video 3"]
+        assert second_page.offset is None
+
+        last_page = await video_crud.get_videos(
+            db=db_session, limit=2, cursor=second_page.next_cursor
+        )
+        assert [video.title for video in last_page.data] == ["Video 4"]
+        assert last_page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_get_videos_filtered_and_sorted(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        await video_crud.create_videos(
+            db=db_session,
+            videos=[
+                VideoCreateRequest(title=f"Video {i}", description="", duration=i)
+                for i in [30, 10, 50, 20, 40]
+            ],
+        )
+        filters = VideoListFilters(min_duration=20, max_duration=40)
+        first_page = await video_crud.get_videos(
+            db=db_session, limit=2, filters=filters, sort="-duration"
+        )
+        assert [video.duration for video in first_page.data] == [40, 30]
+        assert first_page.total_count == 3
+        assert first_page.total_count_exact is True
+
+        second_page = await video_crud.get_videos(
+            db=db_session,
+            limit=2,
+            cursor=first_page.next_cursor,
+            filters=filters,
+            sort="-duration",
+        )
+        assert [video.duration for video in second_page.data] == [20]
+        assert second_page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_get_videos_date_filters(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        video_data = VideoCreateRequest(title="Video", description="", duration=1)
+        video = await video_crud.create_video(db=db_session, video=video_data)
+        before, after = (
+            video.created_date - timedelta(seconds=1),
+            video.created_date + timedelta(seconds=1),
+        )
+        for filters, expected in [
+            (VideoListFilters(created_after=before), 1),
+            (VideoListFilters(created_after=after), 0),
+            (VideoListFilters(updated_since=video.updated_date), 1),
+            (VideoListFilters(updated_since=after), 0),
+        ]:
+            videos = await video_crud.get_videos(db=db_session, filters=filters)
+            assert (len(videos.data), videos.total_count) == (expected, expected)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "filters, sort, index",
+        [
+            (VideoListFilters(), "created_date", "ix_videos_created_date_id"),
+            (VideoListFilters(), "-created_date", "ix_videos_created_date_id"),
+            (
+                VideoListFilters(created_after=datetime(2023, 1, 1)),
+                "created_date",
+                "ix_videos_created_date_id",
+            ),
+            (
+                VideoListFilters(updated_since=datetime(2023, 1, 1)),
+                "-updated_date",
+                "ix_videos_updated_date_id",
+            ),
+            (
+                VideoListFilters(min_duration=60, max_duration=600),
+                "duration",
+                "ix_videos_duration_id",
+            ),
+            (VideoListFilters(), "-duration", "ix_videos_duration_id"),
+        ],
+    )
+    async def test_list_query_uses_index(
+        self,
+        video_crud: VideoCRUD,
+        db_session: AsyncSession,
+        filters: VideoListFilters,
+        sort: str,
+        index: str,
+    ):
+        query = video_crud.list_query(filters=filters, sort=sort).limit(11)
+        plan = await query_plan(db_session, query)
+        assert f"USING INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_get_videos_without_total(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        video_data = VideoCreateRequest(
+            title="Video 1", description="Description 1", duration=120
+        )
+        await video_crud.create_video(db=db_session, video=video_data)
+        videos = await video_crud.get_videos(
+            db=db_session, limit=10, offset=0, include_total=False
+        )
+        assert len(videos.data) == 1
+        assert videos.total_count is None
+        assert videos.total_count_exact is None
+
+    @pytest.mark.asyncio
+    async def test_count_videos_cached(self, db_session: AsyncSession):
+        video_crud = VideoCRUD(count_strategy="cached")
+        video_data = VideoCreateRequest(
+            title="Video 1", description="Description 1", duration=120
+        )
+        video = await video_crud.create_video(db=db_session, video=video_data)
+        assert await video_crud.count_videos(db=db_session) == (1, True)
+        assert await video_crud.count_videos(db=db_session) == (1, False)
+
+        # Writes drop the cached count
+        await video_crud.delete_video(db=db_session, video_id=str(video.id))
+        assert await video_crud.count_videos(db=db_session) == (0, True)
+
+    @pytest.mark.asyncio
+    async def test_count_videos_estimated(self, db_session: AsyncSession):
+        video_crud = VideoCRUD(count_strategy="estimated")
+        for i in range(3):
+            video_data = VideoCreateRequest(
+                title=f"Video {i}", description=f"Description {i}", duration=i
+            )
+            await video_crud.create_video(db=db_session, video=video_data)
+        videos = await video_crud.get_videos(db=db_session, limit=1, offset=0)
+        assert videos.total_count >= 3
+        assert videos.total_count_exact is False
+
+    @pytest.mark.asyncio
+    async def test_get_video_cached(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        video_data = VideoCreateRequest(
+            title="Test Video", description="A test video", duration=120
+        )
+        video = await video_crud.create_video(db=db_session, video=video_data)
+        await video_crud.get_video(db=db_session, video_id=str(video.id))
+        await video_crud.get_video(db=db_session, video_id=str(video.id))
+        assert video_crud.video_cache.misses == 1
+        assert video_crud.video_cache.hits == 1
+
+        # Updates must not be hidden by the cached entry
+        updated_video_data = VideoUpdateRequest(title="Updated Video", duration=180)
+        await video_crud.update_video(
+            db=db_session, video_id=str(video.id), video=updated_video_data
+        )
+        retrieved_video = await video_crud.get_video(
+            db=db_session, video_id=str(video.id)
+        )
+        assert retrieved_video.title == "Updated Video"
+
+    @pytest.mark.asyncio
+    async def test_get_video_not_cached_across_a_write(
+        self, video_crud: VideoCRUD, db_session: AsyncSession, monkeypatch
+    ):
+        video_data = VideoCreateRequest(
+            title="Test Video", description="A test video", duration=120
+        )
+        video = await video_crud.create_video(db=db_session, video=video_data)
+        execute = db_session.execute
+
+        async def execute_during_write(*args, **kwargs):
+            result = await execute(*args, **kwargs)
+            # Another request commits an update while the SELECT is awaited
+            video_crud.write_generation.bump()
+            return result
+
+        monkeypatch.setattr(db_session, "execute", execute_during_write)
+        assert await video_crud.get_video(db=db_session, video_id=str(video.id))
+        assert await video_crud.get_videos_by_ids(
+            db=db_session, video_ids=[str(video.id)]
+        )
+        assert video_crud.video_cache.stats()["size"] == 0
+
+        monkeypatch.setattr(db_session, "execute", execute)
+        await video_crud.get_video(db=db_session, video_id=str(video.id))
+        assert video_crud.video_cache.stats()["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_create_videos(self, video_crud: VideoCRUD, db_session: AsyncSession):
+        videos_data = [
+            VideoCreateRequest(
+                title=f"Video {i}", description=f"Description {i}", duration=i
+            )
+            for i in range(3)
+        ]
+        videos = await video_crud.create_videos(db=db_session, videos=videos_data)
+        assert [video.title for video in videos] == ["Video 0", "Video 1", "Video 2"]
+
+        retrieved_video = await video_crud.get_video(
+            db=db_session, video_id=str(videos[1].id)
+        )
+        assert retrieved_video.title == "Video 1"
+        videos = await video_crud.get_videos(db=db_session, limit=10, offset=0)
+        assert videos.total_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_videos_by_ids(
+        self, video_crud: VideoCRUD, db_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(config, "VIDEO_BATCH_CHUNK_SIZE", 2)
+        videos_data = [
+            VideoCreateRequest(
+                title=f"Video {i}", description=f"Description {i}", duration=i
+            )
+            for i in range(3)
+        ]
+        videos = await video_crud.create_videos(db=db_session, videos=videos_data)
+        video_ids = [str(video.id) for video in reversed(videos)]
+
+        retrieved_videos = await video_crud.get_videos_by_ids(
+            db=db_session, video_ids=video_ids + ["missing"]
+        )
+        assert [video.title for video in retrieved_videos[:3]] == [
+            "Video 2",
+            "Video 1",
+            "Video 0",
+        ]
+        assert retrieved_videos[3] is None
+
+    @pytest.mark.asyncio
+    async def test_search_videos(self, video_crud: VideoCRUD, db_session: AsyncSession):
+        videos_data = [
+            VideoCreateRequest(title="Cooking pasta", description="Dinner", duration=1),
+            VideoCreateRequest(
+                title="Pasta night", description="More pasta recipes", duration=2
+            ),
+            VideoCreateRequest(title="Gardening", description="Tomatoes", duration=3),
+        ]
+        await video_crud.create_videos(db=db_session, videos=videos_data)
+
+        results = await video_crud.search_videos(db=db_session, q="pasta")
+        assert [video.title for video in results.data] == [
+            "Pasta night",
+            "Cooking pasta",
+        ]
+        assert results.data[0].score > results.data[1].score
+
+        results = await video_crud.search_videos(db=db_session, q="pasta dinner!")
+        assert [video.title for video in results.data] == ["Cooking pasta"]
+        results = await video_crud.search_videos(db=db_session, q="?!")
+        assert results.data == []
+
+    @pytest.mark.asyncio
+    async def test_search_videos_with_cursor(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        videos_data = [
+            VideoCreateRequest(title=f"Pasta {i}", description="Pasta", duration=i)
+            for i in range(5)
+        ]
+        await video_crud.create_videos(db=db_session, videos=videos_data)
+
+        seen = []
+        cursor = None
+        while True:
+            results = await video_crud.search_videos(
+                db=db_session, q="pasta", limit=2, cursor=cursor
+            )
+            seen.extend(video.title for video in results.data)
+            cursor = results.next_cursor
+            if cursor is None:
+                break
+        assert sorted(seen) == [f"Pasta {i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_search_videos_follows_writes(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        video_data = VideoCreateRequest(
+            title="Cooking pasta", description="Dinner", duration=1
+        )
+        video = await video_crud.create_video(db=db_session, video=video_data)
+        await video_crud.update_video(
+            db=db_session,
+            video_id=str(video.id),
+            video=VideoUpdateRequest(title="Baking bread", duration=1),
+        )
+        results = await video_crud.search_videos(db=db_session, q="pasta")
+        assert results.data == []
+        results = await video_crud.search_videos(db=db_session, q="bread")
+        assert len(results.data) == 1
+
+        await video_crud.delete_video(db=db_session, video_id=str(video.id))
+        results = await video_crud.search_videos(db=db_session, q="bread")
+        assert results.data == []
+
+    @pytest.mark.asyncio
+    async def test_suggest_videos(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        await video_crud.create_videos(
+            db=db_session,
+            videos=[
+                VideoCreateRequest(title=title, description="", duration=1)
+                for title in ["Pasta night", "pasta salad", "Pastry", "Pizza"]
+            ],
+        )
+        suggestions = await video_crud.suggest_videos(db=db_session, prefix="PASTA")
+        assert [video.title for video in suggestions] == ["Pasta night", "pasta salad"]
+        assert video_crud.title_index.loaded
+
+        suggestions = await video_crud.suggest_videos(
+            db=db_session, prefix="p", limit=3
+        )
+        assert [video.title for video in suggestions] == [
+            "Pasta night",
+            "pasta salad",
+            "Pastry",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_suggest_videos_reloads_after_other_writers(
+        self, video_crud: VideoCRUD, db_session: AsyncSession, monkeypatch
+    ):
+        await video_crud.load_title_index(db=db_session)
+        # Written by another process, straight to the table
+        await db_session.execute(
+            insert(VideoModel).values(
+                id=generate_id(), title="Cooking pasta", description="", duration=1
+            )
+        )
+        await db_session.commit()
+        assert await video_crud.suggest_videos(db=db_session, prefix="cook") == []
+
+        monkeypatch.setattr(config, "VIDEO_SUGGEST_RELOAD_INTERVAL", 0.0)
+        video_crud.catalog_cache.invalidate()
+        suggestions = await video_crud.suggest_videos(db=db_session, prefix="cook")
+        assert [video.title for video in suggestions] == ["Cooking pasta"]
+
+    @pytest.mark.asyncio
+    async def test_suggest_videos_follows_writes(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        await video_crud.load_title_index(db=db_session)
+        video = await video_crud.create_video(
+            db=db_session,
+            video=VideoCreateRequest(title="Cooking pasta", description="", duration=1),
+        )
+        suggestions = await video_crud.suggest_videos(db=db_session, prefix="cook")
+        assert [video.title for video in suggestions] == ["Cooking pasta"]
+
+        await video_crud.update_video(
+            db=db_session,
+            video_id=str(video.id),
+            video=VideoUpdateRequest(title="Baking bread", duration=1),
+        )
+        assert await video_crud.suggest_videos(db=db_session, prefix="cook") == []
+        suggestions = await video_crud.suggest_videos(db=db_session, prefix="bak")
+        assert [str(video.id) for video in suggestions] == [str(video.id)]
+
+        await video_crud.delete_video(db=db_session, video_id=str(video.id))
+        assert await video_crud.suggest_videos(db=db_session, prefix="bak") == []
+
+    @pytest.mark.asyncio
+    async def test_suggest_videos_while_loading(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        await video_crud.create_video(
+            db=db_session,
+            video=VideoCreateRequest(title="100% pasta", description="", duration=1),
+        )
+        video_crud.title_index.begin_load()
+        suggestions = await video_crud.suggest_videos(db=db_session, prefix="100%")
+        assert [video.title for video in suggestions] == ["100% pasta"]
+        assert await video_crud.suggest_videos(db=db_session, prefix="1000") == []
+
+    @pytest.mark.asyncio
+    async def test_suggest_videos_while_reloading(
+        self, video_crud: VideoCRUD, db_session: AsyncSession
+    ):
+        await video_crud.load_title_index(db=db_session)
+        video_crud.title_index.begin_load()
+        await video_crud.create_video(
+            db=db_session,
+            video=VideoCreateRequest(title="Cooking pasta", description="", duration=1),
+        )
+
+        # The loaded index keeps answering, writes included
+        with mock.patch.object(db_session, "execute") as execute:
+            suggestions = await video_crud.suggest_videos(db=db_session, prefix="cook")
+        assert [video.title for video in suggestions] == ["Cooking pasta"]
+        execute.assert_not_called()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from api.v1.video.importer import (
+    LINE_TOO_LONG,
+    MAX_LINE_SIZE,
+    iter_csv_records,
+    iter_lines,
+)
+
+
+async def as_chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(records):
+    return [record async for record in records]
+
+
+class TestIterLines:
+    @pytest.mark.asyncio
+    async def test_iter_lines_across_chunks(self):
+        lines = await collect(
+            iter_lines(as_chunks(b"fir", b"st\r\nsec", b"ond\n", b"x"))
+        )
+        assert lines == [(1, b"first"), (2, b"second"), (3, b"x")]
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_too_long(self):
+        chunks = as_chunks(b"a" * (MAX_LINE_SIZE + 1), b"a\nnext\n")
+        lines = await collect(iter_lines(chunks))
+        assert lines == [(1, None), (2, b"next")]
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_too_long_in_one_chunk(self):
+        chunks = as_chunks(b"first\n" + b"a" * (MAX_LINE_SIZE + 1) + b"\nnext\n")
+        lines = await collect(iter_lines(chunks))
+        assert lines == [(1, b"first"), (2, None), (3, b"next")]
+
+
+class TestIterCsvRecords:
+    @pytest.mark.asyncio
+    async def test_iter_csv_records(self):
+        chunks = as_chunks(
+            b'title,description,duration\nVideo 1,"Line one\nline two",120\n',
+            b"\nVideo 2,Description 2,180\n",
+        )
+        records = await collect(iter_csv_records(chunks))
+        assert records == [
+            (
+                2,
+                {
+                    "title": "Video 1",
+                    "description": "Line one\nline two",
+                    "duration": "120",
+                },
+                None,
+            ),
+            (4, None, None),
+            (
+                5,
+                {"title": "Video 2", "description": "Description 2", "duration": "180"},
+                None,
+            ),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_iter_csv_records_errors(self):
+        chunks = as_chunks(b"title,description,duration\n\xff\n", b'"unterminated\n')
+        records = await collect(iter_csv_records(chunks))
+        assert records[0][0] == 2 and records[0][2] is not None
+        assert records[1] == (3, None, "Unterminated quoted field")
+
+    @pytest.mark.asyncio
+    async def test_iter_csv_records_malformed(self):
+        chunks = as_chunks(b"title,duration\nVideo\x00 1,1\nVideo 2,2\n")
+        records = await collect(iter_csv_records(chunks))
+        assert records[0][0] == 2 and records[0][1] is None
+        assert records[0][2] is not None
+        assert records[1] == (3, {"title": "Video 2", "duration": "2"}, None)
+
+    @pytest.mark.asyncio
+    async def test_iter_csv_records_too_long(self):
+        chunks = as_chunks(b"title\n", b'"' + b"a" * MAX_LINE_SIZE + b"\n", b"b\n")
+        records = await collect(iter_csv_records(chunks))
+        assert records[0] == (2, None, LINE_TOO_LONG)
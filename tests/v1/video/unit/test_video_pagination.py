@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import uuid
+from datetime import datetime
+
+import pytest
+
+from api.v1.video.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+
+
+class TestCursor:
+    def test_cursor_round_trip(self):
+        created_date = datetime(2023, 7, 11, 17, 54, 9, 910158)
+        video_id = str(uuid.uuid4())
+        cursor = encode_cursor(created_date, video_id)
+        assert decode_cursor(cursor) == (created_date, video_id)
+
+    def test_cursor_round_trip_int(self):
+        video_id = str(uuid.uuid4())
+        cursor = encode_cursor(120, video_id)
+        assert decode_cursor(cursor, value_type=int) == (120, video_id)
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(encode_cursor(datetime(2023, 7, 11), video_id), int)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "e30"])
+    def test_decode_invalid_cursor(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestSearchCursor:
+    def test_search_cursor_round_trip(self):
+        video_id = str(uuid.uuid4())
+        cursor = encode_search_cursor(-0.123456789, video_id)
+        assert decode_search_cursor(cursor) == (-0.123456789, video_id)
+
+    def test_decode_invalid_search_cursor(self):
+        cursor = encode_cursor(datetime(2023, 7, 11), str(uuid.uuid4()))
+        with pytest.raises(InvalidCursorError):
+            decode_search_cursor(cursor)